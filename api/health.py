@@ -0,0 +1,25 @@
+from http.server import BaseHTTPRequestHandler
+import json
+
+# Standalone health check so monitoring pings don't import FastAPI and app.main
+BODY = json.dumps({
+    "status": "healthy",
+    "ok": True,
+    "service": "bolavila-backend"
+}).encode()
+
+
+class handler(BaseHTTPRequestHandler):
+    def _send_headers(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+
+    def do_GET(self):
+        self._send_headers()
+        self.wfile.write(BODY)
+
+    def do_HEAD(self):
+        self._send_headers()
@@ -1,13 +1,22 @@
 import sys
 import os
 
-# Add parent directory to path
-parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The function filesystem is read-only outside /tmp; skip writing .pyc files on cold start
+sys.dont_write_bytecode = True
+
+# Add parent directory to path (__file__ is already absolute on Python 3.9+)
+parent = os.path.dirname(os.path.dirname(__file__))
 if parent not in sys.path:
     sys.path.insert(0, parent)
 
 from app.main import app
 
+# Build the middleware stack during init instead of on the first request
+app.middleware_stack = app.build_middleware_stack()
+
+# Generate the OpenAPI schema once per container; app.openapi() caches it on the app
+app.openapi()
+
 # Export app directly - Vercel natively supports ASGI applications like FastAPI
 # Do NOT use 'handler' variable name as Vercel expects that to be a BaseHTTPRequestHandler subclass
 
@@ -1,17 +1,31 @@
-from fastapi import FastAPI, HTTPException, Request
-from pydantic import BaseModel
-from typing import Optional
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from pydantic import BaseModel, ConfigDict, Field, AliasChoices, StringConstraints, field_validator
+from typing import Annotated, Optional, List
 import uuid
 import os
 import requests
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
 import base64
 import json
 import sys
+import re
+import logging
 import urllib.parse
+import hashlib
+import time
+import threading
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
 from .supabase_client import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY
 
 # Fix Windows console encoding to support emojis and Unicode
@@ -26,19 +40,13 @@ if sys.platform == 'win32':
         # If reconfiguration fails, continue anyway
         pass
 
-# Safe print function that handles encoding errors
-def safe_print(*args, **kwargs):
-    """Print function that handles Unicode encoding errors gracefully"""
-    try:
-        print(*args, **kwargs)
-    except UnicodeEncodeError:
-        # Fallback: encode to ASCII with replacement for problematic characters
-        try:
-            encoded_args = [str(arg).encode('ascii', 'replace').decode('ascii') if isinstance(arg, str) else arg for arg in args]
-            print(*encoded_args, **kwargs)
-        except Exception:
-            # Last resort: just print the error message
-            print("Error: Unable to print message due to encoding issue")
+# One logger for the service; stderr is UTF-8 (reconfigured above on Windows)
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s %(message)s",
+    stream=sys.stderr,
+)
+log = logging.getLogger("bolavila")
 
 # Try to import pywebpush for Web Push notifications
 try:
@@ -46,45 +54,68 @@ try:
     WEB_PUSH_AVAILABLE = True
 except ImportError:
     WEB_PUSH_AVAILABLE = False
-    print("Warning: pywebpush not installed. Web Push notifications will not work.")
+    log.warning("pywebpush not installed. Web Push notifications will not work.")
 
 # Try to import firebase-admin for FCM notifications
 try:
     import firebase_admin
     from firebase_admin import credentials, messaging as fcm_messaging
     FCM_AVAILABLE = True
-    
-    # Initialize Firebase Admin (will use FIREBASE_CREDENTIALS env var or default)
-    try:
-        if not firebase_admin._apps:
-            # Try to initialize with credentials from environment
-            cred_json = os.getenv("FIREBASE_CREDENTIALS")
-            if cred_json:
-                cred_dict = json.loads(cred_json)
-                cred = credentials.Certificate(cred_dict)
-                firebase_admin.initialize_app(cred)
-            else:
-                # Try default initialization (for Google Cloud environments)
-                firebase_admin.initialize_app()
-    except Exception as e:
-        print(f"Warning: Firebase Admin not initialized: {str(e)}")
-        FCM_AVAILABLE = False
 except ImportError:
     FCM_AVAILABLE = False
-    print("Warning: firebase-admin not installed. FCM notifications will not work.")
+    log.warning("firebase-admin not installed. FCM notifications will not work.")
+
+_FCM_INIT_LOCK = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _fcm_app():
+    """
+    Initialize Firebase Admin on first use, so only workers that send notifications pay for it.
+    Uses FIREBASE_CREDENTIALS if set, otherwise default credentials (Google Cloud environments).
+    Raises if initialization fails; the next call tries again.
+    """
+    with _FCM_INIT_LOCK:
+        if firebase_admin._apps:
+            return firebase_admin.get_app()
+        cred_json = os.getenv("FIREBASE_CREDENTIALS")
+        if cred_json:
+            return firebase_admin.initialize_app(credentials.Certificate(json.loads(cred_json)))
+        return firebase_admin.initialize_app()
+
+app = FastAPI(title="bolavila-backend", default_response_class=ORJSONResponse)
 
-app = FastAPI(title="bolavila-backend")
+# Compress larger JSON responses (order/task/inspection lists)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Comma-separated list of allowed frontend origins; "*" (the default) allows any origin.
+# Credentials are only allowed with an explicit list, since browsers reject "*" with credentials.
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
+    allow_origins=CORS_ORIGINS,
+    allow_credentials="*" not in CORS_ORIGINS,
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
 REST_URL = f"{SUPABASE_URL}/rest/v1"
 STORAGE_URL = f"{SUPABASE_URL}/storage/v1"
+# Base URLs for the most used tables; filters go in params or are appended per call
+USERS_URL = f"{REST_URL}/users"
+ORDERS_URL = f"{REST_URL}/orders"
+INSPECTIONS_URL = f"{REST_URL}/inspections"
+INSPECTION_TASKS_URL = f"{REST_URL}/inspection_tasks"
+CLEANING_INSPECTIONS_URL = f"{REST_URL}/cleaning_inspections"
+CLEANING_INSPECTION_TASKS_URL = f"{REST_URL}/cleaning_inspection_tasks"
+MONTHLY_INSPECTIONS_URL = f"{REST_URL}/monthly_inspections"
+MONTHLY_INSPECTION_TASKS_URL = f"{REST_URL}/monthly_inspection_tasks"
+MAINTENANCE_TASKS_URL = f"{REST_URL}/maintenance_tasks"
+INVOICES_URL = f"{REST_URL}/invoices"
+PUSH_TOKENS_URL = f"{REST_URL}/push_tokens"
+WAREHOUSE_ITEMS_URL = f"{REST_URL}/warehouse_items"
 SERVICE_HEADERS = {
     "apikey": SUPABASE_SERVICE_ROLE_KEY,
     "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
@@ -96,6 +127,137 @@ STORAGE_HEADERS = {
     "apikey": SUPABASE_SERVICE_ROLE_KEY,
     "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
 }
+# Per-call Prefer overrides (merged over the session headers; never mutate these)
+PREFER_MINIMAL = {"Prefer": "return=minimal"}
+PREFER_COUNT_ESTIMATED = {"Prefer": "count=estimated"}
+PREFER_IGNORE_DUPLICATES = {"Prefer": "resolution=ignore-duplicates,return=minimal"}
+PREFER_INSERT_NEW = {"Prefer": "resolution=ignore-duplicates,return=representation"}  # returns only inserted rows
+
+# Shared Supabase session: keeps TLS connections alive between calls instead of
+# opening a new one per request. Service headers are sent on every call;
+# pass headers={...} to override individual values (e.g. Prefer, Content-Type).
+SESSION = requests.Session()
+SESSION.headers.update(SERVICE_HEADERS)
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        # Only idempotent methods are retried (urllib3 default), so inserts are never duplicated
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.1,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,  # hand the last response back so raise_for_status() still applies
+        ),
+    ),
+)
+
+# Short-lived in-process cache for read-mostly endpoints (dropdowns, dashboards).
+# Writes call invalidate_cache() so the next read goes back to Supabase.
+# Each worker has its own cache, so other workers can serve the old data until the
+# TTL runs out. That is accepted for dropdown data (e.g. the id/username user list);
+# lists that users edit and act on (orders, user details, pending approvals) are not cached.
+_CACHE = {}
+# Keys can include request values (limits, ids), so the cache is capped and swept on write
+_CACHE_MAX_ENTRIES = 256
+# Fetches currently running per cache key, so concurrent misses share one Supabase call
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+# Invalidation count per prefix; a fetch that overlaps an invalidation of its key is not stored
+_GENERATIONS = {}
+
+def _generation(key: str) -> int:
+    return sum(count for prefix, count in _GENERATIONS.items() if key.startswith(prefix))
+
+def cached(key: str, ttl: float, fetch):
+    """Return the cached value for key, or call fetch() and keep the result for ttl seconds"""
+    now = time.monotonic()
+    hit = _CACHE.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+    with _INFLIGHT_LOCK:
+        pending = _INFLIGHT.get(key)
+        if pending is None:
+            future = _INFLIGHT[key] = Future()
+            generation = _generation(key)
+    if pending is not None:
+        return pending.result()
+    try:
+        value = fetch()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        with _INFLIGHT_LOCK:
+            # Rows read before a write that invalidated this key must not be cached
+            if _generation(key) == generation:
+                _store(key, now + ttl, value)
+        future.set_result(value)
+        return value
+    finally:
+        with _INFLIGHT_LOCK:
+            if _INFLIGHT.get(key) is future:
+                del _INFLIGHT[key]
+
+def _store(key: str, expires: float, value):
+    """Add an entry, first dropping expired ones and then the soonest-expiring if still full"""
+    if len(_CACHE) >= _CACHE_MAX_ENTRIES:
+        now = time.monotonic()
+        for old_key, (old_expires, _) in list(_CACHE.items()):
+            if old_expires <= now:
+                _CACHE.pop(old_key, None)
+        while len(_CACHE) >= _CACHE_MAX_ENTRIES:
+            _CACHE.pop(min(_CACHE, key=lambda k: _CACHE[k][0]), None)
+    _CACHE[key] = (expires, value)
+
+def invalidate_cache(*prefixes: str):
+    """Drop every cache entry whose key starts with one of the given prefixes"""
+    with _INFLIGHT_LOCK:
+        for prefix in prefixes:
+            _GENERATIONS[prefix] = _GENERATIONS.get(prefix, 0) + 1
+        # Fetches already running may return pre-write rows; later readers start a new one
+        for key in list(_INFLIGHT):
+            if key.startswith(prefixes):
+                del _INFLIGHT[key]
+    for key in list(_CACHE):
+        if key.startswith(prefixes):
+            _CACHE.pop(key, None)
+
+def sb_json(resp):
+    """Decode a Supabase response body with orjson (None for an empty body)"""
+    return orjson.loads(resp.content) if resp.content else None
+
+def _supabase_error_detail(e: requests.exceptions.HTTPError, limit: int = 200) -> str:
+    """Short description of a failed Supabase call; decodes only the first `limit` bytes of the body"""
+    if e.response is None:
+        return str(e)
+    return f"HTTP {e.response.status_code}: {e.response.content[:limit].decode('utf-8', 'replace')}"
+
+def _get_bytes(path: str, params: Optional[dict] = None) -> bytes:
+    """GET a PostgREST path and return Supabase's raw JSON body"""
+    resp = SESSION.get(f"{REST_URL}/{path}", params=params)
+    resp.raise_for_status()
+    return resp.content
+
+def _passthrough(path: str, params: Optional[dict] = None) -> Response:
+    """Hand Supabase's JSON bytes straight to the client instead of decoding and re-encoding them"""
+    return Response(content=_get_bytes(path, params), media_type="application/json")
+
+@app.on_event("startup")
+def configure_threadpool():
+    # Sync handlers run in AnyIO's worker threads and mostly wait on Supabase,
+    # so allow more of them in flight than the default of 40
+    import anyio.to_thread
+    anyio.to_thread.current_default_thread_limiter().total_tokens = int(os.getenv("THREADPOOL_SIZE", "64"))
+
+# Worker pool for fanning out independent Supabase calls within one request
+EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="supabase")
+
+@app.on_event("shutdown")
+def close_session():
+    SESSION.close()
+    EXECUTOR.shutdown(wait=False)
 
 @app.get("/")
 def root():
@@ -111,17 +273,58 @@ def health():
     }
 
 # Authentication endpoints
+# New passwords are hashed with argon2id (OWASP parameters); older bcrypt hashes
+# still verify and are upgraded to argon2 on the next successful sign-in
+PASSWORD_HASHER = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+def hash_password(password: str) -> str:
+    return PASSWORD_HASHER.hash(password)
+
+def verify_password(password: str, password_hash: str):
+    """Check a password against a stored hash; returns (matches, needs_rehash)"""
+    if password_hash.startswith("$2"):
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8')), True
+    try:
+        PASSWORD_HASHER.verify(password_hash, password)
+    except (VerifyMismatchError, InvalidHashError):
+        return False, False
+    return True, PASSWORD_HASHER.check_needs_rehash(password_hash)
+
+# Letters (including Hebrew), digits, underscore, dot, dash and spaces
+SignUpUsername = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=3, max_length=64, pattern=r"^[\w.\- ]+$")
+]
+
 class SignUpRequest(BaseModel):
-    username: str
-    password: str
+    username: SignUpUsername
+    password: str = Field(max_length=128)
     role: Optional[str] = "עובד תחזוקה"
     image_url: Optional[str] = None
 
 class SignInRequest(BaseModel):
+    # Only capped here: accounts created before the signup rules must still be able to sign in
+    username: str = Field(max_length=64)
+    password: str = Field(max_length=128)
+
+class UserOut(BaseModel):
+    id: str
     username: str
-    password: str
 
-@app.post("/auth/signup")
+class UserDetailsOut(UserOut):
+    image_url: Optional[str] = None
+    hourly_wage: Optional[float] = None
+    role: Optional[str] = None
+
+class AuthUserOut(BaseModel):
+    id: Optional[str] = None
+    username: Optional[str] = None
+    role: Optional[str] = None
+    image_url: Optional[str] = None
+    approval_status: Optional[str] = None
+    message: str
+
+@app.post("/auth/signup", response_model=AuthUserOut)
+@app.post("/api/auth/signup", response_model=AuthUserOut)
 def signup(payload: SignUpRequest):
     if not payload.username or not payload.password:
         raise HTTPException(status_code=400, detail="Username and password are required")
@@ -129,26 +332,14 @@ def signup(payload: SignUpRequest):
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
     
     try:
-        # Check if user already exists
-        resp = requests.get(
-            f"{REST_URL}/users",
-            headers=SERVICE_HEADERS,
-            params={"username": f"eq.{payload.username}", "select": "id"}
-        )
-        resp.raise_for_status()
-        existing = resp.json()
-        if existing and len(existing) > 0:
-            raise HTTPException(status_code=400, detail="Username already exists")
-        
         # Hash password
-        password_hash = bcrypt.hashpw(payload.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        password_hash = hash_password(payload.password)
         
         # Create user
         # Set approval_status: 'approved' for admin, 'pending' for others
         approval_status = 'approved' if payload.username.lower() == 'admin' else 'pending'
         
         user_data = {
-            "id": str(uuid.uuid4()),
             "username": payload.username,
             "password_hash": password_hash,
             "role": payload.role or "עובד תחזוקה",
@@ -156,15 +347,19 @@ def signup(payload: SignUpRequest):
             "approval_status": approval_status
         }
         
-        resp = requests.post(
-            f"{REST_URL}/users",
-            headers=SERVICE_HEADERS,
+        # The unique index on users.username (db_migrations/add_users_username_unique.sql)
+        # rejects duplicates with 409, so no separate existence check is needed
+        resp = SESSION.post(
+            USERS_URL,
             json=user_data
         )
+        if resp.status_code == 409:
+            raise HTTPException(status_code=400, detail="Username already exists")
         resp.raise_for_status()
+        invalidate_cache("users")
         
-        if resp.text:
-            body = resp.json()
+        if resp.content:
+            body = sb_json(resp)
             user = body[0] if isinstance(body, list) and body else body
         else:
             user = user_data
@@ -181,25 +376,25 @@ def signup(payload: SignUpRequest):
     except HTTPException:
         raise
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating user: {str(e)}")
 
-@app.post("/auth/signin")
+@app.post("/auth/signin", response_model=AuthUserOut)
+@app.post("/api/auth/login", response_model=AuthUserOut)
 def signin(payload: SignInRequest):
     if not payload.username or not payload.password:
         raise HTTPException(status_code=400, detail="Username and password are required")
     
     try:
         # Get user by username
-        resp = requests.get(
-            f"{REST_URL}/users",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.get(
+            USERS_URL,
             params={"username": f"eq.{payload.username}", "select": "*"}
         )
         resp.raise_for_status()
-        users = resp.json()
+        users = sb_json(resp)
         
         if not users or len(users) == 0:
             raise HTTPException(status_code=401, detail="Invalid username or password")
@@ -211,8 +406,20 @@ def signin(payload: SignInRequest):
             raise HTTPException(status_code=401, detail="Invalid username or password")
         
         # Verify password
-        if not bcrypt.checkpw(payload.password.encode('utf-8'), password_hash.encode('utf-8')):
+        matches, needs_rehash = verify_password(payload.password, password_hash)
+        if not matches:
             raise HTTPException(status_code=401, detail="Invalid username or password")
+        if needs_rehash:
+            try:
+                SESSION.patch(
+                    USERS_URL,
+                    params={"id": f"eq.{user.get('id')}"},
+                    json={"password_hash": hash_password(payload.password)},
+                    headers=PREFER_MINIMAL
+                ).raise_for_status()
+            except Exception as rehash_error:
+                # Sign-in still succeeds; the upgrade is retried next time
+                log.warning(f"Could not upgrade password hash for {payload.username}: {rehash_error}")
         
         # Check approval status
         approval_status = user.get("approval_status", "approved")  # Default to approved for existing users
@@ -230,63 +437,43 @@ def signin(payload: SignInRequest):
     except HTTPException:
         raise
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error signing in: {str(e)}")
 
-# Add /api/ prefix endpoints for frontend compatibility
-@app.post("/api/auth/login")
-def api_login(payload: SignInRequest):
-    """Alias for /auth/signin to match frontend expectations"""
-    return signin(payload)
-
-@app.post("/api/auth/signup")
-def api_signup(payload: SignUpRequest):
-    """Alias for /auth/signup to match frontend expectations"""
-    return signup(payload)
-
-
-@app.get("/users")
+# These list handlers forward Supabase's bytes as a raw Response, which FastAPI does not
+# validate, so the row models are declared via responses= for the docs only
+@app.get("/users", responses={200: {"model": List[UserOut]}})
+@app.get("/api/users", responses={200: {"model": List[UserOut]}})
 def list_users():
     """
     Return system users for UI dropdowns (id + username only).
     """
+    return Response(content=cached("users", 30, _fetch_users), media_type="application/json")
+
+def _fetch_users():
     try:
-        resp = requests.get(
-            f"{REST_URL}/users",
-            headers=SERVICE_HEADERS,
-            params={"select": "id,username", "order": "username.asc"},
-        )
-        resp.raise_for_status()
-        return resp.json() or []
+        return _get_bytes("users", {"select": "id,username", "order": "username.asc"})
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching users: {str(e)}")
 
-@app.get("/api/users")
-def api_list_users():
-    """Alias for /users to match frontend expectations"""
-    return list_users()
-
-@app.get("/api/users/with-details")
+@app.get("/api/users/with-details", responses={200: {"model": List[UserDetailsOut]}})
 def api_list_users_with_details():
     """
     Return all users with their details including image_url, hourly_wage, and role.
     For employee management page.
     """
+    return Response(content=_fetch_users_with_details(), media_type="application/json")
+
+def _fetch_users_with_details():
     try:
-        resp = requests.get(
-            f"{REST_URL}/users",
-            headers=SERVICE_HEADERS,
-            params={"select": "id,username,image_url,hourly_wage,role", "order": "username.asc"},
-        )
-        resp.raise_for_status()
-        return resp.json() or []
+        return _get_bytes("users", {"select": "id,username,image_url,hourly_wage,role", "order": "username.asc"})
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching users: {str(e)}")
@@ -303,16 +490,15 @@ def api_update_user_wage(user_id: str, payload: dict):
         
         # Update the user's hourly_wage
         update_data = {"hourly_wage": float(hourly_wage)}
-        resp = requests.patch(
-            f"{REST_URL}/users?id=eq.{user_id}",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.patch(
+            f"{USERS_URL}?id=eq.{user_id}",
             json=update_data
         )
         resp.raise_for_status()
-        result = resp.json()
+        result = sb_json(resp)
         return result[0] if isinstance(result, list) and result else result
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating user wage: {str(e)}")
@@ -323,16 +509,13 @@ def api_get_pending_approvals():
     Get all users with pending approval status.
     Only accessible by admin (check should be done on frontend, but can add auth here too).
     """
+    return Response(content=_fetch_pending_approvals(), media_type="application/json")
+
+def _fetch_pending_approvals():
     try:
-        resp = requests.get(
-            f"{REST_URL}/users",
-            headers=SERVICE_HEADERS,
-            params={"select": "id,username,role,image_url,created_at", "approval_status": "eq.pending", "order": "created_at.desc"},
-        )
-        resp.raise_for_status()
-        return resp.json() or []
+        return _get_bytes("users", {"select": "id,username,role,image_url,created_at", "approval_status": "eq.pending", "order": "created_at.desc"})
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching pending approvals: {str(e)}")
@@ -344,19 +527,19 @@ def api_approve_user(user_id: str):
     """
     try:
         update_data = {"approval_status": "approved"}
-        resp = requests.patch(
-            f"{REST_URL}/users?id=eq.{user_id}",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.patch(
+            f"{USERS_URL}?id=eq.{user_id}",
             json=update_data
         )
         resp.raise_for_status()
-        result = resp.json()
+        invalidate_cache("users")
+        result = sb_json(resp)
         return {
             "message": "User approved successfully",
             "user": result[0] if isinstance(result, list) and result else result
         }
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error approving user: {str(e)}")
@@ -367,25 +550,66 @@ def api_reject_user(user_id: str):
     Reject a user account (delete it).
     """
     try:
-        resp = requests.delete(
-            f"{REST_URL}/users?id=eq.{user_id}",
-            headers=SERVICE_HEADERS
+        resp = SESSION.delete(
+            f"{USERS_URL}?id=eq.{user_id}",
         )
         resp.raise_for_status()
+        invalidate_cache("users")
         return {"message": "User rejected and removed successfully"}
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error rejecting user: {str(e)}")
 
 @app.get("/orders")
-def orders():
+@app.get("/api/orders")
+def orders(
+    response: Response,
+    fields: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    status: Optional[str] = None,
+):
+    """
+    List orders with their payment history.
+    Pass ?fields=guest_name,unit_number,... to fetch only the columns a list view renders.
+    Pass ?limit=&offset= (and optionally ?status=) for a page ordered by departure date;
+    the estimated total is returned in the X-Total-Count header.
+    """
+    select = "*"
+    if fields:
+        columns = [column.strip() for column in fields.split(",") if column.strip()]
+        if not all(_COLUMN_NAME.match(column) for column in columns):
+            raise HTTPException(status_code=400, detail="fields must be a comma-separated list of column names")
+        # id is always needed to attach payment history
+        select = ",".join(dict.fromkeys(["id", *columns]))
+    rows, total = _fetch_orders(select, limit, offset, status)
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    return rows
+
+_COLUMN_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+def _fetch_orders(select: str = "*", limit: Optional[int] = None, offset: int = 0, status: Optional[str] = None):
+    """(rows, total) for one orders query; total is only counted for paginated queries"""
     try:
         # Fetch orders
-        resp = requests.get(f"{REST_URL}/orders", headers=SERVICE_HEADERS, params={"select": "*"})
+        params = {"select": select}
+        headers = None
+        if status:
+            params["status"] = f"eq.{status}"
+        if limit is not None:
+            # id breaks ties between orders sharing a departure date so pages never overlap
+            params.update({"order": "departure_date.desc,id.desc", "limit": limit, "offset": offset})
+            headers = PREFER_COUNT_ESTIMATED
+        resp = SESSION.get(ORDERS_URL, params=params, headers=headers)
         resp.raise_for_status()
-        orders_list = resp.json() or []
+        orders_list = sb_json(resp) or []
+        total = None
+        if limit is not None:
+            total = resp.headers.get("Content-Range", "").rpartition("/")[2]
+            total = int(total) if total.isdigit() else None
         
         # Fetch payment history for all orders
         order_ids = [o.get("id") for o in orders_list if o.get("id")]
@@ -397,9 +621,8 @@ def orders():
                 # Supabase PostgREST uses 'in' filter with parentheses
                 order_ids_str = ','.join(order_ids)
                 print(f"🔍 Fetching payment history for {len(order_ids)} orders")
-                payment_resp = requests.get(
+                payment_resp = SESSION.get(
                     f"{REST_URL}/order_payments",
-                    headers=SERVICE_HEADERS,
                     params={
                         "select": "id,order_id,amount,payment_method,paid_at,created_at",
                         "order_id": f"in.({order_ids_str})",
@@ -407,7 +630,7 @@ def orders():
                     }
                 )
                 payment_resp.raise_for_status()
-                payment_history = payment_resp.json() or []
+                payment_history = sb_json(payment_resp) or []
                 print(f"✅ Found {len(payment_history)} payment history records")
                 
                 # Group payments by order_id
@@ -428,7 +651,7 @@ def orders():
             except Exception as e:
                 # If payment history fetch fails, continue without it
                 import traceback
-                print(f"⚠️ Warning: Could not fetch payment history: {str(e)}")
+                log.warning(f"Could not fetch payment history: {str(e)}")
                 print(f"Traceback: {traceback.format_exc()}")
         
         # Add payment history to each order (always include field, even if empty)
@@ -440,133 +663,118 @@ def orders():
                 # Always include payment_history field, even if empty array
                 order["payment_history"] = []
         
-        return orders_list
+        return orders_list, total
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/orders")
-def api_orders():
-    """Alias for /orders to match frontend expectations"""
-    return orders()
-
-
 class OrderUpdate(BaseModel):
+    # Accepts both snake_case and the frontend's camelCase field names
+    model_config = ConfigDict(populate_by_name=True)
+
     status: Optional[str] = None
-    paid_amount: Optional[float] = None
-    payment_method: Optional[str] = None
-    total_amount: Optional[float] = None
-    guest_name: Optional[str] = None
-    guest_phone: Optional[str] = None
-    unit_number: Optional[str] = None
-    arrival_date: Optional[str] = None
-    departure_date: Optional[str] = None
-    guests_count: Optional[int] = None
-    special_requests: Optional[str] = None
-    internal_notes: Optional[str] = None
+    paid_amount: Optional[float] = Field(None, alias="paidAmount")
+    payment_method: Optional[str] = Field(None, alias="paymentMethod")
+    total_amount: Optional[float] = Field(None, alias="totalAmount")
+    guest_name: Optional[str] = Field(None, alias="guestName")
+    guest_phone: Optional[str] = Field(None, alias="guestPhone")
+    unit_number: Optional[str] = Field(None, alias="unitNumber")
+    arrival_date: Optional[str] = Field(None, alias="arrivalDate")
+    departure_date: Optional[str] = Field(None, alias="departureDate")
+    guests_count: Optional[int] = Field(None, alias="guestsCount")
+    special_requests: Optional[str] = Field(None, alias="specialRequests")
+    internal_notes: Optional[str] = Field(None, alias="internalNotes")
 
 
 @app.patch("/orders/{order_id}")
 def update_order(order_id: str, payload: OrderUpdate):
-    data = {k: v for k, v in payload.dict().items() if v is not None}
+    data = payload.model_dump(exclude_none=True, exclude_unset=True)
     if not data:
         return []
+    return _patch_order(order_id, data)
+
+def _patch_order(order_id: str, data: dict):
+    """PATCH already-validated snake_case columns onto an order"""
     try:
-        resp = requests.patch(
-            f"{REST_URL}/orders",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.patch(
+            ORDERS_URL,
             params={"id": f"eq.{order_id}"},
             json=data,
         )
         resp.raise_for_status()
-        return resp.json()
+        invalidate_cache("reports_summary")
+        return sb_json(resp)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Normalizers for ORDER_FIELD_MAP; returning _SKIP leaves the column out of the update
+_SKIP = object()
+
+def _non_blank(val):
+    val = val.strip()
+    return val if val else _SKIP
+
+def _blank_to_none(val):
+    return val.strip() or None
+
+def _as_is(val):
+    return val
+
+# (column, (camelCase key, snake_case key), normalizer) for api_update_order
+ORDER_FIELD_MAP = (
+    ("guest_name", ("guestName", "guest_name"), _non_blank),
+    ("guest_phone", ("guestPhone", "guest_phone"), _blank_to_none),
+    ("unit_number", ("unitNumber", "unit_number"), _non_blank),
+    ("arrival_date", ("arrivalDate", "arrival_date"), _non_blank),
+    ("departure_date", ("departureDate", "departure_date"), _non_blank),
+    ("status", ("status", "status"), _non_blank),
+    ("guests_count", ("guestsCount", "guests_count"), int),
+    ("special_requests", ("specialRequests", "special_requests"), _as_is),
+    ("internal_notes", ("internalNotes", "internal_notes"), _as_is),
+    ("paid_amount", ("paidAmount", "paid_amount"), float),
+    ("total_amount", ("totalAmount", "total_amount"), float),
+    ("payment_method", ("paymentMethod", "payment_method"), _as_is),
+)
+
 @app.patch("/api/orders/{order_id}")
 def api_update_order(order_id: str, payload: dict):
     """Update order with frontend camelCase format and sync inspections"""
-    # Get the current order to check if departure_date changed and to track payment changes
-    try:
-        current_order_resp = requests.get(
-            f"{REST_URL}/orders",
-            headers=SERVICE_HEADERS,
-            params={"id": f"eq.{order_id}", "select": "id,departure_date,unit_number,guest_name,status,paid_amount,payment_method"}
-        )
-        current_order = None
-        if current_order_resp.status_code == 200:
-            orders_list = current_order_resp.json() or []
-            if orders_list:
-                current_order = orders_list[0]
-    except Exception as e:
-        print(f"Warning: Could not fetch current order: {str(e)}")
-        current_order = None
-    
-    old_departure_date = current_order.get("departure_date") if current_order else None
-    old_paid_amount = float(current_order.get("paid_amount", 0) or 0) if current_order else 0
-    
     # Map frontend camelCase or snake_case to backend snake_case
     # Only include fields that are actually provided and not empty
     update_data = {}
-    if "guestName" in payload or "guest_name" in payload:
-        val = payload.get("guestName") or payload.get("guest_name")
-        if val and val.strip():
-            update_data["guest_name"] = val.strip()
-    if "guestPhone" in payload or "guest_phone" in payload:
-        val = payload.get("guestPhone") or payload.get("guest_phone")
-        if val is not None:
-            update_data["guest_phone"] = val.strip() if val and val.strip() else None
-    if "unitNumber" in payload or "unit_number" in payload:
-        val = payload.get("unitNumber") or payload.get("unit_number")
-        if val and val.strip():
-            update_data["unit_number"] = val.strip()
-    if "arrivalDate" in payload or "arrival_date" in payload:
-        val = payload.get("arrivalDate") or payload.get("arrival_date")
-        if val and val.strip():
-            update_data["arrival_date"] = val.strip()
-    if "departureDate" in payload or "departure_date" in payload:
-        val = payload.get("departureDate") or payload.get("departure_date")
-        if val and val.strip():
-            update_data["departure_date"] = val.strip()
-    if "status" in payload and payload["status"]:
-        update_data["status"] = payload["status"]
-    if "guestsCount" in payload or "guests_count" in payload:
-        val = payload.get("guestsCount") or payload.get("guests_count")
-        if val is not None:
-            update_data["guests_count"] = val
-    if "specialRequests" in payload or "special_requests" in payload:
-        val = payload.get("specialRequests") or payload.get("special_requests")
-        if val is not None:
-            update_data["special_requests"] = val
-    if "internalNotes" in payload or "internal_notes" in payload:
-        val = payload.get("internalNotes") or payload.get("internal_notes")
-        if val is not None:
-            update_data["internal_notes"] = val
-    if "paidAmount" in payload or "paid_amount" in payload:
-        val = payload.get("paidAmount") or payload.get("paid_amount")
-        if val is not None:
-            update_data["paid_amount"] = val
-    if "totalAmount" in payload or "total_amount" in payload:
-        val = payload.get("totalAmount") or payload.get("total_amount")
-        if val is not None:
-            update_data["total_amount"] = val
-    if "paymentMethod" in payload or "payment_method" in payload:
-        val = payload.get("paymentMethod") or payload.get("payment_method")
-        if val is not None:
-            update_data["payment_method"] = val
+    for column, keys, normalize in ORDER_FIELD_MAP:
+        camel, snake = keys
+        val = payload[camel] if camel in payload else payload.get(snake)
+        if val is None:
+            continue
+        try:
+            val = normalize(val)
+        except (ValueError, TypeError, AttributeError):
+            raise HTTPException(status_code=400, detail=f"Invalid {column}")
+        if val is not _SKIP:
+            update_data[column] = val
     
-    # Check if payment was made and create payment history record
-    new_paid_amount = None
-    payment_method = None
+    # The current order is only needed to diff the departure date or the paid amount;
+    # everything else comes back from the PATCH itself
+    current_order = None
+    if "departure_date" in update_data or "paid_amount" in update_data:
+        try:
+            current_order_resp = SESSION.get(
+                ORDERS_URL,
+                params={"id": f"eq.{order_id}", "select": "id,departure_date,paid_amount"}
+            )
+            if current_order_resp.status_code == 200:
+                orders_list = sb_json(current_order_resp) or []
+                if orders_list:
+                    current_order = orders_list[0]
+        except Exception as e:
+            log.warning(f"Could not fetch current order: {str(e)}")
     
-    if "paidAmount" in payload or "paid_amount" in payload:
-        val = payload.get("paidAmount") or payload.get("paid_amount")
-        if val is not None:
-            new_paid_amount = float(val)
+    old_departure_date = current_order.get("departure_date") if current_order else None
+    old_paid_amount = float(current_order.get("paid_amount", 0) or 0) if current_order else 0
     
-    if "paymentMethod" in payload or "payment_method" in payload:
-        val = payload.get("paymentMethod") or payload.get("payment_method")
-        if val and val.strip():
-            payment_method = val.strip()
+    # Check if payment was made and create payment history record
+    new_paid_amount = update_data.get("paid_amount")
+    payment_method = (update_data.get("payment_method") or "").strip() or None
     
     # Create payment history record if payment amount increased
     if new_paid_amount is not None and new_paid_amount > old_paid_amount and payment_method:
@@ -577,21 +785,19 @@ def api_update_order(order_id: str, payload: dict):
                 "amount": payment_amount,
                 "payment_method": payment_method
             }
-            payment_resp = requests.post(
+            payment_resp = SESSION.post(
                 f"{REST_URL}/order_payments",
-                headers=SERVICE_HEADERS,
                 json=payment_record
             )
             if payment_resp.status_code in [200, 201]:
                 print(f"✅ Created payment history record: ₪{payment_amount} via {payment_method} for order {order_id}")
             else:
-                print(f"⚠️ Failed to create payment history record: {payment_resp.status_code} - {payment_resp.text}")
+                log.warning(f"Failed to create payment history record: {payment_resp.status_code} - {payment_resp.text}")
         except Exception as e:
-            print(f"⚠️ Error creating payment history record: {str(e)}")
+            log.warning(f"Error creating payment history record: {str(e)}")
     
-    # Create OrderUpdate model from mapped data
-    order_update = OrderUpdate(**update_data)
-    result = update_order(order_id, order_update)
+    # update_data is already mapped and normalized, so it goes straight to Supabase
+    result = _patch_order(order_id, update_data) if update_data else []
     
     # Get the updated order
     updated_order = result
@@ -600,44 +806,36 @@ def api_update_order(order_id: str, payload: dict):
     
     # Sync inspections if departure_date changed or order was updated
     new_departure_date = updated_order.get("departure_date") or update_data.get("departure_date")
-    order_status = updated_order.get("status") or update_data.get("status", current_order.get("status") if current_order else "חדש")
+    order_status = updated_order.get("status") or update_data.get("status", "חדש")
+    if "departure_date" not in update_data:
+        # Departure date was not part of this edit, so there is nothing to move
+        old_departure_date = new_departure_date
     
     if new_departure_date and order_status != "בוטל":
-        unit_number = updated_order.get("unit_number") or update_data.get("unit_number") or (current_order.get("unit_number") if current_order else "")
-        guest_name = updated_order.get("guest_name") or update_data.get("guest_name") or (current_order.get("guest_name") if current_order else "")
+        unit_number = updated_order.get("unit_number") or update_data.get("unit_number") or ""
+        guest_name = updated_order.get("guest_name") or update_data.get("guest_name") or ""
         
+        # The exit and cleaning inspections are independent, so sync them in parallel
         if old_departure_date != new_departure_date:
-            # Departure date changed - update inspection
-            update_inspection_for_departure_date(
-                old_departure_date,
-                new_departure_date,
-                order_id,
-                unit_number,
-                guest_name
-            )
-            # Also update cleaning inspection
-            update_cleaning_inspection_for_departure_date(
-                old_departure_date,
-                new_departure_date,
-                order_id,
-                unit_number,
-                guest_name
-            )
+            # Departure date changed - update inspection and cleaning inspection
+            sync_args = (old_departure_date, new_departure_date, order_id, unit_number, guest_name)
+            sync_futures = [
+                EXECUTOR.submit(update_inspection_for_departure_date, *sync_args),
+                EXECUTOR.submit(update_cleaning_inspection_for_departure_date, *sync_args),
+            ]
         else:
-            # Just ensure inspection exists for this date
-            create_inspection_for_departure_date(
-                new_departure_date,
-                order_id,
-                unit_number,
-                guest_name
-            )
-            # Also ensure cleaning inspection exists
-            create_cleaning_inspection_for_departure_date(
-                new_departure_date,
-                order_id,
-                unit_number,
-                guest_name
-            )
+            # Just ensure inspection and cleaning inspection exist for this date
+            sync_args = (new_departure_date, order_id, unit_number, guest_name)
+            sync_futures = [
+                EXECUTOR.submit(create_inspection_for_departure_date, *sync_args),
+                EXECUTOR.submit(create_cleaning_inspection_for_departure_date, *sync_args),
+            ]
+        for future in sync_futures:
+            try:
+                future.result()
+            except Exception as e:
+                # An inspection sync failure must not fail the order update
+                log.warning(f"Inspection sync failed for order {order_id}: {e}")
     
     # Return as single object, not array
     if isinstance(result, list):
@@ -646,164 +844,231 @@ def api_update_order(order_id: str, payload: dict):
 
 
 class OrderCreate(BaseModel):
+    # Accepts both snake_case and the frontend's camelCase field names
+    model_config = ConfigDict(populate_by_name=True)
+
     id: Optional[str] = None
-    guest_name: str
-    unit_number: str
-    arrival_date: str
-    departure_date: str
+    guest_name: str = Field(alias="guestName")
+    guest_phone: Optional[str] = Field(None, alias="guestPhone")
+    unit_number: str = Field(alias="unitNumber")
+    arrival_date: str = Field(alias="arrivalDate")
+    departure_date: str = Field(alias="departureDate")
     status: str
-    guests_count: int = 0
-    special_requests: Optional[str] = None
-    internal_notes: Optional[str] = None
-    paid_amount: float = 0
-    total_amount: float = 0
-    payment_method: Optional[str] = None
-    opened_by: Optional[str] = None
-
+    guests_count: int = Field(0, alias="guestsCount")
+    special_requests: Optional[str] = Field(None, alias="specialRequests")
+    internal_notes: Optional[str] = Field(None, alias="internalNotes")
+    paid_amount: float = Field(0, alias="paidAmount")
+    total_amount: float = Field(0, alias="totalAmount")
+    payment_method: Optional[str] = Field(None, alias="paymentMethod")
+    opened_by: Optional[str] = Field(
+        None, validation_alias=AliasChoices("openedBy", "opened_by", "userName", "user_name")
+    )
+
+
+# Values /api/orders fills in when the frontend leaves a field out
+API_ORDER_DEFAULTS = {
+    "guest_name": "",
+    "unit_number": "",
+    "arrival_date": "",
+    "departure_date": "",
+    "status": "חדש",
+    "special_requests": "",
+    "internal_notes": "",
+    "payment_method": "טרם נקבע",
+}
 
 @app.post("/orders")
 def create_order(payload: OrderCreate):
-    data = payload.dict(exclude_none=True)  # Exclude None values to avoid DB errors
-    if not data.get("id"):
-        data["id"] = str(uuid.uuid4())
+    data = payload.model_dump(exclude_none=True)  # Exclude None values to avoid DB errors; Postgres fills in id
     try:
-        resp = requests.post(
-            f"{REST_URL}/orders",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.post(
+            ORDERS_URL,
             json=data,
         )
         resp.raise_for_status()
+        invalidate_cache("reports_summary")
         # Supabase returns the inserted row(s) as a list
-        if resp.text:
-            body = resp.json()
+        if resp.content:
+            body = sb_json(resp)
             if isinstance(body, list) and body:
                 return body[0]
             return body
         # If empty response, return the data we sent (insert was successful)
         return data
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating order: {str(e)}")
 
+# String spellings of a true "completed" flag (older rows stored it as text)
+_TRUE = frozenset(("true", "1", "yes", "on"))
+
+# Default task sets are immutable (id, name) tuples; default_task_rows() builds
+# fresh insert rows from them so a request can never modify the shared defaults
+def default_task_rows(inspection_id: str, tasks) -> List[dict]:
+    return [
+        {"id": task_id, "inspection_id": inspection_id, "name": name, "completed": False}
+        for task_id, name in tasks
+    ]
+
 # Default inspection tasks (24 tasks) - for exit inspections
-DEFAULT_INSPECTION_TASKS = [
-    {"id": "1", "name": "לשים כלור בבריכה", "completed": False},
-    {"id": "2", "name": "להוסיף מים בבריכה", "completed": False},
-    {"id": "3", "name": "לנקות רובוט ולהפעיל", "completed": False},
-    {"id": "4", "name": "לנקות רשת פנים המנוע", "completed": False},
-    {"id": "5", "name": "לעשות בקווש שטיפה לפילטר", "completed": False},
-    {"id": "6", "name": "לטאטא הבק מהמדרגות ומשטחי רביצה", "completed": False},
-    {"id": "7", "name": "לשים כלור בגקוזי", "completed": False},
-    {"id": "8", "name": "להוסיף מים בגקוזי", "completed": False},
-    {"id": "9", "name": "לנקות רובוט גקוזי ולהפעיל", "completed": False},
-    {"id": "10", "name": "לנקות רשת פנים המנוע גקוזי", "completed": False},
-    {"id": "11", "name": "לעשות בקווש שטיפה לפילטר גקוזי", "completed": False},
-    {"id": "12", "name": "לטאטא הבק מהמדרגות ומשטחי רביצה גקוזי", "completed": False},
-    {"id": "13", "name": "ניקיון חדרים", "completed": False},
-    {"id": "14", "name": "ניקיון מטבח", "completed": False},
-    {"id": "15", "name": "ניקיון שירותים", "completed": False},
-    {"id": "16", "name": "פינוי זבל לפח אשפה פנים וחוץ הוילה", "completed": False},
-    {"id": "17", "name": "בדיקת מכשירים", "completed": False},
-    {"id": "18", "name": "בדיקת מצב ריהוט", "completed": False},
-    {"id": "19", "name": "החלפת מצעים", "completed": False},
-    {"id": "20", "name": "החלפת מגבות", "completed": False},
-    {"id": "21", "name": "בדיקת מלאי", "completed": False},
-    {"id": "22", "name": "לבדוק תקינות חדרים", "completed": False},
-    {"id": "23", "name": "כיבוי אורות פנים וחוץ הוילה", "completed": False},
-    {"id": "24", "name": "לנעול דלת ראשית", "completed": False},
-]
+DEFAULT_INSPECTION_TASKS = (
+    ("1", "לשים כלור בבריכה"),
+    ("2", "להוסיף מים בבריכה"),
+    ("3", "לנקות רובוט ולהפעיל"),
+    ("4", "לנקות רשת פנים המנוע"),
+    ("5", "לעשות בקווש שטיפה לפילטר"),
+    ("6", "לטאטא הבק מהמדרגות ומשטחי רביצה"),
+    ("7", "לשים כלור בגקוזי"),
+    ("8", "להוסיף מים בגקוזי"),
+    ("9", "לנקות רובוט גקוזי ולהפעיל"),
+    ("10", "לנקות רשת פנים המנוע גקוזי"),
+    ("11", "לעשות בקווש שטיפה לפילטר גקוזי"),
+    ("12", "לטאטא הבק מהמדרגות ומשטחי רביצה גקוזי"),
+    ("13", "ניקיון חדרים"),
+    ("14", "ניקיון מטבח"),
+    ("15", "ניקיון שירותים"),
+    ("16", "פינוי זבל לפח אשפה פנים וחוץ הוילה"),
+    ("17", "בדיקת מכשירים"),
+    ("18", "בדיקת מצב ריהוט"),
+    ("19", "החלפת מצעים"),
+    ("20", "החלפת מגבות"),
+    ("21", "בדיקת מלאי"),
+    ("22", "לבדוק תקינות חדרים"),
+    ("23", "כיבוי אורות פנים וחוץ הוילה"),
+    ("24", "לנעול דלת ראשית"),
+)
 
 # Default cleaning inspection tasks - for cleaning inspections
-DEFAULT_CLEANING_INSPECTION_TASKS = [
+DEFAULT_CLEANING_INSPECTION_TASKS = (
     # מטבח (Kitchen)
-    {"id": "1", "name": "מכונת קפה, לנקות ולהחליף פילטר קפה", "completed": False},
-    {"id": "2", "name": "קפה תה סוכר וכו׳", "completed": False},
-    {"id": "3", "name": "להעביר סמרטוט במתקן מים", "completed": False},
-    {"id": "4", "name": "מקרר – בפנים ובחוץ", "completed": False},
-    {"id": "5", "name": "תנור – בפנים ובחוץ", "completed": False},
-    {"id": "6", "name": "כיריים וגריל", "completed": False},
-    {"id": "7", "name": "מיקרו", "completed": False},
-    {"id": "8", "name": "כיור", "completed": False},
-    {"id": "9", "name": "כלים – לשטוף ליבש ולהחזיר לארון", "completed": False},
-    {"id": "10", "name": "לבדוק שכל הכלים נקיים", "completed": False},
-    {"id": "11", "name": "לבדוק שיש לפחות 20 כוסות אוכל מכל דבר", "completed": False},
-    {"id": "12", "name": "ארונות מטבח – לפתוח ולראות שאין דברים להוציא דברים לא קשורים", "completed": False},
-    {"id": "13", "name": "להעביר סמרטוט על הדלתות מטבח בחוץ", "completed": False},
-    {"id": "14", "name": "להעביר סמרטוט על הפח ולראות שנקי", "completed": False},
-    {"id": "15", "name": "פלטת שבת ומיחם מים חמים – לראות שאין אבן", "completed": False},
-    {"id": "16", "name": "סכו״ם, כלים, סמרטוט, סקוֹץ׳ חדשים לאורחים", "completed": False},
-    {"id": "17", "name": "סבון", "completed": False},
+    ("1", "מכונת קפה, לנקות ולהחליף פילטר קפה"),
+    ("2", "קפה תה סוכר וכו׳"),
+    ("3", "להעביר סמרטוט במתקן מים"),
+    ("4", "מקרר – בפנים ובחוץ"),
+    ("5", "תנור – בפנים ובחוץ"),
+    ("6", "כיריים וגריל"),
+    ("7", "מיקרו"),
+    ("8", "כיור"),
+    ("9", "כלים – לשטוף ליבש ולהחזיר לארון"),
+    ("10", "לבדוק שכל הכלים נקיים"),
+    ("11", "לבדוק שיש לפחות 20 כוסות אוכל מכל דבר"),
+    ("12", "ארונות מטבח – לפתוח ולראות שאין דברים להוציא דברים לא קשורים"),
+    ("13", "להעביר סמרטוט על הדלתות מטבח בחוץ"),
+    ("14", "להעביר סמרטוט על הפח ולראות שנקי"),
+    ("15", "פלטת שבת ומיחם מים חמים – לראות שאין אבן"),
+    ("16", "סכו״ם, כלים, סמרטוט, סקוֹץ׳ חדשים לאורחים"),
+    ("17", "סבון"),
     # סלון (Living Room)
-    {"id": "18", "name": "סלון שטיפה יסודית גם מתחת לספות ולשולחן, להזיז כורסאות ולבדוק שאין פירורים של אוכל", "completed": False},
-    {"id": "19", "name": "שולחן אוכל וספסלים (לנקות בשפריצר ולהעביר סמרטוט)", "completed": False},
-    {"id": "20", "name": "סלון – לנגב אבק ולהעביר סמרטוט גם על הספה. כיריות לנקות לסדר יפה", "completed": False},
-    {"id": "21", "name": "שולחן אוכל וספסלים – להעביר סמרטוט נקי עם תריס", "completed": False},
-    {"id": "22", "name": "חלונות ותריסים – עם ספריי חלונות וסמרטוט נקי. שלא יהיו סימנים. מסילות לנקות", "completed": False},
+    ("18", "סלון שטיפה יסודית גם מתחת לספות ולשולחן, להזיז כורסאות ולבדוק שאין פירורים של אוכל"),
+    ("19", "שולחן אוכל וספסלים (לנקות בשפריצר ולהעביר סמרטוט)"),
+    ("20", "סלון – לנגב אבק ולהעביר סמרטוט גם על הספה. כיריות לנקות לסדר יפה"),
+    ("21", "שולחן אוכל וספסלים – להעביר סמרטוט נקי עם תריס"),
+    ("22", "חלונות ותריסים – עם ספריי חלונות וסמרטוט נקי. שלא יהיו סימנים. מסילות לנקות"),
     # מסדרון (Hallway)
-    {"id": "23", "name": "מסדרון – לנגב בחוץ שטיחים. לנקות מסילות בחלונות. לנקות חלונות", "completed": False},
+    ("23", "מסדרון – לנגב בחוץ שטיחים. לנקות מסילות בחלונות. לנקות חלונות"),
     # חצר (Yard)
-    {"id": "24", "name": "טיפול ברזים וניקוי", "completed": False},
-    {"id": "25", "name": "להשקות עציצים בכל המתחם", "completed": False},
-    {"id": "26", "name": "פינת מנגל – לרוקן פחים ולנקות רשת, וכל אזור המנגל", "completed": False},
-    {"id": "27", "name": "לנקות דשא ולסדר פינות ישיבה", "completed": False},
-    {"id": "28", "name": "שולחן חוץ – להעביר סמרטוט עם חומר. כיסאות נקיים", "completed": False},
-    {"id": "29", "name": "שטיפה לרצפה בחוץ", "completed": False},
-    {"id": "30", "name": "לרוקן את הפחים, לשים שקית חדשה", "completed": False},
-    {"id": "31", "name": "להעביר סמרטוט על הפחים ולשים שקיות", "completed": False},
-]
+    ("24", "טיפול ברזים וניקוי"),
+    ("25", "להשקות עציצים בכל המתחם"),
+    ("26", "פינת מנגל – לרוקן פחים ולנקות רשת, וכל אזור המנגל"),
+    ("27", "לנקות דשא ולסדר פינות ישיבה"),
+    ("28", "שולחן חוץ – להעביר סמרטוט עם חומר. כיסאות נקיים"),
+    ("29", "שטיפה לרצפה בחוץ"),
+    ("30", "לרוקן את הפחים, לשים שקית חדשה"),
+    ("31", "להעביר סמרטוט על הפחים ולשים שקיות"),
+)
 
 # Default monthly inspection tasks - for monthly inspections
-DEFAULT_MONTHLY_INSPECTION_TASKS = [
-    {"id": "1", "name": "בדיקת תקינות מערכות חשמל", "completed": False},
-    {"id": "2", "name": "בדיקת תקינות מערכות מים", "completed": False},
-    {"id": "3", "name": "בדיקת תקינות מערכות גז", "completed": False},
-    {"id": "4", "name": "בדיקת תקינות מזגנים", "completed": False},
-    {"id": "5", "name": "בדיקת תקינות דודי שמש", "completed": False},
-    {"id": "6", "name": "בדיקת תקינות מערכות אבטחה", "completed": False},
-    {"id": "7", "name": "בדיקת תקינות מערכות תאורה", "completed": False},
-    {"id": "8", "name": "בדיקת תקינות דלתות וחלונות", "completed": False},
-    {"id": "9", "name": "בדיקת תקינות ריהוט וציוד", "completed": False},
-    {"id": "10", "name": "בדיקת תקינות מערכות ניקוז", "completed": False},
-    {"id": "11", "name": "בדיקת תקינות מערכות אוורור", "completed": False},
-    {"id": "12", "name": "בדיקת תקינות מערכות כיבוי אש", "completed": False},
-    {"id": "13", "name": "בדיקת תקינות מערכות אינטרנט", "completed": False},
-    {"id": "14", "name": "בדיקת תקינות מערכות טלוויזיה", "completed": False},
-    {"id": "15", "name": "בדיקת תקינות מערכות מיזוג", "completed": False},
-    {"id": "16", "name": "בדיקת תקינות מערכות מים חמים", "completed": False},
-    {"id": "17", "name": "בדיקת תקינות מערכות תאורה חוץ", "completed": False},
-    {"id": "18", "name": "בדיקת תקינות מערכות השקיה", "completed": False},
-    {"id": "19", "name": "בדיקת תקינות מערכות בריכה", "completed": False},
-    {"id": "20", "name": "בדיקת תקינות מערכות גקוזי", "completed": False},
-]
+DEFAULT_MONTHLY_INSPECTION_TASKS = (
+    ("1", "בדיקת תקינות מערכות חשמל"),
+    ("2", "בדיקת תקינות מערכות מים"),
+    ("3", "בדיקת תקינות מערכות גז"),
+    ("4", "בדיקת תקינות מזגנים"),
+    ("5", "בדיקת תקינות דודי שמש"),
+    ("6", "בדיקת תקינות מערכות אבטחה"),
+    ("7", "בדיקת תקינות מערכות תאורה"),
+    ("8", "בדיקת תקינות דלתות וחלונות"),
+    ("9", "בדיקת תקינות ריהוט וציוד"),
+    ("10", "בדיקת תקינות מערכות ניקוז"),
+    ("11", "בדיקת תקינות מערכות אוורור"),
+    ("12", "בדיקת תקינות מערכות כיבוי אש"),
+    ("13", "בדיקת תקינות מערכות אינטרנט"),
+    ("14", "בדיקת תקינות מערכות טלוויזיה"),
+    ("15", "בדיקת תקינות מערכות מיזוג"),
+    ("16", "בדיקת תקינות מערכות מים חמים"),
+    ("17", "בדיקת תקינות מערכות תאורה חוץ"),
+    ("18", "בדיקת תקינות מערכות השקיה"),
+    ("19", "בדיקת תקינות מערכות בריכה"),
+    ("20", "בדיקת תקינות מערכות גקוזי"),
+)
+
+def prune_inspections(url: str, inspections: List[dict], order_statuses: dict, label: str):
+    """
+    Delete inspections whose order is cancelled or no longer exists.
+    Orders missing from order_statuses are re-checked in one batched GET, and all
+    stale inspections are removed with a single in.() DELETE.
+    """
+    stale_ids = []
+    unknown = {}
+    for inspection in inspections:
+        inspection_order_id = inspection.get("order_id")
+        if not inspection_order_id:
+            continue
+        if order_statuses.get(inspection_order_id) == "בוטל":
+            stale_ids.append(inspection["id"])
+        elif inspection_order_id not in order_statuses:
+            unknown.setdefault(inspection_order_id, []).append(inspection["id"])
+    
+    if unknown:
+        # The order isn't in the orders list, check which ones are really gone
+        try:
+            found_resp = SESSION.get(
+                ORDERS_URL,
+                params={"id": f"in.({','.join(unknown)})", "select": "id"}
+            )
+            found_resp.raise_for_status()
+            found = {order["id"] for order in sb_json(found_resp) or []}
+            stale_ids.extend(i for order_id, ids in unknown.items() if order_id not in found for i in ids)
+        except Exception as e:
+            log.warning(f"Error checking orders for {len(unknown)} {label}s: {str(e)}")
+    
+    if stale_ids:
+        try:
+            delete_resp = SESSION.delete(url, params={"id": f"in.({','.join(stale_ids)})"})
+            if delete_resp.status_code in [200, 204]:
+                log.info(f"Deleted {len(stale_ids)} {label}s for cancelled or missing orders")
+            else:
+                log.warning(f"Failed to delete {len(stale_ids)} {label}s: {delete_resp.status_code}")
+        except Exception as e:
+            log.warning(f"Error deleting {label}s: {str(e)}")
 
 def sync_inspections_with_orders():
     """Sync inspections table with all orders - ensure every departure date has an inspection"""
     try:
-        # Get all non-cancelled orders
-        orders_resp = requests.get(
-            f"{REST_URL}/orders",
-            headers=SERVICE_HEADERS,
-            params={"status": "neq.בוטל", "select": "id,departure_date,unit_number,guest_name,status"}
+        # Get all orders and all existing inspections in parallel (cancelled orders are
+        # needed too, so their inspections can be removed below)
+        inspections_future = EXECUTOR.submit(
+            SESSION.get,
+            INSPECTIONS_URL,
+            params={"select": "id,order_id,departure_date,unit_number,guest_name"}
+        )
+        orders_resp = SESSION.get(
+            ORDERS_URL,
+            params={"select": "id,departure_date,unit_number,guest_name,status"}
         )
         
         if orders_resp.status_code != 200:
-            print(f"Warning: Could not fetch orders for sync: {orders_resp.status_code}")
+            log.warning(f"Could not fetch orders for sync: {orders_resp.status_code}")
             return
         
-        orders = orders_resp.json() or []
+        orders = sb_json(orders_resp) or []
         
-        # Get all existing inspections
-        inspections_resp = requests.get(
-            f"{REST_URL}/inspections",
-            headers=SERVICE_HEADERS,
-            params={"select": "id,departure_date"}
-        )
+        inspections_resp = inspections_future.result()
         
         existing_inspections = []
         if inspections_resp.status_code == 200:
-            existing_inspections = inspections_resp.json() or []
+            existing_inspections = sb_json(inspections_resp) or []
         elif inspections_resp.status_code == 404:
             existing_inspections = []
         
@@ -811,81 +1076,85 @@ def sync_inspections_with_orders():
         valid_orders = []
         for order in orders:
             departure_date = order.get("departure_date")
-            unit_number = order.get("unit_number", "").strip() if order.get("unit_number") else ""
-            guest_name = order.get("guest_name", "").strip() if order.get("guest_name") else ""
+            unit_number = (order.get("unit_number") or "").strip()
+            guest_name = (order.get("guest_name") or "").strip()
             order_id = order.get("id")
             
             # Only exclude cancelled orders - closed orders (שולם, שולם חלקית) keep their inspections
             if departure_date and order.get("status") != "בוטל" and unit_number and guest_name and order_id:
-                valid_orders.append(order)
+                # Keep the stripped values so they aren't recomputed below
+                valid_orders.append({**order, "unit_number": unit_number, "guest_name": guest_name})
         
         # Get existing inspections by order_id
         existing_inspections_by_order = {insp.get("order_id"): insp for insp in existing_inspections if insp.get("order_id")}
-        existing_order_ids = set(existing_inspections_by_order.keys())
         
-        # Create inspections for orders that don't have one yet
+        # Split orders into inspections to create and inspections whose order details changed
+        new_inspections = []
+        changed_inspections = []
         for order in valid_orders:
-            order_id = order.get("id")
-            if order_id and order_id not in existing_order_ids:
-                # Create inspection for this order
-                create_inspection_for_departure_date(
-                    order.get("departure_date"),
-                    order_id,
-                    order.get("unit_number", "").strip(),
-                    order.get("guest_name", "").strip()
+            order_id = order["id"]
+            row = {
+                "order_id": order_id,
+                "unit_number": order["unit_number"],
+                "guest_name": order["guest_name"],
+                "departure_date": order["departure_date"],
+            }
+            existing = existing_inspections_by_order.get(order_id)
+            if existing is None:
+                new_inspections.append({"id": f"INSP-{order_id}", **row, "status": "זמן הביקורות טרם הגיע"})
+            elif any(existing.get(key) != value for key, value in row.items()):
+                changed_inspections.append({"id": existing["id"], **row})
+        
+        # One bulk insert for all new inspections plus one for their default tasks
+        if new_inspections:
+            create_resp = SESSION.post(
+                INSPECTIONS_URL,
+                json=new_inspections,
+                headers=PREFER_IGNORE_DUPLICATES
+            )
+            if create_resp.status_code in [200, 201, 204]:
+                tasks_data = [
+                    row
+                    for inspection in new_inspections
+                    for row in default_task_rows(inspection["id"], DEFAULT_INSPECTION_TASKS)
+                ]
+                tasks_resp = SESSION.post(
+                    INSPECTION_TASKS_URL,
+                    json=tasks_data,
+                    headers=PREFER_IGNORE_DUPLICATES
+                )
+                if tasks_resp.status_code not in [200, 201, 204, 404]:
+                    log.warning(f"Failed to create default inspection tasks: {tasks_resp.status_code}")
+            elif create_resp.status_code != 404:
+                log.warning(f"Failed to create {len(new_inspections)} inspections: {create_resp.status_code}")
+        
+        # Refresh unit/guest/date on inspections whose order changed. These are PATCHes, not
+        # an upsert: an upsert inserts the partial row first, which fails the NOT NULL status
+        def patch_inspection(row):
+            inspection_id = row.pop("id")
+            try:
+                update_resp = SESSION.patch(
+                    INSPECTIONS_URL,
+                    params={"id": f"eq.{inspection_id}"},
+                    json=row,
+                    headers=PREFER_MINIMAL
                 )
+                if update_resp.status_code not in [200, 204]:
+                    log.warning(f"Failed to update inspection {inspection_id}: {update_resp.status_code}")
+            except Exception as e:
+                log.warning(f"Error updating inspection {inspection_id}: {str(e)}")
         
-        # Remove inspections only if the order is cancelled
-        # Get all order IDs and their statuses for efficient lookup
-        all_order_ids = {order.get("id"): order.get("status") for order in orders if order.get("id")}
-        valid_order_ids = {order.get("id") for order in valid_orders if order.get("id")}
+        # Independent rows, so the PATCHes run in parallel on the shared executor
+        list(EXECUTOR.map(patch_inspection, changed_inspections))
         
-        for inspection in existing_inspections:
-            inspection_order_id = inspection.get("order_id")
-            inspection_id = inspection.get("id")
-            
-            # Delete inspection only if the order is cancelled (בוטל)
-            if inspection_order_id:
-                order_status = all_order_ids.get(inspection_order_id)
-                if order_status == "בוטל":
-                    # Order is cancelled, delete inspection
-                    try:
-                        delete_resp = requests.delete(
-                            f"{REST_URL}/inspections?id=eq.{inspection_id}",
-                            headers=SERVICE_HEADERS
-                        )
-                        if delete_resp.status_code in [200, 204]:
-                            print(f"Deleted inspection {inspection_id} for cancelled order {inspection_order_id}")
-                    except Exception as e:
-                        print(f"Warning: Error deleting inspection {inspection_id}: {str(e)}")
-                elif inspection_order_id not in all_order_ids:
-                    # Order doesn't exist in the orders list, check if it's really gone
-                    try:
-                        order_check = requests.get(
-                            f"{REST_URL}/orders",
-                            headers=SERVICE_HEADERS,
-                            params={"id": f"eq.{inspection_order_id}", "select": "id,status"}
-                        )
-                        if order_check.status_code == 200:
-                            order_data = order_check.json() or []
-                            if not order_data:
-                                # Order doesn't exist, delete inspection
-                                try:
-                                    delete_resp = requests.delete(
-                                        f"{REST_URL}/inspections?id=eq.{inspection_id}",
-                                        headers=SERVICE_HEADERS
-                                    )
-                                    if delete_resp.status_code in [200, 204]:
-                                        print(f"Deleted orphaned inspection {inspection_id} for non-existent order {inspection_order_id}")
-                                except Exception as e:
-                                    print(f"Warning: Error deleting orphaned inspection {inspection_id}: {str(e)}")
-                    except Exception as e:
-                        print(f"Warning: Error checking order {inspection_order_id} for inspection {inspection_id}: {str(e)}")
+        # Remove inspections only if the order is cancelled or gone
+        all_order_ids = {order.get("id"): order.get("status") for order in orders if order.get("id")}
+        prune_inspections(INSPECTIONS_URL, existing_inspections, all_order_ids, "inspection")
         
         print(f"Synced inspections with orders: {len(valid_orders)} valid orders, {len(existing_inspections)} existing inspections")
         
     except Exception as e:
-        print(f"Warning: Error syncing inspections with orders: {str(e)}")
+        log.warning(f"Error syncing inspections with orders: {str(e)}")
 
 def update_inspection_for_departure_date(old_date: str, new_date: str, order_id: str, unit_number: str, guest_name: str):
     """Update inspection when order departure date changes"""
@@ -893,27 +1162,12 @@ def update_inspection_for_departure_date(old_date: str, new_date: str, order_id:
         return None
     
     try:
-        # If old date exists, check if we need to move/update the inspection
-        if old_date and old_date != new_date:
-            # Check if old date inspection has other orders
-            old_orders_resp = requests.get(
-                f"{REST_URL}/orders",
-                headers=SERVICE_HEADERS,
-                params={"departure_date": f"eq.{old_date}", "status": "neq.בוטל", "select": "id"}
-            )
-            old_orders = []
-            if old_orders_resp.status_code == 200:
-                old_orders = old_orders_resp.json() or []
-            
-            # If old date has no other orders, we can delete or update that inspection
-            # For now, we'll leave it and create a new one for the new date
-            # (The sync function will clean up orphaned inspections)
-        
-        # Create/update inspection for new departure date
+        # Inspections are keyed by order, so the existing one is updated in place
+        # (the sync function cleans up orphaned inspections)
         return create_inspection_for_departure_date(new_date, order_id, unit_number, guest_name)
         
     except Exception as e:
-        print(f"Warning: Error updating inspection for departure date change: {str(e)}")
+        log.warning(f"Error updating inspection for departure date change: {str(e)}")
         return None
 
 def create_inspection_for_departure_date(departure_date: str, order_id: str, unit_number: str, guest_name: str):
@@ -927,48 +1181,7 @@ def create_inspection_for_departure_date(departure_date: str, order_id: str, uni
         return None
     
     try:
-        # Check if inspection already exists for this order_id
         inspection_id = f"INSP-{order_id}"
-        check_resp = requests.get(
-            f"{REST_URL}/inspections",
-            headers=SERVICE_HEADERS,
-            params={"id": f"eq.{inspection_id}", "select": "id,departure_date,unit_number,guest_name,order_id"}
-        )
-        
-        existing_inspections = []
-        if check_resp.status_code == 200:
-            existing_inspections = check_resp.json() or []
-        elif check_resp.status_code == 404:
-            # Table doesn't exist yet, that's OK
-            existing_inspections = []
-        
-        # If inspection already exists for this order, update it if needed
-        if existing_inspections and len(existing_inspections) > 0:
-            existing = existing_inspections[0]
-            # Update unit_number, guest_name, and departure_date if they changed
-            update_data = {}
-            if existing.get("unit_number") != unit_number:
-                update_data["unit_number"] = unit_number
-            if existing.get("guest_name") != guest_name:
-                update_data["guest_name"] = guest_name
-            if existing.get("departure_date") != departure_date:
-                update_data["departure_date"] = departure_date
-            
-            if update_data:
-                try:
-                    update_resp = requests.patch(
-                        f"{REST_URL}/inspections?id=eq.{existing['id']}",
-                        headers=SERVICE_HEADERS,
-                        json=update_data
-                    )
-                    if update_resp.status_code in [200, 201, 204]:
-                        print(f"Updated inspection {existing['id']} for order {order_id}")
-                except Exception as e:
-                    print(f"Warning: Error updating inspection: {str(e)}")
-            
-            return existing
-        
-        # Create new inspection for this order (separate inspection per order)
         inspection_data = {
             "id": inspection_id,
             "order_id": order_id,
@@ -978,45 +1191,53 @@ def create_inspection_for_departure_date(departure_date: str, order_id: str, uni
             "status": "זמן הביקורות טרם הגיע",
         }
         
-        # Create inspection
-        create_resp = requests.post(
-            f"{REST_URL}/inspections",
-            headers=SERVICE_HEADERS,
-            json=inspection_data
+        # Insert the inspection unless this order already has one; only a newly
+        # inserted row comes back, so no existence check is needed beforehand
+        create_resp = SESSION.post(
+            INSPECTIONS_URL,
+            json=inspection_data,
+            headers=PREFER_INSERT_NEW
         )
         
-        if create_resp.status_code not in [200, 201, 404, 409]:
-            # If not 404 (table doesn't exist) or 409 (conflict), log error but don't fail
-            if create_resp.status_code != 404 and create_resp.status_code != 409:
-                print(f"Warning: Failed to create inspection for departure date {departure_date}: {create_resp.status_code}")
-        
-        # Create all default tasks for this inspection
-        for task in DEFAULT_INSPECTION_TASKS:
-            task_data = {
-                "id": task["id"],
-                "inspection_id": inspection_id,
-                "name": task["name"],
-                "completed": task["completed"],
-            }
-            
+        if create_resp.status_code in [200, 201] and not sb_json(create_resp):
+            # Inspection already exists for this order - refresh unit, guest and date
+            update_data = {"unit_number": unit_number, "guest_name": guest_name, "departure_date": departure_date}
             try:
-                task_resp = requests.post(
-                    f"{REST_URL}/inspection_tasks",
-                    headers=SERVICE_HEADERS,
-                    json=task_data
+                update_resp = SESSION.patch(
+                    INSPECTIONS_URL,
+                    params={"id": f"eq.{inspection_id}"},
+                    json=update_data,
+                    headers=PREFER_MINIMAL
                 )
-                # Ignore 404 (table doesn't exist) and 409 (task already exists)
-                if task_resp.status_code not in [200, 201, 404, 409]:
-                    print(f"Warning: Failed to create task {task['id']} for inspection {inspection_id}: {task_resp.status_code}")
+                if update_resp.status_code not in [200, 204]:
+                    log.warning(f"Failed to update inspection {inspection_id}: {update_resp.status_code}")
             except Exception as e:
-                print(f"Warning: Error creating task {task['id']}: {str(e)}")
+                log.warning(f"Error updating inspection: {str(e)}")
+            return {"id": inspection_id, "order_id": order_id, **update_data}
+        
+        if create_resp.status_code not in [200, 201, 404]:
+            # If not 404 (table doesn't exist), log error but don't fail
+            log.warning(f"Failed to create inspection for departure date {departure_date}: {create_resp.status_code}")
+        
+        # Create all default tasks for this inspection in one bulk insert (existing tasks are skipped)
+        try:
+            task_resp = SESSION.post(
+                INSPECTION_TASKS_URL,
+                json=default_task_rows(inspection_id, DEFAULT_INSPECTION_TASKS),
+                headers=PREFER_IGNORE_DUPLICATES
+            )
+            # Ignore 404 (table doesn't exist)
+            if task_resp.status_code not in [200, 201, 204, 404]:
+                log.warning(f"Failed to create tasks for inspection {inspection_id}: {task_resp.status_code}")
+        except Exception as e:
+            log.warning(f"Error creating tasks for inspection {inspection_id}: {str(e)}")
         
         print(f"Created inspection {inspection_id} for order {order_id} (departure date {departure_date})")
         return inspection_data
         
     except Exception as e:
         # Don't fail order creation if inspection creation fails
-        print(f"Warning: Failed to create inspection for order {order_id}: {str(e)}")
+        log.warning(f"Failed to create inspection for order {order_id}: {str(e)}")
         return None
 
 def create_cleaning_inspection_for_departure_date(departure_date: str, order_id: str, unit_number: str, guest_name: str):
@@ -1030,48 +1251,7 @@ def create_cleaning_inspection_for_departure_date(departure_date: str, order_id:
         return None
     
     try:
-        # Check if cleaning inspection already exists for this order_id
         inspection_id = f"CLEAN-{order_id}"
-        check_resp = requests.get(
-            f"{REST_URL}/cleaning_inspections",
-            headers=SERVICE_HEADERS,
-            params={"id": f"eq.{inspection_id}", "select": "id,departure_date,unit_number,guest_name,order_id"}
-        )
-        
-        existing_inspections = []
-        if check_resp.status_code == 200:
-            existing_inspections = check_resp.json() or []
-        elif check_resp.status_code == 404:
-            # Table doesn't exist yet, that's OK
-            existing_inspections = []
-        
-        # If inspection already exists for this order, update it if needed
-        if existing_inspections and len(existing_inspections) > 0:
-            existing = existing_inspections[0]
-            # Update unit_number, guest_name, and departure_date if they changed
-            update_data = {}
-            if existing.get("unit_number") != unit_number:
-                update_data["unit_number"] = unit_number
-            if existing.get("guest_name") != guest_name:
-                update_data["guest_name"] = guest_name
-            if existing.get("departure_date") != departure_date:
-                update_data["departure_date"] = departure_date
-            
-            if update_data:
-                try:
-                    update_resp = requests.patch(
-                        f"{REST_URL}/cleaning_inspections?id=eq.{existing['id']}",
-                        headers=SERVICE_HEADERS,
-                        json=update_data
-                    )
-                    if update_resp.status_code in [200, 201, 204]:
-                        print(f"Updated cleaning inspection {existing['id']} for order {order_id}")
-                except Exception as e:
-                    print(f"Warning: Error updating cleaning inspection: {str(e)}")
-            
-            return existing
-        
-        # Create new cleaning inspection for this order (separate inspection per order)
         inspection_data = {
             "id": inspection_id,
             "order_id": order_id,
@@ -1081,45 +1261,53 @@ def create_cleaning_inspection_for_departure_date(departure_date: str, order_id:
             "status": "זמן הביקורות טרם הגיע",
         }
         
-        # Create cleaning inspection
-        create_resp = requests.post(
-            f"{REST_URL}/cleaning_inspections",
-            headers=SERVICE_HEADERS,
-            json=inspection_data
+        # Insert the cleaning inspection unless this order already has one; only a newly
+        # inserted row comes back, so no existence check is needed beforehand
+        create_resp = SESSION.post(
+            CLEANING_INSPECTIONS_URL,
+            json=inspection_data,
+            headers=PREFER_INSERT_NEW
         )
         
-        if create_resp.status_code not in [200, 201, 404, 409]:
-            # If not 404 (table doesn't exist) or 409 (conflict), log error but don't fail
-            if create_resp.status_code != 404 and create_resp.status_code != 409:
-                print(f"Warning: Failed to create cleaning inspection for departure date {departure_date}: {create_resp.status_code}")
-        
-        # Create all default tasks for this cleaning inspection
-        for task in DEFAULT_CLEANING_INSPECTION_TASKS:
-            task_data = {
-                "id": task["id"],
-                "inspection_id": inspection_id,
-                "name": task["name"],
-                "completed": task["completed"],
-            }
-            
+        if create_resp.status_code in [200, 201] and not sb_json(create_resp):
+            # Cleaning inspection already exists for this order - refresh unit, guest and date
+            update_data = {"unit_number": unit_number, "guest_name": guest_name, "departure_date": departure_date}
             try:
-                task_resp = requests.post(
-                    f"{REST_URL}/cleaning_inspection_tasks",
-                    headers=SERVICE_HEADERS,
-                    json=task_data
+                update_resp = SESSION.patch(
+                    CLEANING_INSPECTIONS_URL,
+                    params={"id": f"eq.{inspection_id}"},
+                    json=update_data,
+                    headers=PREFER_MINIMAL
                 )
-                # Ignore 404 (table doesn't exist) and 409 (task already exists)
-                if task_resp.status_code not in [200, 201, 404, 409]:
-                    print(f"Warning: Failed to create cleaning task {task['id']} for inspection {inspection_id}: {task_resp.status_code}")
+                if update_resp.status_code not in [200, 204]:
+                    log.warning(f"Failed to update cleaning inspection {inspection_id}: {update_resp.status_code}")
             except Exception as e:
-                print(f"Warning: Exception creating cleaning task {task['id']}: {str(e)}")
+                log.warning(f"Error updating cleaning inspection: {str(e)}")
+            return {"id": inspection_id, "order_id": order_id, **update_data}
+        
+        if create_resp.status_code not in [200, 201, 404]:
+            # If not 404 (table doesn't exist), log error but don't fail
+            log.warning(f"Failed to create cleaning inspection for departure date {departure_date}: {create_resp.status_code}")
+        
+        # Create all default tasks for this cleaning inspection in one bulk insert (existing tasks are skipped)
+        try:
+            task_resp = SESSION.post(
+                CLEANING_INSPECTION_TASKS_URL,
+                json=default_task_rows(inspection_id, DEFAULT_CLEANING_INSPECTION_TASKS),
+                headers=PREFER_IGNORE_DUPLICATES
+            )
+            # Ignore 404 (table doesn't exist)
+            if task_resp.status_code not in [200, 201, 204, 404]:
+                log.warning(f"Failed to create cleaning tasks for inspection {inspection_id}: {task_resp.status_code}")
+        except Exception as e:
+            log.warning(f"Exception creating cleaning tasks for inspection {inspection_id}: {str(e)}")
         
         print(f"Created cleaning inspection {inspection_id} for order {order_id} (departure date {departure_date})")
         return inspection_data
         
     except Exception as e:
         # Don't fail order creation if cleaning inspection creation fails
-        print(f"Warning: Failed to create cleaning inspection for order {order_id}: {str(e)}")
+        log.warning(f"Failed to create cleaning inspection for order {order_id}: {str(e)}")
         return None
 
 def update_cleaning_inspection_for_departure_date(old_departure_date: str, new_departure_date: str, order_id: str, unit_number: str, guest_name: str):
@@ -1132,36 +1320,39 @@ def update_cleaning_inspection_for_departure_date(old_departure_date: str, new_d
         if old_departure_date and old_departure_date != new_departure_date:
             old_inspection_id = f"CLEAN-{old_departure_date}"
             try:
-                delete_resp = requests.delete(
-                    f"{REST_URL}/cleaning_inspections?id=eq.{old_inspection_id}",
-                    headers=SERVICE_HEADERS
+                delete_resp = SESSION.delete(
+                    f"{CLEANING_INSPECTIONS_URL}?id=eq.{old_inspection_id}",
                 )
                 if delete_resp.status_code in [200, 204]:
                     print(f"Deleted old cleaning inspection {old_inspection_id} due to departure date change")
             except Exception as e:
-                print(f"Warning: Error deleting old cleaning inspection: {str(e)}")
+                log.warning(f"Error deleting old cleaning inspection: {str(e)}")
         
         # Create new cleaning inspection for new departure date
         return create_cleaning_inspection_for_departure_date(new_departure_date, order_id, unit_number, guest_name)
     except Exception as e:
-        print(f"Warning: Error updating cleaning inspection for departure date change: {str(e)}")
+        log.warning(f"Error updating cleaning inspection for departure date change: {str(e)}")
         return None
 
 def sync_cleaning_inspections_with_orders():
     """Sync cleaning inspections table with all orders - ensure every departure date has a cleaning inspection"""
     try:
-        # Get all orders
-        orders_resp = requests.get(
-            f"{REST_URL}/orders",
-            headers=SERVICE_HEADERS,
+        # Get all orders and all existing cleaning inspections in parallel
+        cleaning_inspections_future = EXECUTOR.submit(
+            SESSION.get,
+            CLEANING_INSPECTIONS_URL,
+            params={"select": "id,departure_date,order_id"}
+        )
+        orders_resp = SESSION.get(
+            ORDERS_URL,
             params={"select": "id,departure_date,unit_number,guest_name,status"}
         )
         
         if orders_resp.status_code != 200:
-            print(f"Warning: Failed to fetch orders for cleaning inspection sync: {orders_resp.status_code}")
+            log.warning(f"Failed to fetch orders for cleaning inspection sync: {orders_resp.status_code}")
             return
         
-        orders = orders_resp.json() or []
+        orders = sb_json(orders_resp) or []
         
         # Filter orders: only cancelled orders are excluded (closed orders keep their inspections)
         valid_orders = []
@@ -1174,24 +1365,20 @@ def sync_cleaning_inspections_with_orders():
                 continue
             
             # Skip orders with empty unit_number or guest_name
-            unit_number = order.get("unit_number", "").strip()
-            guest_name = order.get("guest_name", "").strip()
+            unit_number = (order.get("unit_number") or "").strip()
+            guest_name = (order.get("guest_name") or "").strip()
             order_id = order.get("id")
             if not unit_number or not guest_name or not order_id:
                 continue
             
-            valid_orders.append(order)
+            # Keep the stripped values so they aren't recomputed below
+            valid_orders.append({**order, "unit_number": unit_number, "guest_name": guest_name})
         
-        # Get all existing cleaning inspections
-        cleaning_inspections_resp = requests.get(
-            f"{REST_URL}/cleaning_inspections",
-            headers=SERVICE_HEADERS,
-            params={"select": "id,departure_date,order_id"}
-        )
+        cleaning_inspections_resp = cleaning_inspections_future.result()
         
         existing_cleaning_inspections = []
         if cleaning_inspections_resp.status_code == 200:
-            existing_cleaning_inspections = cleaning_inspections_resp.json() or []
+            existing_cleaning_inspections = sb_json(cleaning_inspections_resp) or []
         elif cleaning_inspections_resp.status_code == 404:
             existing_cleaning_inspections = []
         
@@ -1199,95 +1386,59 @@ def sync_cleaning_inspections_with_orders():
         existing_cleaning_inspections_by_order = {insp.get("order_id"): insp for insp in existing_cleaning_inspections if insp.get("order_id")}
         existing_cleaning_order_ids = set(existing_cleaning_inspections_by_order.keys())
         
-        # Create cleaning inspections for orders that don't have one yet
-        for order in valid_orders:
-            order_id = order.get("id")
-            if order_id and order_id not in existing_cleaning_order_ids:
-                # Create cleaning inspection for this order
-                create_cleaning_inspection_for_departure_date(
-                    order.get("departure_date"),
-                    order_id,
-                    order.get("unit_number", "").strip(),
-                    order.get("guest_name", "").strip()
+        # Create cleaning inspections for orders that don't have one yet:
+        # one bulk insert for the inspections plus one for their default tasks
+        new_cleaning_inspections = [
+            {
+                "id": f"CLEAN-{order['id']}",
+                "order_id": order["id"],
+                "unit_number": order["unit_number"],
+                "guest_name": order["guest_name"],
+                "departure_date": order["departure_date"],
+                "status": "זמן הביקורות טרם הגיע",
+            }
+            for order in valid_orders
+            if order["id"] not in existing_cleaning_order_ids
+        ]
+        if new_cleaning_inspections:
+            create_resp = SESSION.post(
+                CLEANING_INSPECTIONS_URL,
+                json=new_cleaning_inspections,
+                headers=PREFER_IGNORE_DUPLICATES
+            )
+            if create_resp.status_code in [200, 201, 204]:
+                tasks_data = [
+                    row
+                    for inspection in new_cleaning_inspections
+                    for row in default_task_rows(inspection["id"], DEFAULT_CLEANING_INSPECTION_TASKS)
+                ]
+                tasks_resp = SESSION.post(
+                    CLEANING_INSPECTION_TASKS_URL,
+                    json=tasks_data,
+                    headers=PREFER_IGNORE_DUPLICATES
                 )
+                if tasks_resp.status_code not in [200, 201, 204, 404]:
+                    log.warning(f"Failed to create default cleaning inspection tasks: {tasks_resp.status_code}")
+            elif create_resp.status_code != 404:
+                log.warning(f"Failed to create {len(new_cleaning_inspections)} cleaning inspections: {create_resp.status_code}")
         
-        # Remove cleaning inspections only if the order is cancelled
-        # Get all order IDs and their statuses for efficient lookup
+        # Remove cleaning inspections only if the order is cancelled or gone
         all_order_ids = {order.get("id"): order.get("status") for order in orders if order.get("id")}
-        valid_order_ids = {order.get("id") for order in valid_orders if order.get("id")}
-        
-        for inspection in existing_cleaning_inspections:
-            inspection_order_id = inspection.get("order_id")
-            inspection_id = inspection.get("id")
-            
-            # Delete cleaning inspection only if the order is cancelled (בוטל)
-            if inspection_order_id:
-                order_status = all_order_ids.get(inspection_order_id)
-                if order_status == "בוטל":
-                    # Order is cancelled, delete cleaning inspection
-                    try:
-                        delete_resp = requests.delete(
-                            f"{REST_URL}/cleaning_inspections?id=eq.{inspection_id}",
-                            headers=SERVICE_HEADERS
-                        )
-                        if delete_resp.status_code in [200, 204]:
-                            print(f"Deleted cleaning inspection {inspection_id} for cancelled order {inspection_order_id}")
-                    except Exception as e:
-                        print(f"Warning: Error deleting cleaning inspection {inspection_id}: {str(e)}")
-                elif inspection_order_id not in all_order_ids:
-                    # Order doesn't exist in the orders list, check if it's really gone
-                    try:
-                        order_check = requests.get(
-                            f"{REST_URL}/orders",
-                            headers=SERVICE_HEADERS,
-                            params={"id": f"eq.{inspection_order_id}", "select": "id,status"}
-                        )
-                        if order_check.status_code == 200:
-                            order_data = order_check.json() or []
-                            if not order_data:
-                                # Order doesn't exist, delete cleaning inspection
-                                try:
-                                    delete_resp = requests.delete(
-                                        f"{REST_URL}/cleaning_inspections?id=eq.{inspection_id}",
-                                        headers=SERVICE_HEADERS
-                                    )
-                                    if delete_resp.status_code in [200, 204]:
-                                        print(f"Deleted orphaned cleaning inspection {inspection_id} for non-existent order {inspection_order_id}")
-                                except Exception as e:
-                                    print(f"Warning: Error deleting orphaned cleaning inspection {inspection_id}: {str(e)}")
-                    except Exception as e:
-                        print(f"Warning: Error checking order {inspection_order_id} for cleaning inspection {inspection_id}: {str(e)}")
+        prune_inspections(CLEANING_INSPECTIONS_URL, existing_cleaning_inspections, all_order_ids, "cleaning inspection")
         
         print(f"Synced cleaning inspections with {len(orders)} orders: {len(valid_orders)} valid orders, {len(existing_cleaning_inspections)} existing cleaning inspections")
     except Exception as e:
-        print(f"Error syncing cleaning inspections with orders: {str(e)}")
+        log.warning(f"Error syncing cleaning inspections with orders: {str(e)}")
 
 @app.post("/api/orders")
 def api_create_order(payload: dict):
     """Create order with frontend camelCase format"""
-    # Map frontend camelCase to backend snake_case
-    order_data = {
-        "guest_name": payload.get("guestName", ""),
-        "guest_phone": payload.get("guestPhone") or None,
-        "unit_number": payload.get("unitNumber", ""),
-        "arrival_date": payload.get("arrivalDate", ""),
-        "departure_date": payload.get("departureDate", ""),
-        "status": payload.get("status", "חדש"),
-        "guests_count": payload.get("guestsCount", 0),
-        "special_requests": payload.get("specialRequests") or "",
-        "internal_notes": payload.get("internalNotes") or "",
-        "paid_amount": payload.get("paidAmount", 0),
-        "total_amount": payload.get("totalAmount", 0),
-        "payment_method": payload.get("paymentMethod", "טרם נקבע"),
-    }
-    
-    # Only include opened_by if it has a value (don't send None to avoid DB errors if column doesn't exist)
-    opened_by = payload.get("openedBy") or payload.get("opened_by") or payload.get("userName") or payload.get("user_name")
-    if opened_by:
-        order_data["opened_by"] = opened_by
-    
-    # Create OrderCreate model from mapped data
-    order_create = OrderCreate(**order_data)
+    # OrderCreate maps camelCase itself; empty values fall back to the frontend defaults
+    # (and opened_by is left out entirely so it isn't sent if the column doesn't exist).
+    # A client-sent id is dropped (it may be a local placeholder); the database generates it.
+    order_data = {**API_ORDER_DEFAULTS, **{k: v for k, v in payload.items() if v not in (None, "") and k != "id"}}
+    order_create = OrderCreate.model_validate(order_data)
+    order_data = order_create.model_dump(exclude_none=True)
     result = create_order(order_create)
     
     # Get the created order (handle both single object and list responses)
@@ -1317,13 +1468,13 @@ def api_create_order(payload: dict):
 @app.delete("/orders/{order_id}")
 def delete_order(order_id: str):
     try:
-        resp = requests.delete(
-            f"{REST_URL}/orders",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.delete(
+            ORDERS_URL,
             params={"id": f"eq.{order_id}"},
         )
         resp.raise_for_status()
-        return JSONResponse(content=resp.json() or [], status_code=200)
+        invalidate_cache("reports_summary")
+        return sb_json(resp) or []
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1331,30 +1482,31 @@ def delete_order(order_id: str):
 def api_delete_order(order_id: str):
     """Delete an order - API endpoint for frontend"""
     try:
-        resp = requests.delete(
-            f"{REST_URL}/orders",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.delete(
+            ORDERS_URL,
             params={"id": f"eq.{order_id}"},
         )
         resp.raise_for_status()
-        return JSONResponse(content={"message": "Deleted successfully"}, status_code=200)
+        invalidate_cache("reports_summary")
+        return {"message": "Deleted successfully"}
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting order: {str(e)}")
 
 @app.get("/inspections")
+@app.get("/api/inspections")
 def inspections():
     """Get all inspections with their tasks"""
     try:
         # First get all inspections
-        resp = requests.get(f"{REST_URL}/inspections", headers=SERVICE_HEADERS, params={"select": "*"})
+        resp = SESSION.get(INSPECTIONS_URL, params={"select": "*"})
         # If table doesn't exist (404), return empty array
         if resp.status_code == 404:
             return []
         resp.raise_for_status()
-        inspections_list = resp.json() or []
+        inspections_list = sb_json(resp) or []
         
         # Then get all tasks for these inspections
         inspection_ids = [insp.get("id") for insp in inspections_list if insp.get("id")]
@@ -1366,22 +1518,19 @@ def inspections():
             try:
                 # Format: in.(id1,id2,id3) - no spaces after commas
                 inspection_ids_str = ','.join(inspection_ids)
-                tasks_resp = requests.get(
-                    f"{REST_URL}/inspection_tasks",
-                    headers=SERVICE_HEADERS,
+                tasks_resp = SESSION.get(
+                    INSPECTION_TASKS_URL,
                     params={"inspection_id": f"in.({inspection_ids_str})", "select": "*"}
                 )
-                print(f"Loading tasks for inspections: {inspection_ids_str}")
-                print(f"Tasks query status: {tasks_resp.status_code}")
                 # If table doesn't exist (404), that's OK - return empty tasks
                 if tasks_resp.status_code == 404:
                     all_tasks = []
                 else:
                     tasks_resp.raise_for_status()
-                    all_tasks = tasks_resp.json() or []
+                    all_tasks = sb_json(tasks_resp) or []
             except requests.exceptions.HTTPError as e:
                 # If table doesn't exist, return empty tasks
-                if e.response and e.response.status_code == 404:
+                if e.response is not None and e.response.status_code == 404:
                     all_tasks = []
                 else:
                     raise
@@ -1390,35 +1539,23 @@ def inspections():
                 all_tasks = []
             
             # Group tasks by inspection_id
-            print(f"Loaded {len(all_tasks)} tasks from database")
-            print(f"Tasks for inspections: {inspection_ids}")
             for task in all_tasks:
                 insp_id = task.get("inspection_id")
                 if insp_id:
-                    if insp_id not in tasks_by_inspection:
-                        tasks_by_inspection[insp_id] = []
                     # Ensure completed is a boolean (not string "true"/"false")
-                    completed = task.get("completed", False)
-                    if isinstance(completed, str):
-                        completed = completed.lower() in ('true', '1', 'yes', 'on')
-                    elif completed is None:
-                        completed = False
-                    else:
-                        completed = bool(completed)
-                    
-                    task_data = {
-                        "id": task.get("id"),
-                        "name": task.get("name"),
-                        "completed": completed,
-                    }
-                    print(f"Task {task_data['id']} for inspection {insp_id} ({task_data['name']}): completed={completed}")
-                    tasks_by_inspection[insp_id].append(task_data)
+                    completed = task.get("completed")
+                    completed = completed.lower() in _TRUE if isinstance(completed, str) else bool(completed)
+                    tasks_by_inspection.setdefault(insp_id, []).append(
+                        {"id": task.get("id"), "name": task.get("name"), "completed": completed}
+                    )
             
-            # Log summary per inspection
-            for insp_id in inspection_ids:
-                task_count = len(tasks_by_inspection.get(insp_id, []))
-                completed_count = sum(1 for t in tasks_by_inspection.get(insp_id, []) if t.get("completed", False))
-                print(f"Inspection {insp_id}: {completed_count}/{task_count} tasks completed")
+            # Per-inspection summary only when debug logging is on
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"Loaded {len(all_tasks)} tasks for {len(inspection_ids)} inspections")
+                for insp_id in inspection_ids:
+                    insp_tasks = tasks_by_inspection.get(insp_id, [])
+                    completed_count = sum(1 for t in insp_tasks if t["completed"])
+                    log.debug(f"Inspection {insp_id}: {completed_count}/{len(insp_tasks)} tasks completed")
         
         # Combine inspections with their tasks
         result = []
@@ -1432,11 +1569,6 @@ def inspections():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching inspections: {str(e)}")
 
-@app.get("/api/inspections")
-def api_inspections():
-    """Alias for /inspections to match frontend expectations"""
-    return inspections()
-
 @app.post("/api/inspections/sync")
 def sync_all_inspections():
     """Sync all inspections with orders - ensure every departure date has an inspection"""
@@ -1466,9 +1598,8 @@ def create_inspection(payload: dict):
         # Check if inspection exists
         existing = []
         try:
-            check_resp = requests.get(
-                f"{REST_URL}/inspections",
-                headers=SERVICE_HEADERS,
+            check_resp = SESSION.get(
+                INSPECTIONS_URL,
                 params={"id": f"eq.{inspection_id}", "select": "id"}
             )
             # If table doesn't exist (404), that's OK - we'll create it
@@ -1476,10 +1607,10 @@ def create_inspection(payload: dict):
                 existing = []
             else:
                 check_resp.raise_for_status()
-                existing = check_resp.json() or []
+                existing = sb_json(check_resp) or []
         except requests.exceptions.HTTPError as e:
             # If table doesn't exist, that's OK
-            if e.response and e.response.status_code == 404:
+            if e.response is not None and e.response.status_code == 404:
                 existing = []
             else:
                 raise
@@ -1490,9 +1621,8 @@ def create_inspection(payload: dict):
         if existing and len(existing) > 0:
             # Update existing inspection
             try:
-                update_resp = requests.patch(
-                    f"{REST_URL}/inspections?id=eq.{inspection_id}",
-                    headers={**SERVICE_HEADERS, "Prefer": "return=representation"},
+                update_resp = SESSION.patch(
+                    f"{INSPECTIONS_URL}?id=eq.{inspection_id}",
                     json=inspection_data
                 )
                 # If table doesn't exist (404), that's OK - will be created by migration
@@ -1500,16 +1630,15 @@ def create_inspection(payload: dict):
                     update_resp.raise_for_status()
             except requests.exceptions.HTTPError as e:
                 # If table doesn't exist, that's OK
-                if e.response and e.response.status_code == 404:
+                if e.response is not None and e.response.status_code == 404:
                     pass
                 else:
                     raise
         else:
             # Create new inspection
             try:
-                create_resp = requests.post(
-                    f"{REST_URL}/inspections",
-                    headers=SERVICE_HEADERS,
+                create_resp = SESSION.post(
+                    INSPECTIONS_URL,
                     json=inspection_data
                 )
                 # If table doesn't exist (404), that's OK - will be created by migration
@@ -1518,10 +1647,10 @@ def create_inspection(payload: dict):
                     create_resp.raise_for_status()
             except requests.exceptions.HTTPError as e:
                 # If table doesn't exist (404), that's OK
-                if e.response and e.response.status_code == 404:
+                if e.response is not None and e.response.status_code == 404:
                     pass
                 # If conflict (409), inspection might already exist - that's OK
-                elif e.response and e.response.status_code == 409:
+                elif e.response is not None and e.response.status_code == 409:
                     pass
                 else:
                     raise
@@ -1537,13 +1666,12 @@ def create_inspection(payload: dict):
             # First, get existing tasks for this inspection to see what needs updating vs inserting
             existing_task_ids = set()
             try:
-                existing_resp = requests.get(
-                    f"{REST_URL}/inspection_tasks",
-                    headers=SERVICE_HEADERS,
+                existing_resp = SESSION.get(
+                    INSPECTION_TASKS_URL,
                     params={"inspection_id": f"eq.{inspection_id}", "select": "id,name"}
                 )
                 if existing_resp.status_code == 200:
-                    existing_tasks = existing_resp.json() or []
+                    existing_tasks = sb_json(existing_resp) or []
                     existing_task_ids = {t.get("id") for t in existing_tasks if t.get("id")}
                     print(f"Found {len(existing_task_ids)} existing tasks for inspection {inspection_id}: {existing_task_ids}")
                 else:
@@ -1556,13 +1684,8 @@ def create_inspection(payload: dict):
             for task in tasks:
                 try:
                     # Ensure completed is a boolean
-                    completed = task.get("completed", False)
-                    if isinstance(completed, str):
-                        completed = completed.lower() in ('true', '1', 'yes', 'on')
-                    elif completed is None:
-                        completed = False
-                    else:
-                        completed = bool(completed)
+                    completed = task.get("completed")
+                    completed = completed.lower() in _TRUE if isinstance(completed, str) else bool(completed)
                     
                     task_data = {
                         "id": task.get("id") or str(uuid.uuid4()),
@@ -1580,9 +1703,8 @@ def create_inspection(payload: dict):
                     if task_exists_for_this_inspection:
                         # Task exists for this inspection, update it
                         print(f"  → Updating existing task {task_id} for inspection {inspection_id}")
-                        update_resp = requests.patch(
-                            f"{REST_URL}/inspection_tasks?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
-                            headers={**SERVICE_HEADERS, "Prefer": "return=representation"},
+                        update_resp = SESSION.patch(
+                            f"{INSPECTION_TASKS_URL}?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
                             json={"completed": task_data["completed"], "name": task_data["name"]}
                         )
                         if update_resp.status_code in [200, 201, 204]:
@@ -1591,9 +1713,8 @@ def create_inspection(payload: dict):
                         else:
                             # Update failed, try insert (maybe task was deleted?)
                             print(f"  ⚠ Update failed (status {update_resp.status_code}), trying insert...")
-                            task_resp = requests.post(
-                                f"{REST_URL}/inspection_tasks",
-                                headers=SERVICE_HEADERS,
+                            task_resp = SESSION.post(
+                                INSPECTION_TASKS_URL,
                                 json=task_data
                             )
                             if task_resp.status_code in [200, 201]:
@@ -1611,9 +1732,8 @@ def create_inspection(payload: dict):
                     else:
                         # Task doesn't exist for this inspection, insert it
                         print(f"  → Inserting new task {task_id} for inspection {inspection_id}")
-                        task_resp = requests.post(
-                            f"{REST_URL}/inspection_tasks",
-                            headers=SERVICE_HEADERS,
+                        task_resp = SESSION.post(
+                            INSPECTION_TASKS_URL,
                             json=task_data
                         )
                         if task_resp.status_code in [200, 201]:
@@ -1629,9 +1749,8 @@ def create_inspection(payload: dict):
                             # Try to update it for this inspection_id
                             print(f"  ⚠ Conflict (409) - task {task_id} may exist for another inspection, trying update...")
                             try:
-                                update_resp = requests.patch(
-                                    f"{REST_URL}/inspection_tasks?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
-                                    headers={**SERVICE_HEADERS, "Prefer": "return=representation"},
+                                update_resp = SESSION.patch(
+                                    f"{INSPECTION_TASKS_URL}?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
                                     json={"completed": task_data["completed"], "name": task_data["name"]}
                                 )
                                 if update_resp.status_code in [200, 201, 204]:
@@ -1651,7 +1770,7 @@ def create_inspection(payload: dict):
                             failed_tasks.append(task_data)
                 except requests.exceptions.HTTPError as e:
                     # If table doesn't exist (404), that's OK
-                    if e.response and e.response.status_code == 404:
+                    if e.response is not None and e.response.status_code == 404:
                         saved_tasks.append({
                             "id": task.get("id") or str(uuid.uuid4()),
                             "inspection_id": inspection_id,
@@ -1659,8 +1778,8 @@ def create_inspection(payload: dict):
                             "completed": bool(task.get("completed", False)),
                         })
                     else:
-                        error_text = e.response.text[:200] if e.response and e.response.text else str(e)
-                        print(f"Warning: Failed to save task: {error_text}")
+                        error_text = _supabase_error_detail(e)
+                        log.warning(f"Failed to save task: {error_text}")
                         failed_tasks.append({
                             "id": task.get("id") or str(uuid.uuid4()),
                             "inspection_id": inspection_id,
@@ -1669,7 +1788,7 @@ def create_inspection(payload: dict):
                         })
                 except Exception as e:
                     # Any other error - continue with other tasks
-                    print(f"Warning: Exception saving task: {str(e)}")
+                    log.warning(f"Exception saving task: {str(e)}")
                     failed_tasks.append({
                         "id": task.get("id") or str(uuid.uuid4()),
                         "inspection_id": inspection_id,
@@ -1692,9 +1811,8 @@ def create_inspection(payload: dict):
                             for task_id_to_delete in tasks_to_delete:
                                 try:
                                     # CRITICAL: Filter by BOTH id AND inspection_id to ensure we only delete tasks for this inspection
-                                    delete_resp = requests.delete(
-                                        f"{REST_URL}/inspection_tasks?id=eq.{task_id_to_delete}&inspection_id=eq.{inspection_id}",
-                                        headers=SERVICE_HEADERS
+                                    delete_resp = SESSION.delete(
+                                        f"{INSPECTION_TASKS_URL}?id=eq.{task_id_to_delete}&inspection_id=eq.{inspection_id}",
                                     )
                                     if delete_resp.status_code in [200, 204]:
                                         print(f"  ✓ Deleted orphaned task {task_id_to_delete} for inspection {inspection_id}")
@@ -1749,7 +1867,7 @@ def create_inspection(payload: dict):
             print(f"Sample task from result: id={return_tasks[0].get('id')}, completed={return_tasks[0].get('completed')}")
         return result
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating/updating inspection: {str(e)}")
@@ -1770,19 +1888,18 @@ def update_inspection_task(inspection_id: str, task_id: str, payload: dict):
         # First, try to find the task by id and inspection_id
         existing_task = None
         try:
-            check_resp = requests.get(
-                f"{REST_URL}/inspection_tasks",
-                headers=SERVICE_HEADERS,
+            check_resp = SESSION.get(
+                INSPECTION_TASKS_URL,
                 params={"id": f"eq.{task_id}", "inspection_id": f"eq.{inspection_id}", "select": "*"}
             )
             # If table doesn't exist (404), that's OK - we'll create the task
             if check_resp.status_code == 200:
-                existing_tasks = check_resp.json() or []
+                existing_tasks = sb_json(check_resp) or []
                 if existing_tasks and len(existing_tasks) > 0:
                     existing_task = existing_tasks[0]
         except requests.exceptions.HTTPError as e:
             # If table doesn't exist (404), that's OK
-            if e.response and e.response.status_code == 404:
+            if e.response is not None and e.response.status_code == 404:
                 existing_task = None
             else:
                 # For other errors, assume task doesn't exist and try to create it
@@ -1796,15 +1913,14 @@ def update_inspection_task(inspection_id: str, task_id: str, payload: dict):
         if existing_task:
             # Task exists, try to update it
             try:
-                update_resp = requests.patch(
-                    f"{REST_URL}/inspection_tasks?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
-                    headers={**SERVICE_HEADERS, "Prefer": "return=representation"},
+                update_resp = SESSION.patch(
+                    f"{INSPECTION_TASKS_URL}?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
                     json=task_data
                 )
                 # If update succeeds, return the updated task
                 if update_resp.status_code in [200, 201, 204]:
                     try:
-                        result = update_resp.json()
+                        result = sb_json(update_resp)
                         updated_task = result[0] if isinstance(result, list) and result else result
                         return {
                             "id": updated_task.get("id"),
@@ -1831,9 +1947,8 @@ def update_inspection_task(inspection_id: str, task_id: str, payload: dict):
         }
         
         try:
-            create_resp = requests.post(
-                f"{REST_URL}/inspection_tasks",
-                headers=SERVICE_HEADERS,
+            create_resp = SESSION.post(
+                INSPECTION_TASKS_URL,
                 json=create_data
             )
             # If table doesn't exist (404), return success anyway (table will be created by migration)
@@ -1842,7 +1957,7 @@ def update_inspection_task(inspection_id: str, task_id: str, payload: dict):
             # If creation succeeds
             if create_resp.status_code in [200, 201]:
                 try:
-                    result = create_resp.json()
+                    result = sb_json(create_resp)
                     created_task = result[0] if isinstance(result, list) and result else result
                     return {
                         "id": created_task.get("id") if isinstance(created_task, dict) else task_id,
@@ -1853,7 +1968,7 @@ def update_inspection_task(inspection_id: str, task_id: str, payload: dict):
                     return create_data
         except requests.exceptions.HTTPError as e:
             # If table doesn't exist (404), return success anyway
-            if e.response and e.response.status_code == 404:
+            if e.response is not None and e.response.status_code == 404:
                 return create_data
             # For other errors, still return success to prevent UI blocking
             return create_data
@@ -1862,13 +1977,13 @@ def update_inspection_task(inspection_id: str, task_id: str, payload: dict):
             return create_data
     except requests.exceptions.HTTPError as e:
         # If table doesn't exist yet, return success (will be created by migration)
-        if e.response and e.response.status_code == 404:
+        if e.response is not None and e.response.status_code == 404:
             return {
                 "id": task_id,
                 "name": payload.get("name", ""),
                 "completed": payload.get("completed", False),
             }
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         # If any error occurs, return success anyway to prevent UI blocking
@@ -1883,13 +1998,13 @@ def update_inspection_task(inspection_id: str, task_id: str, payload: dict):
 # These are completely separate from regular inspections
 
 @app.get("/cleaning-inspections")
+@app.get("/api/cleaning-inspections")
 def cleaning_inspections():
     """Get all cleaning inspections with their tasks"""
     try:
         # Get all cleaning inspections
-        inspections_resp = requests.get(
-            f"{REST_URL}/cleaning_inspections",
-            headers=SERVICE_HEADERS,
+        inspections_resp = SESSION.get(
+            CLEANING_INSPECTIONS_URL,
             params={"select": "*", "order": "departure_date.desc"}
         )
         
@@ -1898,18 +2013,17 @@ def cleaning_inspections():
             return []
         
         inspections_resp.raise_for_status()
-        inspections = inspections_resp.json() or []
+        inspections = sb_json(inspections_resp) or []
         
         # Get all cleaning inspection tasks
-        tasks_resp = requests.get(
-            f"{REST_URL}/cleaning_inspection_tasks",
-            headers=SERVICE_HEADERS,
+        tasks_resp = SESSION.get(
+            CLEANING_INSPECTION_TASKS_URL,
             params={"select": "*"}
         )
         
         tasks = []
         if tasks_resp.status_code == 200:
-            tasks = tasks_resp.json() or []
+            tasks = sb_json(tasks_resp) or []
         elif tasks_resp.status_code == 404:
             # Table doesn't exist yet, that's OK
             tasks = []
@@ -1935,11 +2049,6 @@ def cleaning_inspections():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching cleaning inspections: {str(e)}")
 
-@app.get("/api/cleaning-inspections")
-def api_cleaning_inspections():
-    """Alias for /cleaning-inspections to match frontend expectations"""
-    return cleaning_inspections()
-
 @app.post("/api/cleaning-inspections/sync")
 def sync_all_cleaning_inspections():
     """Sync all cleaning inspections with orders - ensure every departure date has a cleaning inspection"""
@@ -1969,9 +2078,8 @@ def create_cleaning_inspection(payload: dict):
         # Check if cleaning inspection exists
         existing = []
         try:
-            check_resp = requests.get(
-                f"{REST_URL}/cleaning_inspections",
-                headers=SERVICE_HEADERS,
+            check_resp = SESSION.get(
+                CLEANING_INSPECTIONS_URL,
                 params={"id": f"eq.{inspection_id}", "select": "id"}
             )
             # If table doesn't exist (404), that's OK - we'll create it
@@ -1979,10 +2087,10 @@ def create_cleaning_inspection(payload: dict):
                 existing = []
             else:
                 check_resp.raise_for_status()
-                existing = check_resp.json() or []
+                existing = sb_json(check_resp) or []
         except requests.exceptions.HTTPError as e:
             # If table doesn't exist, that's OK
-            if e.response and e.response.status_code == 404:
+            if e.response is not None and e.response.status_code == 404:
                 existing = []
             else:
                 raise
@@ -1993,9 +2101,8 @@ def create_cleaning_inspection(payload: dict):
         if existing and len(existing) > 0:
             # Update existing cleaning inspection
             try:
-                update_resp = requests.patch(
-                    f"{REST_URL}/cleaning_inspections?id=eq.{inspection_id}",
-                    headers={**SERVICE_HEADERS, "Prefer": "return=representation"},
+                update_resp = SESSION.patch(
+                    f"{CLEANING_INSPECTIONS_URL}?id=eq.{inspection_id}",
                     json=inspection_data
                 )
                 # If table doesn't exist (404), that's OK - will be created by migration
@@ -2003,16 +2110,15 @@ def create_cleaning_inspection(payload: dict):
                     update_resp.raise_for_status()
             except requests.exceptions.HTTPError as e:
                 # If table doesn't exist, that's OK
-                if e.response and e.response.status_code == 404:
+                if e.response is not None and e.response.status_code == 404:
                     pass
                 else:
                     raise
         else:
             # Create new cleaning inspection
             try:
-                create_resp = requests.post(
-                    f"{REST_URL}/cleaning_inspections",
-                    headers=SERVICE_HEADERS,
+                create_resp = SESSION.post(
+                    CLEANING_INSPECTIONS_URL,
                     json=inspection_data
                 )
                 # If table doesn't exist (404), that's OK - will be created by migration
@@ -2021,10 +2127,10 @@ def create_cleaning_inspection(payload: dict):
                     create_resp.raise_for_status()
             except requests.exceptions.HTTPError as e:
                 # If table doesn't exist (404), that's OK
-                if e.response and e.response.status_code == 404:
+                if e.response is not None and e.response.status_code == 404:
                     pass
                 # If conflict (409), inspection might already exist - that's OK
-                elif e.response and e.response.status_code == 409:
+                elif e.response is not None and e.response.status_code == 409:
                     pass
                 else:
                     raise
@@ -2039,13 +2145,12 @@ def create_cleaning_inspection(payload: dict):
             # First, get existing tasks for this cleaning inspection
             existing_task_ids = set()
             try:
-                existing_resp = requests.get(
-                    f"{REST_URL}/cleaning_inspection_tasks",
-                    headers=SERVICE_HEADERS,
+                existing_resp = SESSION.get(
+                    CLEANING_INSPECTION_TASKS_URL,
                     params={"inspection_id": f"eq.{inspection_id}", "select": "id,name"}
                 )
                 if existing_resp.status_code == 200:
-                    existing_tasks = existing_resp.json() or []
+                    existing_tasks = sb_json(existing_resp) or []
                     existing_task_ids = {t.get("id") for t in existing_tasks if t.get("id")}
                     print(f"Found {len(existing_task_ids)} existing cleaning tasks for inspection {inspection_id}: {existing_task_ids}")
                 else:
@@ -2057,13 +2162,8 @@ def create_cleaning_inspection(payload: dict):
             for task in tasks:
                 try:
                     # Ensure completed is a boolean
-                    completed = task.get("completed", False)
-                    if isinstance(completed, str):
-                        completed = completed.lower() in ('true', '1', 'yes', 'on')
-                    elif completed is None:
-                        completed = False
-                    else:
-                        completed = bool(completed)
+                    completed = task.get("completed")
+                    completed = completed.lower() in _TRUE if isinstance(completed, str) else bool(completed)
                     
                     task_data = {
                         "id": task.get("id") or str(uuid.uuid4()),
@@ -2080,9 +2180,8 @@ def create_cleaning_inspection(payload: dict):
                     if task_exists_for_this_inspection:
                         # Task exists for this inspection, update it
                         print(f"  → Updating existing cleaning task {task_id} for inspection {inspection_id}")
-                        update_resp = requests.patch(
-                            f"{REST_URL}/cleaning_inspection_tasks?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
-                            headers={**SERVICE_HEADERS, "Prefer": "return=representation"},
+                        update_resp = SESSION.patch(
+                            f"{CLEANING_INSPECTION_TASKS_URL}?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
                             json={"completed": task_data["completed"], "name": task_data["name"]}
                         )
                         if update_resp.status_code in [200, 201, 204]:
@@ -2091,9 +2190,8 @@ def create_cleaning_inspection(payload: dict):
                         else:
                             # Update failed, try insert
                             print(f"  ⚠ Update failed (status {update_resp.status_code}), trying insert...")
-                            task_resp = requests.post(
-                                f"{REST_URL}/cleaning_inspection_tasks",
-                                headers=SERVICE_HEADERS,
+                            task_resp = SESSION.post(
+                                CLEANING_INSPECTION_TASKS_URL,
                                 json=task_data
                             )
                             if task_resp.status_code in [200, 201]:
@@ -2110,9 +2208,8 @@ def create_cleaning_inspection(payload: dict):
                     else:
                         # Task doesn't exist for this inspection, insert it
                         print(f"  → Inserting new cleaning task {task_id} for inspection {inspection_id}")
-                        task_resp = requests.post(
-                            f"{REST_URL}/cleaning_inspection_tasks",
-                            headers=SERVICE_HEADERS,
+                        task_resp = SESSION.post(
+                            CLEANING_INSPECTION_TASKS_URL,
                             json=task_data
                         )
                         if task_resp.status_code in [200, 201]:
@@ -2126,9 +2223,8 @@ def create_cleaning_inspection(payload: dict):
                             # Conflict - try to update it for this inspection_id
                             print(f"  ⚠ Conflict (409) - cleaning task {task_id} may exist for another inspection, trying update...")
                             try:
-                                update_resp = requests.patch(
-                                    f"{REST_URL}/cleaning_inspection_tasks?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
-                                    headers={**SERVICE_HEADERS, "Prefer": "return=representation"},
+                                update_resp = SESSION.patch(
+                                    f"{CLEANING_INSPECTION_TASKS_URL}?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
                                     json={"completed": task_data["completed"], "name": task_data["name"]}
                                 )
                                 if update_resp.status_code in [200, 201, 204]:
@@ -2146,7 +2242,7 @@ def create_cleaning_inspection(payload: dict):
                             print(f"  ✗ ERROR: Failed to insert cleaning task {task_id}: {task_resp.status_code} {error_text}")
                             failed_tasks.append(task_data)
                 except requests.exceptions.HTTPError as e:
-                    if e.response and e.response.status_code == 404:
+                    if e.response is not None and e.response.status_code == 404:
                         saved_tasks.append({
                             "id": task.get("id") or str(uuid.uuid4()),
                             "inspection_id": inspection_id,
@@ -2154,8 +2250,8 @@ def create_cleaning_inspection(payload: dict):
                             "completed": bool(task.get("completed", False)),
                         })
                     else:
-                        error_text = e.response.text[:200] if e.response and e.response.text else str(e)
-                        print(f"Warning: Failed to save cleaning task: {error_text}")
+                        error_text = _supabase_error_detail(e)
+                        log.warning(f"Failed to save cleaning task: {error_text}")
                         failed_tasks.append({
                             "id": task.get("id") or str(uuid.uuid4()),
                             "inspection_id": inspection_id,
@@ -2163,7 +2259,7 @@ def create_cleaning_inspection(payload: dict):
                             "completed": bool(task.get("completed", False)),
                         })
                 except Exception as e:
-                    print(f"Warning: Exception saving cleaning task: {str(e)}")
+                    log.warning(f"Exception saving cleaning task: {str(e)}")
                     failed_tasks.append({
                         "id": task.get("id") or str(uuid.uuid4()),
                         "inspection_id": inspection_id,
@@ -2181,9 +2277,8 @@ def create_cleaning_inspection(payload: dict):
                             print(f"Cleaning up {len(tasks_to_delete)} orphaned cleaning tasks for inspection {inspection_id}: {tasks_to_delete}")
                             for task_id_to_delete in tasks_to_delete:
                                 try:
-                                    delete_resp = requests.delete(
-                                        f"{REST_URL}/cleaning_inspection_tasks?id=eq.{task_id_to_delete}&inspection_id=eq.{inspection_id}",
-                                        headers=SERVICE_HEADERS
+                                    delete_resp = SESSION.delete(
+                                        f"{CLEANING_INSPECTION_TASKS_URL}?id=eq.{task_id_to_delete}&inspection_id=eq.{inspection_id}",
                                     )
                                     if delete_resp.status_code in [200, 204]:
                                         print(f"  ✓ Deleted orphaned cleaning task {task_id_to_delete} for inspection {inspection_id}")
@@ -2225,7 +2320,7 @@ def create_cleaning_inspection(payload: dict):
         print(f"Returning cleaning inspection result: {len(return_tasks)} tasks ({len(saved_tasks)} saved, {len(failed_tasks)} failed), {completed_count} completed")
         return result
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating/updating cleaning inspection: {str(e)}")
@@ -2246,31 +2341,29 @@ def update_cleaning_inspection_task(inspection_id: str, task_id: str, payload: d
         # First, try to find the task by id and inspection_id
         existing_task = None
         try:
-            check_resp = requests.get(
-                f"{REST_URL}/cleaning_inspection_tasks",
-                headers=SERVICE_HEADERS,
+            check_resp = SESSION.get(
+                CLEANING_INSPECTION_TASKS_URL,
                 params={"id": f"eq.{task_id}", "inspection_id": f"eq.{inspection_id}", "select": "*"}
             )
             if check_resp.status_code == 200:
-                existing_tasks = check_resp.json() or []
+                existing_tasks = sb_json(check_resp) or []
                 if existing_tasks and len(existing_tasks) > 0:
                     existing_task = existing_tasks[0]
         except requests.exceptions.HTTPError as e:
-            if e.response and e.response.status_code == 404:
+            if e.response is not None and e.response.status_code == 404:
                 existing_task = None
             else:
                 existing_task = None
         
         if existing_task:
             # Update existing task
-            update_resp = requests.patch(
-                f"{REST_URL}/cleaning_inspection_tasks?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
-                headers={**SERVICE_HEADERS, "Prefer": "return=representation"},
+            update_resp = SESSION.patch(
+                f"{CLEANING_INSPECTION_TASKS_URL}?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
                 json=task_data
             )
             if update_resp.status_code in [200, 201, 204]:
                 try:
-                    result = update_resp.json()
+                    result = sb_json(update_resp)
                     updated_task = result[0] if isinstance(result, list) and result else result
                     return {
                         "id": updated_task.get("id") if isinstance(updated_task, dict) else task_id,
@@ -2294,16 +2387,15 @@ def update_cleaning_inspection_task(inspection_id: str, task_id: str, payload: d
         }
         
         try:
-            create_resp = requests.post(
-                f"{REST_URL}/cleaning_inspection_tasks",
-                headers=SERVICE_HEADERS,
+            create_resp = SESSION.post(
+                CLEANING_INSPECTION_TASKS_URL,
                 json=create_data
             )
             if create_resp.status_code == 404:
                 return create_data
             if create_resp.status_code in [200, 201]:
                 try:
-                    result = create_resp.json()
+                    result = sb_json(create_resp)
                     created_task = result[0] if isinstance(result, list) and result else result
                     return {
                         "id": created_task.get("id") if isinstance(created_task, dict) else task_id,
@@ -2313,19 +2405,19 @@ def update_cleaning_inspection_task(inspection_id: str, task_id: str, payload: d
                 except:
                     return create_data
         except requests.exceptions.HTTPError as e:
-            if e.response and e.response.status_code == 404:
+            if e.response is not None and e.response.status_code == 404:
                 return create_data
             return create_data
         except Exception:
             return create_data
     except requests.exceptions.HTTPError as e:
-        if e.response and e.response.status_code == 404:
+        if e.response is not None and e.response.status_code == 404:
             return {
                 "id": task_id,
                 "name": payload.get("name", ""),
                 "completed": payload.get("completed", False),
             }
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         return {
@@ -2335,54 +2427,63 @@ def update_cleaning_inspection_task(inspection_id: str, task_id: str, payload: d
         }
 
 @app.get("/inventory/items")
+@app.get("/api/inventory/items")
 def inventory_items():
+    body = cached("inventory_items", 15, _fetch_inventory_items)
+    return Response(content=body, media_type="application/json")
+
+def _fetch_inventory_items():
     try:
-        resp = requests.get(f"{REST_URL}/inventory_items", headers=SERVICE_HEADERS, params={"select": "*"})
-        resp.raise_for_status()
-        return resp.json()
+        return _get_bytes("inventory_items", {"select": "*"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching inventory items: {str(e)}")
 
-@app.get("/api/inventory/items")
-def api_inventory_items():
-    """Alias for /inventory/items to match frontend expectations"""
-    return inventory_items()
-
 @app.post("/inventory/items")
 def create_inventory_item(payload: dict):
     data = payload
-    if not data.get("id"):
-        data["id"] = str(uuid.uuid4())
     try:
-        resp = requests.post(f"{REST_URL}/inventory_items", headers=SERVICE_HEADERS, json=data)
+        resp = SESSION.post(f"{REST_URL}/inventory_items", json=data)
         resp.raise_for_status()
-        if resp.text:
-            body = resp.json()
+        invalidate_cache("inventory_items")
+        if resp.content:
+            body = sb_json(resp)
             return body[0] if isinstance(body, list) and body else body
         return data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating inventory item: {str(e)}")
 
+class InventoryItemUpdate(BaseModel):
+    # Unknown fields are rejected here instead of failing as a Supabase 400
+    model_config = ConfigDict(extra="forbid")
+
+    name: Optional[str] = None
+    category: Optional[str] = None
+    unit: Optional[str] = None
+    current_stock: Optional[int] = None
+    min_stock: Optional[int] = None
+    # Clients may echo these back with the rest of the row; they are never updated
+    id: Optional[str] = Field(None, exclude=True)
+    created_at: Optional[str] = Field(None, exclude=True)
+
+
 @app.patch("/inventory/items/{item_id}")
-def update_inventory_item(item_id: str, payload: dict):
-    data = {k: v for k, v in payload.items() if v is not None}
+def update_inventory_item(item_id: str, payload: InventoryItemUpdate):
+    data = payload.model_dump(exclude_none=True, exclude_unset=True)
     if not data:
         return {"message": "No changes provided"}
     try:
-        # Use Prefer header to return updated row
-        headers = {**SERVICE_HEADERS, "Prefer": "return=representation"}
-        resp = requests.patch(
+        resp = SESSION.patch(
             f"{REST_URL}/inventory_items?id=eq.{item_id}",
-            headers=headers,
             json=data
         )
         resp.raise_for_status()
-        if resp.text:
-            result = resp.json()
+        invalidate_cache("inventory_items")
+        if resp.content:
+            result = sb_json(resp)
             return result[0] if isinstance(result, list) and result else result
         return {"id": item_id, "message": "Updated successfully"}
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating inventory item: {str(e)}")
@@ -2390,38 +2491,38 @@ def update_inventory_item(item_id: str, payload: dict):
 @app.delete("/inventory/items/{item_id}")
 def delete_inventory_item(item_id: str):
     try:
-        resp = requests.delete(
+        resp = SESSION.delete(
             f"{REST_URL}/inventory_items?id=eq.{item_id}",
-            headers=SERVICE_HEADERS
         )
         resp.raise_for_status()
-        return JSONResponse(content=[], status_code=200)
+        invalidate_cache("inventory_items")
+        return []
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting inventory item: {str(e)}")
 
 @app.get("/inventory/orders")
+@app.get("/api/inventory/orders")
 def inventory_orders():
     try:
-        # Get orders with their items using a join query
-        # First get all orders
-        orders_resp = requests.get(
+        # Fetch orders and all order items in parallel, then join them here
+        items_future = EXECUTOR.submit(
+            SESSION.get,
+            f"{REST_URL}/inventory_order_items",
+            params={"select": "*"}
+        )
+        orders_resp = SESSION.get(
             f"{REST_URL}/inventory_orders", 
-            headers=SERVICE_HEADERS, 
             params={"select": "*", "order": "order_date.desc"}
         )
         orders_resp.raise_for_status()
-        orders = orders_resp.json()
+        orders = sb_json(orders_resp)
         
         # Get all order items (if table exists)
         items_by_order = {}
         try:
-            items_resp = requests.get(
-                f"{REST_URL}/inventory_order_items",
-                headers=SERVICE_HEADERS,
-                params={"select": "*"}
-            )
+            items_resp = items_future.result()
             items_resp.raise_for_status()
-            all_items = items_resp.json()
+            all_items = sb_json(items_resp)
             
             # Group items by order_id
             for item in all_items:
@@ -2464,32 +2565,20 @@ def inventory_orders():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching inventory orders: {str(e)}")
 
-@app.get("/api/inventory/orders")
-def api_inventory_orders():
-    """Alias for /inventory/orders to match frontend expectations"""
-    return inventory_orders()
-
 @app.post("/inventory/orders")
 def create_inventory_order(payload: dict):
     data = payload.copy()
-    # Always generate a new UUID to avoid conflicts - ignore any existing ID
-    data["id"] = str(uuid.uuid4())
+    # Always let Postgres generate the ID to avoid conflicts - ignore any existing ID
+    data.pop("id", None)
     try:
-        resp = requests.post(f"{REST_URL}/inventory_orders", headers=SERVICE_HEADERS, json=data)
+        resp = SESSION.post(f"{REST_URL}/inventory_orders", json=data)
         resp.raise_for_status()
-        if resp.text:
-            body = resp.json()
+        if resp.content:
+            body = sb_json(resp)
             return body[0] if isinstance(body, list) and body else body
         return data
     except requests.exceptions.HTTPError as e:
-        # Get full error response for debugging
-        error_text = ""
-        if e.response:
-            try:
-                error_text = e.response.text
-            except:
-                error_text = str(e.response)
-        error_detail = f"HTTP {e.response.status_code}: {error_text[:500]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e, 500)
         # Log the data being sent for debugging
         print(f"Error creating inventory order. Data sent: {data}")
         print(f"Full error: {error_detail}")
@@ -2497,91 +2586,91 @@ def create_inventory_order(payload: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating inventory order: {str(e)}")
 
+class InventoryOrderItemCreate(BaseModel):
+    # Accepts both snake_case and the frontend's camelCase field names
+    model_config = ConfigDict(populate_by_name=True)
+
+    item_id: Optional[str] = Field(None, alias="itemId")
+    item_name: str = Field("", alias="itemName")
+    quantity: int = 0
+    unit: str = ""
+
+    @field_validator("item_id", mode="before")
+    @classmethod
+    def _blank_item_id(cls, value):
+        return value or None
+
+
+class InventoryOrderCreate(BaseModel):
+    # Accepts both snake_case and the frontend's camelCase field names
+    model_config = ConfigDict(populate_by_name=True)
+
+    order_date: str = Field("", alias="orderDate")
+    status: str = "מחכה להשלמת תשלום"
+    order_type: str = Field("הזמנה כללית", alias="orderType")
+    delivery_date: Optional[str] = Field(None, alias="deliveryDate")
+    ordered_by: Optional[str] = Field(None, alias="orderedBy")
+    unit_number: Optional[str] = Field(None, alias="unitNumber")
+    items: List[InventoryOrderItemCreate] = []
+    # Legacy single-item requests send the item fields at the top level
+    item_id: Optional[str] = Field(None, alias="itemId")
+    item_name: Optional[str] = Field(None, alias="itemName")
+    quantity: int = 0
+    unit: str = ""
+
+    @field_validator("delivery_date", "ordered_by", "unit_number", mode="before")
+    @classmethod
+    def _blank_optional(cls, value):
+        # Optional fields are only stored when provided
+        return value or None
+
+
 @app.post("/api/inventory/orders")
-def api_create_inventory_order(payload: dict):
+def api_create_inventory_order(payload: InventoryOrderCreate):
     """Create inventory order with items (two-table structure)"""
-    # Generate UUID for order
-    order_id = str(uuid.uuid4())
-    
-    # Get items from payload (new structure)
-    items = payload.get("items", [])
+    items = payload.items
     
     # Fallback: if no items array, create from legacy fields (backward compatibility)
-    if not items and (payload.get("itemName") or payload.get("item_name")):
-        items = [{
-            "itemId": payload.get("itemId") or payload.get("item_id"),
-            "itemName": payload.get("itemName") or payload.get("item_name", ""),
-            "quantity": payload.get("quantity", 0),
-            "unit": payload.get("unit", ""),
-        }]
+    if not items and payload.item_name:
+        items = [InventoryOrderItemCreate(
+            item_id=payload.item_id,
+            item_name=payload.item_name,
+            quantity=payload.quantity,
+            unit=payload.unit,
+        )]
     
     if not items:
         raise HTTPException(status_code=400, detail="Order must have at least one item")
     
-    # Get first item for backward compatibility with old table structure
-    first_item = items[0] if items else None
-    
-    # Create order data
+    # Backward compatibility: the current inventory_orders schema requires the first item's fields
     order_data = {
-        "id": order_id,
-        "order_date": payload.get("orderDate") or payload.get("order_date", ""),
-        "status": payload.get("status", "מחכה להשלמת תשלום"),
-        "order_type": payload.get("orderType") or payload.get("order_type", "הזמנה כללית"),
+        **payload.model_dump(exclude_none=True, exclude={"items", "item_id", "item_name", "quantity", "unit"}),
+        **items[0].model_dump(),
     }
     
-    # Backward compatibility: include item fields for old table structure
-    # These are required by the current database schema
-    if first_item:
-        order_data["item_id"] = first_item.get("itemId") or first_item.get("item_id") or None
-        order_data["item_name"] = first_item.get("itemName") or first_item.get("item_name", "")
-        order_data["quantity"] = int(first_item.get("quantity", 0))
-        order_data["unit"] = first_item.get("unit", "")
-    else:
-        # Fallback for legacy single-item requests
-        order_data["item_id"] = payload.get("itemId") or payload.get("item_id") or None
-        order_data["item_name"] = payload.get("itemName") or payload.get("item_name", "")
-        order_data["quantity"] = int(payload.get("quantity", 0))
-        order_data["unit"] = payload.get("unit", "")
-    
-    # Optional fields - only add if provided
-    if payload.get("deliveryDate") or payload.get("delivery_date"):
-        order_data["delivery_date"] = payload.get("deliveryDate") or payload.get("delivery_date")
-    if payload.get("orderedBy") or payload.get("ordered_by"):
-        order_data["ordered_by"] = payload.get("orderedBy") or payload.get("ordered_by")
-    if payload.get("unitNumber") or payload.get("unit_number"):
-        order_data["unit_number"] = payload.get("unitNumber") or payload.get("unit_number")
-    
     try:
         # Step 1: Create the order
-        order_resp = requests.post(
+        order_resp = SESSION.post(
             f"{REST_URL}/inventory_orders", 
-            headers=SERVICE_HEADERS, 
             json=order_data
         )
         order_resp.raise_for_status()
-        created_order = order_resp.json()
+        created_order = sb_json(order_resp)
         if isinstance(created_order, list) and created_order:
             created_order = created_order[0]
+        order_id = created_order.get("id")
         
         # Step 2: Create order items
         created_items = []
         for item in items:
-            item_data = {
-                "id": str(uuid.uuid4()),
-                "order_id": order_id,
-                "item_id": item.get("itemId") or item.get("item_id") or None,
-                "item_name": item.get("itemName") or item.get("item_name", ""),
-                "quantity": int(item.get("quantity", 0)),
-                "unit": item.get("unit", ""),
-            }
+            item_data = {"order_id": order_id, **item.model_dump()}
             
-            item_resp = requests.post(
+            item_resp = SESSION.post(
                 f"{REST_URL}/inventory_order_items",
-                headers=SERVICE_HEADERS,
                 json=item_data
             )
             item_resp.raise_for_status()
-            created_item = item_resp.json()
+            created_item = sb_json(item_resp)
             if isinstance(created_item, list) and created_item:
                 created_item = created_item[0]
             created_items.append({
@@ -2598,13 +2687,7 @@ def api_create_inventory_order(payload: dict):
         return result
         
     except requests.exceptions.HTTPError as e:
-        error_text = ""
-        if e.response:
-            try:
-                error_text = e.response.text
-            except:
-                error_text = str(e.response)
-        error_detail = f"HTTP {e.response.status_code}: {error_text[:500]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e, 500)
         print(f"Error creating inventory order. Order data: {order_data}")
         print(f"Items: {items}")
         print(f"Full error: {error_detail}")
@@ -2613,6 +2696,7 @@ def api_create_inventory_order(payload: dict):
         raise HTTPException(status_code=500, detail=f"Error creating inventory order: {str(e)}")
 
 @app.patch("/inventory/orders/{order_id}")
+@app.patch("/api/inventory/orders/{order_id}")
 def update_inventory_order(order_id: str, payload: dict):
     """Update inventory order (status, delivery_date, etc.)"""
     # Map camelCase to snake_case for order fields
@@ -2641,40 +2725,44 @@ def update_inventory_order(order_id: str, payload: dict):
         return []
     
     try:
-        resp = requests.patch(
+        resp = SESSION.patch(
             f"{REST_URL}/inventory_orders?id=eq.{order_id}",
-            headers=SERVICE_HEADERS,
             json=order_data
         )
         resp.raise_for_status()
-        return resp.json() if resp.text else []
+        return sb_json(resp) if resp.content else []
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating inventory order: {str(e)}")
 
-@app.patch("/api/inventory/orders/{order_id}")
-def api_update_inventory_order(order_id: str, payload: dict):
-    """Alias for /inventory/orders/{order_id} to match frontend expectations"""
-    return update_inventory_order(order_id, payload)
-
 @app.delete("/inventory/orders/{order_id}")
 def delete_inventory_order(order_id: str):
     try:
-        resp = requests.delete(
+        resp = SESSION.delete(
             f"{REST_URL}/inventory_orders?id=eq.{order_id}",
-            headers=SERVICE_HEADERS
         )
         resp.raise_for_status()
-        return JSONResponse(content=[], status_code=200)
+        return []
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting inventory order: {str(e)}")
 
 @app.get("/maintenance/tasks")
+@app.get("/api/maintenance/tasks")
 def maintenance_tasks(limit: Optional[int] = None, include_image: bool = False):
     """
     Get maintenance tasks. Optionally limit the number of results.
     By default excludes image_uri to reduce response size (13MB -> few KB).
     Set include_image=true to get image_uri (only when needed for specific tasks).
     """
+    if include_image:
+        # image_uri can hold megabytes of base64 per row; not worth keeping in memory
+        return _fetch_maintenance_tasks(limit, include_image)
+    return cached(
+        f"maintenance_tasks:{limit}:{include_image}",
+        10,
+        lambda: _fetch_maintenance_tasks(limit, include_image),
+    )
+
+def _fetch_maintenance_tasks(limit: Optional[int], include_image: bool):
     try:
         # Exclude image_uri by default to avoid huge response sizes (base64 images can be several MB each)
         if include_image:
@@ -2689,9 +2777,9 @@ def maintenance_tasks(limit: Optional[int] = None, include_image: bool = False):
         
         if limit:
             params["limit"] = str(limit)
-        resp = requests.get(f"{REST_URL}/maintenance_tasks", headers=SERVICE_HEADERS, params=params)
+        resp = SESSION.get(MAINTENANCE_TASKS_URL, params=params)
         resp.raise_for_status()
-        tasks = resp.json() or []
+        tasks = sb_json(resp) or []
         
         # Add a flag indicating if image exists (without the actual data)
         if not include_image:
@@ -2704,14 +2792,6 @@ def maintenance_tasks(limit: Optional[int] = None, include_image: bool = False):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching maintenance tasks: {str(e)}")
 
-@app.get("/api/maintenance/tasks")
-def api_maintenance_tasks(limit: Optional[int] = None, include_image: bool = False):
-    """
-    Alias for /maintenance/tasks to match frontend expectations.
-    By default excludes image_uri to reduce response size from 13MB to few KB.
-    """
-    return maintenance_tasks(limit=limit, include_image=include_image)
-
 @app.get("/api/maintenance/tasks/stats")
 def maintenance_tasks_stats():
     """
@@ -2721,13 +2801,12 @@ def maintenance_tasks_stats():
     """
     try:
         # Only fetch unit_id and status - no other fields to minimize data transfer
-        resp = requests.get(
-            f"{REST_URL}/maintenance_tasks",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.get(
+            MAINTENANCE_TASKS_URL,
             params={"select": "unit_id,status"}  # Removed order - not needed for counting
         )
         resp.raise_for_status()
-        tasks = resp.json() or []
+        tasks = sb_json(resp) or []
         
         # Normalize status values (match frontend logic)
         def normalize_status(s: str) -> str:
@@ -2779,13 +2858,12 @@ def maintenance_tasks_assignments(username: Optional[str] = None, user_id: Optio
         # Only fetch minimal fields needed for assignment checking
         params = {"select": "id,assigned_to,title"}
         
-        resp = requests.get(
-            f"{REST_URL}/maintenance_tasks",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.get(
+            MAINTENANCE_TASKS_URL,
             params=params
         )
         resp.raise_for_status()
-        tasks = resp.json() or []
+        tasks = sb_json(resp) or []
         
         # Filter by username/user_id if provided (filter in Python for flexibility)
         if username or user_id:
@@ -2802,6 +2880,36 @@ def maintenance_tasks_assignments(username: Optional[str] = None, user_id: Optio
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching maintenance task assignments: {str(e)}")
 
+def _media_extension(filename: Optional[str], content_type: str) -> str:
+    """File extension for an upload, from its filename or else its content type"""
+    if filename and "." in filename:
+        return filename.split(".")[-1]
+    return "mp4" if content_type.startswith("video/") else "jpg"
+
+def _upload_media(raw: bytes, content_type: str, file_ext: str) -> str:
+    """Upload raw bytes to Supabase Storage and return the public URL"""
+    # Determine bucket based on content type (using "vidoes" bucket as shown in Supabase)
+    bucket = "vidoes" if content_type.startswith("video/") else "images"
+    unique_filename = f"{uuid.uuid4()}.{file_ext}"
+    resp = SESSION.put(
+        f"{STORAGE_URL}/object/{bucket}/{unique_filename}",
+        headers={**STORAGE_HEADERS, "Content-Type": content_type},
+        data=raw,
+    )
+    if resp.status_code not in [200, 201]:
+        error_text = resp.text[:200] if resp.text else "Unknown error"
+        raise HTTPException(status_code=500, detail=f"Storage upload failed: {error_text}")
+    return f"{SUPABASE_URL}/storage/v1/object/public/{bucket}/{unique_filename}"
+
+def _upload_data_uri(data_uri: str) -> str:
+    """Upload a data:<mime>;base64,<...> URI to Supabase Storage and return the public URL"""
+    header, _, base64_data = data_uri.partition(",")
+    if not base64_data:
+        raise HTTPException(status_code=400, detail="Invalid data URI")
+    mime_type = header.split(";")[0][len("data:"):] or "application/octet-stream"
+    file_ext = "mp4" if mime_type.startswith("video/") else ("jpg" if "jpeg" in mime_type else "png")
+    return _upload_media(base64.b64decode(base64_data), mime_type, file_ext)
+
 @app.post("/api/storage/upload")
 async def upload_to_storage(request: Request):
     """
@@ -2814,44 +2922,18 @@ async def upload_to_storage(request: Request):
         if not media or not hasattr(media, "filename"):
             raise HTTPException(status_code=400, detail="File is required")
         
-        filename = getattr(media, "filename", None) or f"upload-{uuid.uuid4()}"
         content_type = getattr(media, "content_type", None) or "application/octet-stream"
+        file_ext = _media_extension(getattr(media, "filename", None), content_type)
         raw = await media.read()
-        
-        # Determine bucket based on content type (using "vidoes" bucket as shown in Supabase)
-        bucket = "vidoes" if content_type.startswith("video/") else "images"
-        
-        # Generate unique filename
-        file_ext = filename.split(".")[-1] if "." in filename else ("mp4" if content_type.startswith("video/") else "jpg")
-        unique_filename = f"{uuid.uuid4()}.{file_ext}"
-        
-        # Upload to Supabase Storage
-        upload_url = f"{STORAGE_URL}/object/{bucket}/{unique_filename}"
-        upload_headers = {
-            **STORAGE_HEADERS,
-            "Content-Type": content_type,
-        }
-        
-        resp = requests.put(upload_url, headers=upload_headers, data=raw)
-        if resp.status_code not in [200, 201]:
-            error_text = resp.text[:200] if resp.text else "Unknown error"
-            raise HTTPException(status_code=500, detail=f"Storage upload failed: {error_text}")
-        
-        # Get public URL
-        public_url = f"{SUPABASE_URL}/storage/v1/object/public/{bucket}/{unique_filename}"
-        
-        return {"url": public_url, "filename": unique_filename}
+        public_url = await run_in_threadpool(_upload_media, raw, content_type, file_ext)
+        return {"url": public_url, "filename": public_url.rsplit("/", 1)[-1]}
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error uploading file: {str(e)}")
 
-@app.post("/api/maintenance/tasks")
-async def api_create_maintenance_task(request: Request):
-    """Alias for /maintenance/tasks to match frontend expectations"""
-    return await create_maintenance_task(request)
-
 @app.post("/maintenance/tasks")
+@app.post("/api/maintenance/tasks")
 async def create_maintenance_task(request: Request):
     """
     Create a maintenance task.
@@ -2863,66 +2945,23 @@ async def create_maintenance_task(request: Request):
     Notes:
     - Category/Priority are deprecated in the UI. If the DB still requires `priority`,
       we set a default server-side to keep inserts working.
-    - Media is stored in DB in `image_uri` as a data-URI: data:<mime>;base64,<...>
-      (works for both images and videos).
+    - Media (files or data-URIs) is uploaded to Supabase Storage and `image_uri`
+      stores the public URL (works for both images and videos).
     """
     content_type = (request.headers.get("content-type") or "").lower()
 
     data: dict = {}
-    media_data_uri: Optional[str] = None
 
     try:
         if content_type.startswith("application/json"):
-            payload = await request.json()
+            payload = orjson.loads(await request.body())
             if isinstance(payload, dict):
                 data = payload
-                # If imageUri is provided in JSON payload, check if it's a data URI and upload to storage
+                # If imageUri is provided as a data URI (especially for videos), upload it to storage
                 if "imageUri" in data:
                     image_uri = data.pop("imageUri")
-                    # If it's a data URI (especially for videos), upload to storage
                     if image_uri and image_uri.startswith("data:"):
-                        try:
-                            # Extract mime type and base64 data
-                            parts = image_uri.split(",", 1)
-                            if len(parts) == 2:
-                                mime_part = parts[0].split(";")[0]
-                                mime_type = mime_part.replace("data:", "") if mime_part.startswith("data:") else "application/octet-stream"
-                                base64_data = parts[1]
-                                
-                                # Decode base64
-                                raw = base64.b64decode(base64_data)
-                                
-                                # Determine bucket (using "vidoes" as shown in Supabase)
-                                bucket = "vidoes" if mime_type.startswith("video/") else "images"
-                                
-                                # Generate unique filename
-                                file_ext = "mp4" if mime_type.startswith("video/") else ("jpg" if "jpeg" in mime_type else "png")
-                                unique_filename = f"{uuid.uuid4()}.{file_ext}"
-                                
-                                # Upload to Supabase Storage
-                                upload_url = f"{STORAGE_URL}/object/{bucket}/{unique_filename}"
-                                upload_headers = {
-                                    **STORAGE_HEADERS,
-                                    "Content-Type": mime_type,
-                                }
-                                
-                                resp = requests.put(upload_url, headers=upload_headers, data=raw)
-                                if resp.status_code in [200, 201]:
-                                    # Use public URL from storage
-                                    public_url = f"{SUPABASE_URL}/storage/v1/object/public/{bucket}/{unique_filename}"
-                                    data["image_uri"] = public_url
-                                else:
-                                    # Fallback to data URI if storage upload fails
-                                    data["image_uri"] = image_uri
-                            else:
-                                data["image_uri"] = image_uri
-                        except Exception as e:
-                            # Fallback to data URI if conversion fails
-                            try:
-                                print(f"Error uploading data URI to storage: {e}")
-                            except UnicodeEncodeError:
-                                print(f"Error uploading data URI to storage: {str(e).encode('ascii', 'replace').decode('ascii')}")
-                            data["image_uri"] = image_uri
+                        data["image_uri"] = await run_in_threadpool(_upload_data_uri, image_uri)
                     else:
                         data["image_uri"] = image_uri
         else:
@@ -2930,42 +2969,15 @@ async def create_maintenance_task(request: Request):
             data = {k: v for k, v in form.items() if k != "media"}
             media = form.get("media")
             if media is not None and hasattr(media, "filename"):
-                # Upload to Supabase Storage instead of storing as data URI
-                filename = getattr(media, "filename", None) or "upload.bin"
-                content_type = getattr(media, "content_type", None) or "application/octet-stream"
+                media_type = getattr(media, "content_type", None) or "application/octet-stream"
+                file_ext = _media_extension(getattr(media, "filename", None), media_type)
                 raw = await media.read()
-                
-                # Determine bucket based on content type (using "vidoes" as shown in Supabase)
-                bucket = "vidoes" if content_type.startswith("video/") else "images"
-                
-                # Generate unique filename
-                file_ext = filename.split(".")[-1] if "." in filename else ("mp4" if content_type.startswith("video/") else "jpg")
-                unique_filename = f"{uuid.uuid4()}.{file_ext}"
-                
-                # Upload to Supabase Storage
-                upload_url = f"{STORAGE_URL}/object/{bucket}/{unique_filename}"
-                upload_headers = {
-                    **STORAGE_HEADERS,
-                    "Content-Type": content_type,
-                }
-                
-                resp = requests.put(upload_url, headers=upload_headers, data=raw)
-                if resp.status_code not in [200, 201]:
-                    # Fallback to data URI if storage upload fails
-                    b64 = base64.b64encode(raw).decode("ascii")
-                    media_data_uri = f"data:{content_type};base64,{b64}"
-                    data["image_uri"] = media_data_uri
-                else:
-                    # Use public URL from storage
-                    public_url = f"{SUPABASE_URL}/storage/v1/object/public/{bucket}/{unique_filename}"
-                    data["image_uri"] = public_url
+                data["image_uri"] = await run_in_threadpool(_upload_media, raw, media_type, file_ext)
 
-        # Always generate a UUID for the ID - ignore any client-generated IDs (those starting with "task-")
+        # Let Postgres generate the ID - ignore client-generated IDs (those starting with "task-")
         # This ensures all tasks have proper UUIDs that work with Supabase queries
-        client_id = data.get("id", "")
-        if not client_id or client_id.startswith("task-"):
-            data["id"] = str(uuid.uuid4())
-        else:
+        client_id = data.pop("id", None) or ""
+        if not client_id.startswith("task-"):
             # Keep the provided ID only if it's a valid UUID format
             # UUIDs are 36 characters with dashes: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx
             try:
@@ -2973,8 +2985,8 @@ async def create_maintenance_task(request: Request):
                 uuid.UUID(client_id)
                 data["id"] = client_id
             except (ValueError, AttributeError):
-                # Invalid ID format, generate a new UUID
-                data["id"] = str(uuid.uuid4())
+                # Invalid ID format, let Postgres generate one
+                pass
 
         # Normalize keys for Supabase schema - map camelCase to snake_case
         if "unitId" in data:
@@ -3009,24 +3021,26 @@ async def create_maintenance_task(request: Request):
             from datetime import datetime
             data["created_date"] = datetime.now().strftime("%Y-%m-%d")
 
-        resp = requests.post(f"{REST_URL}/maintenance_tasks", headers=SERVICE_HEADERS, json=data)
+        resp = await run_in_threadpool(SESSION.post, MAINTENANCE_TASKS_URL, json=data)
         resp.raise_for_status()
-        if resp.text:
-            body = resp.json()
+        invalidate_cache("maintenance_tasks")
+        if resp.content:
+            body = sb_json(resp)
             result = body[0] if isinstance(body, list) and body else body
             
             # Send push notification if task is assigned to a user
             assigned_to = data.get("assigned_to") or result.get("assigned_to")
             if assigned_to:
                 task_title = data.get("title") or result.get("title", "משימת תחזוקה חדשה")
-                safe_print(f"📱 Sending push notification for new task assignment to: {assigned_to}")
-                safe_print(f"   Task: {task_title}")
+                log.info(f"📱 Sending push notification for new task assignment to: {assigned_to}")
+                log.info(f"   Task: {task_title}")
                 # Convert user ID to username (push tokens are stored by username)
-                username = get_username_from_id(assigned_to)
+                username = await run_in_threadpool(get_username_from_id, assigned_to)
                 if username:
                     # Convert all data values to strings (FCM requirement)
                     task_id = result.get("id")
-                    push_result = send_push_to_user(
+                    push_result = await run_in_threadpool(
+                        send_push_to_user,
                         username=username,
                         title="משימת תחזוקה חדשה",
                         body=f"הוקצתה לך משימה: {task_title}",
@@ -3040,14 +3054,17 @@ async def create_maintenance_task(request: Request):
             
             return result
         return data
+    except HTTPException:
+        raise
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:400]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e, 400)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating maintenance task: {str(e)}")
 
 
 @app.get("/maintenance/tasks/{task_id}")
+@app.get("/api/maintenance/tasks/{task_id}")
 def get_maintenance_task(task_id: str, include_image: bool = True):
     """
     Get a specific maintenance task by ID.
@@ -3059,32 +3076,23 @@ def get_maintenance_task(task_id: str, include_image: bool = True):
         select_fields = "*" if include_image else "id,unit_id,title,description,status,priority,created_date,assigned_to,category,room"
         # URL-encode the task_id to handle special characters in UUIDs
         encoded_task_id = urllib.parse.quote(task_id, safe='')
-        resp = requests.get(
-            f"{REST_URL}/maintenance_tasks",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.get(
+            MAINTENANCE_TASKS_URL,
             params={"id": f"eq.{encoded_task_id}", "select": select_fields},
         )
         resp.raise_for_status()
-        rows = resp.json() or []
+        rows = sb_json(resp) or []
         if not rows:
             raise HTTPException(status_code=404, detail="Task not found")
         return rows[0]
     except HTTPException:
         raise
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching maintenance task: {str(e)}")
 
-@app.get("/api/maintenance/tasks/{task_id}")
-def api_get_maintenance_task(task_id: str, include_image: bool = True):
-    """
-    Alias for /maintenance/tasks/{task_id} to match frontend expectations.
-    By default includes image_uri (for detail view).
-    """
-    return get_maintenance_task(task_id=task_id, include_image=include_image)
-
 @app.patch("/maintenance/tasks/{task_id}")
 def update_maintenance_task(task_id: str, payload: dict):
     data = {k: v for k, v in payload.items() if v is not None}
@@ -3094,7 +3102,6 @@ def update_maintenance_task(task_id: str, payload: dict):
     if not data:
         return {"message": "No changes provided"}
     try:
-        headers = {**SERVICE_HEADERS, "Prefer": "return=representation"}
         
         # Check if assigned_to is being updated
         assigned_to = data.get("assignedTo") or data.get("assigned_to")
@@ -3105,18 +3112,18 @@ def update_maintenance_task(task_id: str, payload: dict):
         
         # URL-encode the task_id to handle special characters in UUIDs
         encoded_task_id = urllib.parse.quote(task_id, safe='')
-        resp = requests.patch(
-            f"{REST_URL}/maintenance_tasks?id=eq.{encoded_task_id}",
-            headers=headers,
+        resp = SESSION.patch(
+            f"{MAINTENANCE_TASKS_URL}?id=eq.{encoded_task_id}",
             json=data
         )
         resp.raise_for_status()
-        if resp.text:
-            result = resp.json()
+        invalidate_cache("maintenance_tasks")
+        if resp.content:
+            result = sb_json(resp)
             return result[0] if isinstance(result, list) and result else result
         return {"id": task_id, "message": "Updated successfully"}
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating maintenance task: {str(e)}")
@@ -3133,58 +3140,18 @@ async def api_update_maintenance_task(request: Request, task_id: str):
     content_type = (request.headers.get("content-type") or "").lower()
     
     data: dict = {}
-    media_data_uri: Optional[str] = None
     
     try:
         if content_type.startswith("application/json"):
-            payload = await request.json()
+            payload = orjson.loads(await request.body())
             if isinstance(payload, dict):
                 data = payload
-                # If imageUri is provided in JSON payload, check if it's a data URI and upload to storage
+                # If imageUri is provided as a data URI (especially for videos), upload it to storage
                 if "imageUri" in data or "image_uri" in data:
                     image_uri = data.pop("imageUri", None) or data.pop("image_uri", None)
                     if image_uri:
-                        # If it's a data URI (especially for videos), upload to storage
                         if image_uri.startswith("data:"):
-                            try:
-                                # Extract mime type and base64 data
-                                parts = image_uri.split(",", 1)
-                                if len(parts) == 2:
-                                    mime_part = parts[0].split(";")[0]
-                                    mime_type = mime_part.replace("data:", "") if mime_part.startswith("data:") else "application/octet-stream"
-                                    base64_data = parts[1]
-                                    
-                                    # Decode base64
-                                    raw = base64.b64decode(base64_data)
-                                    
-                                    # Determine bucket (using "vidoes" as shown in Supabase)
-                                    bucket = "vidoes" if mime_type.startswith("video/") else "images"
-                                    
-                                    # Generate unique filename
-                                    file_ext = "mp4" if mime_type.startswith("video/") else ("jpg" if "jpeg" in mime_type else "png")
-                                    unique_filename = f"{uuid.uuid4()}.{file_ext}"
-                                    
-                                    # Upload to Supabase Storage
-                                    upload_url = f"{STORAGE_URL}/object/{bucket}/{unique_filename}"
-                                    upload_headers = {
-                                        **STORAGE_HEADERS,
-                                        "Content-Type": mime_type,
-                                    }
-                                    
-                                    resp = requests.put(upload_url, headers=upload_headers, data=raw)
-                                    if resp.status_code in [200, 201]:
-                                        # Use public URL from storage
-                                        public_url = f"{SUPABASE_URL}/storage/v1/object/public/{bucket}/{unique_filename}"
-                                        data["image_uri"] = public_url
-                                    else:
-                                        # Fallback to data URI if storage upload fails
-                                        data["image_uri"] = image_uri
-                                else:
-                                    data["image_uri"] = image_uri
-                            except Exception as e:
-                                # Fallback to data URI if conversion fails
-                                print(f"Error uploading data URI to storage: {e}")
-                                data["image_uri"] = image_uri
+                            data["image_uri"] = await run_in_threadpool(_upload_data_uri, image_uri)
                         else:
                             data["image_uri"] = image_uri
         else:
@@ -3193,35 +3160,10 @@ async def api_update_maintenance_task(request: Request, task_id: str):
             data = {k: v for k, v in form.items() if k != "media"}
             media = form.get("media")
             if media is not None and hasattr(media, "filename"):
-                # Upload to Supabase Storage instead of storing as data URI
-                filename = getattr(media, "filename", None) or "upload.bin"
-                content_type_media = getattr(media, "content_type", None) or "application/octet-stream"
+                media_type = getattr(media, "content_type", None) or "application/octet-stream"
+                file_ext = _media_extension(getattr(media, "filename", None), media_type)
                 raw = await media.read()
-                
-                # Determine bucket based on content type (using "vidoes" as shown in Supabase)
-                bucket = "vidoes" if content_type_media.startswith("video/") else "images"
-                
-                # Generate unique filename
-                file_ext = filename.split(".")[-1] if "." in filename else ("mp4" if content_type_media.startswith("video/") else "jpg")
-                unique_filename = f"{uuid.uuid4()}.{file_ext}"
-                
-                # Upload to Supabase Storage
-                upload_url = f"{STORAGE_URL}/object/{bucket}/{unique_filename}"
-                upload_headers = {
-                    **STORAGE_HEADERS,
-                    "Content-Type": content_type_media,
-                }
-                
-                resp = requests.put(upload_url, headers=upload_headers, data=raw)
-                if resp.status_code not in [200, 201]:
-                    # Fallback to data URI if storage upload fails
-                    b64 = base64.b64encode(raw).decode("ascii")
-                    media_data_uri = f"data:{content_type_media};base64,{b64}"
-                    data["image_uri"] = media_data_uri
-                else:
-                    # Use public URL from storage
-                    public_url = f"{SUPABASE_URL}/storage/v1/object/public/{bucket}/{unique_filename}"
-                    data["image_uri"] = public_url
+                data["image_uri"] = await run_in_threadpool(_upload_media, raw, media_type, file_ext)
         
         # Normalize keys for Supabase schema
         if "unitId" in data:
@@ -3262,15 +3204,15 @@ async def api_update_maintenance_task(request: Request, task_id: str):
         
         # URL-encode the task_id to handle special characters in UUIDs
         encoded_task_id = urllib.parse.quote(task_id, safe='')
-        headers = {**SERVICE_HEADERS, "Prefer": "return=representation"}
-        resp = requests.patch(
-            f"{REST_URL}/maintenance_tasks?id=eq.{encoded_task_id}",
-            headers=headers,
+        resp = await run_in_threadpool(
+            SESSION.patch,
+            f"{MAINTENANCE_TASKS_URL}?id=eq.{encoded_task_id}",
             json=data
         )
         resp.raise_for_status()
-        if resp.text:
-            result = resp.json()
+        invalidate_cache("maintenance_tasks")
+        if resp.content:
+            result = sb_json(resp)
             # Check if result is empty (task not found)
             if isinstance(result, list) and len(result) == 0:
                 raise HTTPException(
@@ -3285,10 +3227,11 @@ async def api_update_maintenance_task(request: Request, task_id: str):
                 print(f"📱 Sending push notification for updated task assignment to: {assigned_to}")
                 print(f"   Task: {task_title}")
                 # Convert user ID to username (push tokens are stored by username)
-                username = get_username_from_id(assigned_to)
+                username = await run_in_threadpool(get_username_from_id, assigned_to)
                 if username:
                     # Convert all data values to strings (FCM requirement)
-                    push_result = send_push_to_user(
+                    push_result = await run_in_threadpool(
+                        send_push_to_user,
                         username=username,
                         title="משימת תחזוקה חדשה",
                         body=f"הוקצתה לך משימה: {task_title}",
@@ -3305,9 +3248,9 @@ async def api_update_maintenance_task(request: Request, task_id: str):
     except HTTPException:
         raise
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         # Provide more specific error message for 400 Bad Request
-        if e.response and e.response.status_code == 400:
+        if e.response is not None and e.response.status_code == 400:
             raise HTTPException(
                 status_code=400,
                 detail=f"Bad Request: Invalid task ID or data format. Task ID: '{task_id}'. Error: {error_detail}"
@@ -3321,33 +3264,54 @@ def delete_maintenance_task(task_id: str):
     try:
         # URL-encode the task_id to handle special characters in UUIDs
         encoded_task_id = urllib.parse.quote(task_id, safe='')
-        resp = requests.delete(
-            f"{REST_URL}/maintenance_tasks?id=eq.{encoded_task_id}",
-            headers=SERVICE_HEADERS
+        resp = SESSION.delete(
+            f"{MAINTENANCE_TASKS_URL}?id=eq.{encoded_task_id}",
         )
         resp.raise_for_status()
-        return JSONResponse(content=[], status_code=200)
+        invalidate_cache("maintenance_tasks")
+        return []
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting maintenance task: {str(e)}")
 
 @app.get("/reports/summary")
+@app.get("/api/reports/summary")
 def reports_summary():
+    return cached("reports_summary", 60, _fetch_reports_summary)
+
+def _fetch_reports_summary():
+    # Totals are aggregated in Postgres (db_migrations/add_reports_summary_function.sql);
+    # fall back to summing rows here until the function is deployed
+    try:
+        resp = SESSION.post(f"{REST_URL}/rpc/reports_summary", json={})
+        if resp.status_code != 404:
+            resp.raise_for_status()
+            rows = sb_json(resp) or []
+            row = rows[0] if rows else {}
+            return {
+                "totalRevenue": row.get("total_revenue") or 0,
+                "totalPaid": row.get("total_paid") or 0,
+                "totalExpenses": row.get("total_expenses") or 0,
+            }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching reports summary: {str(e)}")
+    return _sum_reports_summary()
+
+def _sum_reports_summary():
     try:
-        orders_resp = requests.get(f"{REST_URL}/orders", headers=SERVICE_HEADERS, params={"select": "total_amount,paid_amount"})
+        orders_resp = SESSION.get(ORDERS_URL, params={"select": "total_amount,paid_amount"})
         orders_resp.raise_for_status()
-        orders = orders_resp.json() or []
+        orders = sb_json(orders_resp) or []
         
         # Calculate expenses from invoices (receipts) - sum all invoices
         total_expenses = 0
         try:
             # Get all invoices - use select * to get all fields
-            invoices_resp = requests.get(
-                f"{REST_URL}/invoices", 
-                headers=SERVICE_HEADERS, 
+            invoices_resp = SESSION.get(
+                INVOICES_URL, 
                 params={"select": "*"}  # Get all fields to ensure we don't miss any amount fields
             )
             invoices_resp.raise_for_status()
-            invoices = invoices_resp.json() or []
+            invoices = sb_json(invoices_resp) or []
             
             print(f"📊 Found {len(invoices)} invoices for expenses calculation")
             
@@ -3399,10 +3363,22 @@ def reports_summary():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching reports summary: {str(e)}")
 
-@app.get("/api/reports/summary")
-def api_reports_summary():
-    """Alias for /reports/summary to match frontend expectations"""
-    return reports_summary()
+@app.get("/api/bootstrap")
+def api_bootstrap():
+    """
+    Initial dashboard data in one round-trip: users, orders, maintenance tasks and inventory items.
+    The upstream Supabase calls run in parallel.
+    """
+    users = EXECUTOR.submit(cached, "users", 30, _fetch_users)
+    orders_future = EXECUTOR.submit(_fetch_orders)
+    tasks = EXECUTOR.submit(maintenance_tasks)
+    items = EXECUTOR.submit(cached, "inventory_items", 15, _fetch_inventory_items)
+    return {
+        "users": orjson.loads(users.result()),
+        "orders": orders_future.result()[0],
+        "tasks": tasks.result(),
+        "items": orjson.loads(items.result()),
+    }
 
 @app.get("/api/reports/monthly-income-expenses")
 def monthly_income_expenses():
@@ -3414,17 +3390,23 @@ def monthly_income_expenses():
     from datetime import datetime
     
     try:
+        # Invoices are fetched in parallel with the orders
+        invoices_future = EXECUTOR.submit(
+            SESSION.get,
+            INVOICES_URL,
+            params={"select": "*"}
+        )
+        
         # Get all orders with their dates and amounts
         try:
-            orders_resp = requests.get(
-                f"{REST_URL}/orders", 
-                headers=SERVICE_HEADERS, 
+            orders_resp = SESSION.get(
+                ORDERS_URL, 
                 params={"select": "total_amount,paid_amount,arrival_date"}
             )
             orders_resp.raise_for_status()
-            orders = orders_resp.json() or []
+            orders = sb_json(orders_resp) or []
         except Exception as e:
-            print(f"Warning: Could not fetch orders: {e}")
+            log.warning(f"Could not fetch orders: {e}")
             orders = []
         
         # Group income by month from orders
@@ -3449,15 +3431,11 @@ def monthly_income_expenses():
         # Get all invoices with their dates and amounts
         monthly_expenses = defaultdict(float)
         try:
-            invoices_resp = requests.get(
-                f"{REST_URL}/invoices",
-                headers=SERVICE_HEADERS,
-                params={"select": "*"}
-            )
+            invoices_resp = invoices_future.result()
             invoices_resp.raise_for_status()
-            invoices = invoices_resp.json() or []
+            invoices = sb_json(invoices_resp) or []
         except Exception as e:
-            print(f"Warning: Could not fetch invoices (table might not exist): {e}")
+            log.warning(f"Could not fetch invoices (table might not exist): {e}")
             invoices = []
         
         # Group expenses by month from invoices
@@ -3550,17 +3528,17 @@ def monthly_income_expenses():
         raise HTTPException(status_code=500, detail=f"Error fetching monthly income/expenses: {str(e)}")
 
 @app.get("/invoices")
+@app.get("/api/invoices")
 def invoices():
     """Get all invoices - maps to actual table schema: id, vendor, invoice_number, amount, payment_method, issued_at, file_url"""
     try:
         # Try with order by issued_at (actual column name)
-        resp = requests.get(
-            f"{REST_URL}/invoices", 
-            headers=SERVICE_HEADERS, 
+        resp = SESSION.get(
+            INVOICES_URL, 
             params={"select": "*", "order": "issued_at.desc"}
         )
         resp.raise_for_status()
-        invoices = resp.json() or []
+        invoices = sb_json(resp) or []
         # Map database columns to frontend format
         mapped_invoices = []
         for inv in invoices:
@@ -3596,16 +3574,15 @@ def invoices():
         return mapped_invoices
     except requests.exceptions.HTTPError as e:
         # If table doesn't exist (404) or bad request (400), try without order
-        if e.response and (e.response.status_code == 404 or e.response.status_code == 400):
+        if e.response is not None and (e.response.status_code == 404 or e.response.status_code == 400):
             try:
                 # Try without order parameter
-                resp = requests.get(
-                    f"{REST_URL}/invoices", 
-                    headers=SERVICE_HEADERS, 
+                resp = SESSION.get(
+                    INVOICES_URL, 
                     params={"select": "*"}
                 )
                 resp.raise_for_status()
-                invoices = resp.json() or []
+                invoices = sb_json(resp) or []
                 # Map database columns to frontend format
                 mapped_invoices = []
                 for inv in invoices:
@@ -3642,7 +3619,7 @@ def invoices():
                 # If that also fails, table probably doesn't exist
                 print("Invoices table does not exist yet, returning empty array")
                 return []
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         print(f"Error fetching invoices: {str(e)}")
@@ -3677,7 +3654,7 @@ async def process_invoice(request: Request):
             image_base64 = base64.b64encode(image_data).decode("utf-8")
             image_mime = getattr(image_file, "content_type", "image/jpeg")
         elif content_type.startswith("application/json"):
-            payload = await request.json()
+            payload = orjson.loads(await request.body())
             # Expect base64 encoded image in data URI format: data:image/jpeg;base64,...
             image_data_uri = payload.get("image")
             if not image_data_uri:
@@ -3713,7 +3690,8 @@ async def process_invoice(request: Request):
         
         # Try to call OpenAI Responses API with GPT-5.2
         try:
-            response = client.responses.create(
+            response = await run_in_threadpool(
+                client.responses.create,
                 model="gpt-5.2",
                 input=[
                     {
@@ -3789,12 +3767,12 @@ Return ONLY the JSON object, nothing else."""
                         
                 except (json.JSONDecodeError, AttributeError, KeyError, ValueError, TypeError) as parse_error:
                     # If parsing fails, log the error but continue with empty fields
-                    print(f"Warning: Could not parse OpenAI response: {parse_error}")
+                    log.warning(f"Could not parse OpenAI response: {parse_error}")
                     print(f"Response content (first 500 chars): {content[:500]}")  # Log first 500 chars for debugging
                     # Continue with empty invoice_data - user can edit manually
         except Exception as openai_error:
             # If OpenAI call fails (network, API error, etc.), log and continue with empty fields
-            print(f"Warning: OpenAI API call failed: {openai_error}")
+            log.warning(f"OpenAI API call failed: {openai_error}")
             print("Saving invoice with empty fields - user can edit manually")
             # Continue with empty invoice_data - user can edit manually
         
@@ -3821,25 +3799,25 @@ Return ONLY the JSON object, nothing else."""
         
         try:
             # Try to save with new structure first
-            resp = requests.post(
-                f"{REST_URL}/invoices",
-                headers=SERVICE_HEADERS,
+            resp = await run_in_threadpool(
+                SESSION.post,
+                INVOICES_URL,
                 json=invoice_record
             )
             
             # If that fails, try fallback structure
             if resp.status_code not in [200, 201]:
                 try:
-                    resp = requests.post(
-                        f"{REST_URL}/invoices",
-                        headers=SERVICE_HEADERS,
+                    resp = await run_in_threadpool(
+                        SESSION.post,
+                        INVOICES_URL,
                         json=invoice_record_fallback
                     )
                 except:
                     pass
             # Check if save was successful
             if resp.status_code == 201 or resp.status_code == 200:
-                saved_invoice = resp.json()
+                saved_invoice = sb_json(resp)
                 saved_id = None
                 if isinstance(saved_invoice, list) and saved_invoice:
                     saved_id = saved_invoice[0].get("id")
@@ -3847,22 +3825,21 @@ Return ONLY the JSON object, nothing else."""
                     saved_id = saved_invoice.get("id")
                 print(f"Invoice saved successfully with ID: {saved_id}")
                 invoice_data["saved"] = True
+                invalidate_cache("reports_summary")
                 invoice_data["id"] = str(saved_id) if saved_id else None
             else:
                 # Log the error but don't fail
                 error_text = resp.text[:200] if resp.text else "Unknown error"
-                print(f"Warning: Could not save invoice to database. Status: {resp.status_code}, Error: {error_text}")
+                log.warning(f"Could not save invoice to database. Status: {resp.status_code}, Error: {error_text}")
                 invoice_data["saved"] = False
         except requests.exceptions.HTTPError as http_err:
             # Log HTTP errors
             error_text = ""
-            if http_err.response:
-                error_text = http_err.response.text[:200] if http_err.response.text else str(http_err.response)
-            print(f"Warning: HTTP error saving invoice to database: {http_err.response.status_code if http_err.response else 'Unknown'}, Error: {error_text}")
+            log.warning(f"HTTP error saving invoice to database: {_supabase_error_detail(http_err)}")
             invoice_data["saved"] = False
         except Exception as db_error:
             # Log but don't fail - the invoice can still be returned
-            print(f"Warning: Could not save invoice to database: {db_error}")
+            log.warning(f"Could not save invoice to database: {db_error}")
             invoice_data["saved"] = False
         
         # Add image_data to response (frontend expects this)
@@ -3891,13 +3868,13 @@ Return ONLY the JSON object, nothing else."""
                     "payment_method": None
                 }
                 
-                resp = requests.post(
-                    f"{REST_URL}/invoices",
-                    headers=SERVICE_HEADERS,
+                resp = await run_in_threadpool(
+                    SESSION.post,
+                    INVOICES_URL,
                     json=invoice_record
                 )
                 if resp.status_code == 201 or resp.status_code == 200:
-                    saved_invoice = resp.json()
+                    saved_invoice = sb_json(resp)
                     saved_id = None
                     if isinstance(saved_invoice, list) and saved_invoice:
                         saved_id = saved_invoice[0].get("id")
@@ -3924,22 +3901,16 @@ Return ONLY the JSON object, nothing else."""
             raise HTTPException(status_code=401, detail="Invalid OpenAI API key")
         raise HTTPException(status_code=500, detail=f"Error processing invoice: {error_msg}")
 
-@app.get("/api/invoices")
-def api_invoices():
-    """Alias for /invoices to match frontend expectations"""
-    return invoices()
-
 @app.get("/api/invoices/{invoice_id}")
 def get_invoice(invoice_id: str):
     """Get a single invoice by ID - maps to frontend format"""
     try:
-        resp = requests.get(
-            f"{REST_URL}/invoices",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.get(
+            INVOICES_URL,
             params={"id": f"eq.{invoice_id}", "select": "*"}
         )
         resp.raise_for_status()
-        invoices_list = resp.json()
+        invoices_list = sb_json(resp)
         if not invoices_list or len(invoices_list) == 0:
             raise HTTPException(status_code=404, detail="Invoice not found")
         db_invoice = invoices_list[0]
@@ -3983,15 +3954,14 @@ def update_invoice(invoice_id: str, payload: dict):
         if not data:
             return {"message": "No changes provided"}
         
-        headers = {**SERVICE_HEADERS, "Prefer": "return=representation"}
-        resp = requests.patch(
-            f"{REST_URL}/invoices?id=eq.{invoice_id}",
-            headers=headers,
+        resp = SESSION.patch(
+            f"{INVOICES_URL}?id=eq.{invoice_id}",
             json=data
         )
         resp.raise_for_status()
-        if resp.text:
-            result = resp.json()
+        invalidate_cache("reports_summary")
+        if resp.content:
+            result = sb_json(resp)
             db_invoice = result[0] if isinstance(result, list) and result else result
             # Map back to frontend format
             return {
@@ -4008,7 +3978,7 @@ def update_invoice(invoice_id: str, payload: dict):
             }
         return {"id": invoice_id, "message": "Updated successfully"}
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating invoice: {str(e)}")
@@ -4017,32 +3987,26 @@ def update_invoice(invoice_id: str, payload: dict):
 def delete_invoice(invoice_id: str):
     """Delete an invoice"""
     try:
-        resp = requests.delete(
-            f"{REST_URL}/invoices?id=eq.{invoice_id}",
-            headers=SERVICE_HEADERS
+        resp = SESSION.delete(
+            f"{INVOICES_URL}?id=eq.{invoice_id}",
         )
         resp.raise_for_status()
-        return JSONResponse(content={"message": "Deleted successfully"}, status_code=200)
+        invalidate_cache("reports_summary")
+        return {"message": "Deleted successfully"}
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting invoice: {str(e)}")
 
 @app.get("/chat/messages")
+@app.get("/api/chat/messages")
 def chat_messages():
     try:
-        resp = requests.get(f"{REST_URL}/chat_messages", headers=SERVICE_HEADERS, params={"select": "*", "order": "created_at.desc", "limit": "50"})
-        resp.raise_for_status()
-        return resp.json()
+        return _passthrough("chat_messages", {"select": "*", "order": "created_at.desc", "limit": "50"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching chat messages: {str(e)}")
 
-@app.get("/api/chat/messages")
-def api_chat_messages():
-    """Alias for /chat/messages to match frontend expectations"""
-    return chat_messages()
-
 @app.post("/api/chat/messages")
 def api_send_chat_message(payload: dict):
     """Send a chat message"""
@@ -4057,10 +4021,10 @@ def api_send_chat_message(payload: dict):
         if not data["sender"] or not data["content"]:
             raise HTTPException(status_code=400, detail="sender and content are required")
         
-        resp = requests.post(f"{REST_URL}/chat_messages", headers=SERVICE_HEADERS, json=data)
+        resp = SESSION.post(f"{REST_URL}/chat_messages", json=data)
         resp.raise_for_status()
-        if resp.text:
-            body = resp.json()
+        if resp.content:
+            body = sb_json(resp)
             result = body[0] if isinstance(body, list) and body else body
             
             # Send push notifications to all users except sender
@@ -4074,13 +4038,12 @@ def api_send_chat_message(payload: dict):
                 
                 # Get all registered push tokens
                 try:
-                    tokens_resp = requests.get(
-                        f"{REST_URL}/push_tokens",
-                        headers=SERVICE_HEADERS,
+                    tokens_resp = SESSION.get(
+                        PUSH_TOKENS_URL,
                         params={"select": "username,token,platform"}
                     )
                     tokens_resp.raise_for_status()
-                    all_tokens = tokens_resp.json() or []
+                    all_tokens = sb_json(tokens_resp) or []
                     print(f"   Found {len(all_tokens)} registered push tokens")
                     
                     if len(all_tokens) == 0:
@@ -4124,7 +4087,7 @@ def api_send_chat_message(payload: dict):
             return result
         return data
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:400]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e, 400)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except HTTPException:
         raise
@@ -4132,28 +4095,20 @@ def api_send_chat_message(payload: dict):
         raise HTTPException(status_code=500, detail=f"Error sending chat message: {str(e)}")
 
 @app.get("/attendance/logs")
+@app.get("/api/attendance/logs")
 def attendance_logs():
     try:
-        resp = requests.get(f"{REST_URL}/attendance_logs", headers=SERVICE_HEADERS, params={"select": "*", "order": "clock_in.desc", "limit": "50"})
-        resp.raise_for_status()
-        return resp.json()
+        return _passthrough("attendance_logs", {"select": "*", "order": "clock_in.desc", "limit": "50"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching attendance logs: {str(e)}")
 
-@app.get("/api/attendance/logs")
-def api_attendance_logs():
-    """Alias for /attendance/logs to match frontend expectations"""
-    return attendance_logs()
-
 @app.get("/api/attendance/logs/all")
 def api_attendance_logs_all():
     """
     Get all attendance logs (no limit) for employee management.
     """
     try:
-        resp = requests.get(f"{REST_URL}/attendance_logs", headers=SERVICE_HEADERS, params={"select": "*", "order": "clock_in.desc"})
-        resp.raise_for_status()
-        return resp.json() or []
+        return _passthrough("attendance_logs", {"select": "*", "order": "clock_in.desc"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching attendance logs: {str(e)}")
 
@@ -4162,12 +4117,11 @@ def get_attendance_status(employee: str):
     """Get current attendance status for an employee"""
     try:
         # Get the most recent log entry for this employee that doesn't have a clock_out
-        resp = requests.get(
+        resp = SESSION.get(
             f"{REST_URL}/attendance_logs?employee=eq.{employee}&clock_out=is.null&order=clock_in.desc&limit=1",
-            headers=SERVICE_HEADERS
         )
         resp.raise_for_status()
-        logs = resp.json()
+        logs = sb_json(resp)
         
         # Check if there's an active session (no clock_out)
         is_clocked_in = False
@@ -4188,9 +4142,9 @@ def get_attendance_status(employee: str):
             "session": session
         }
     except requests.exceptions.HTTPError as e:
-        if e.response and e.response.status_code == 404:
+        if e.response is not None and e.response.status_code == 404:
             return {"is_clocked_in": False, "session": None}
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching attendance status: {str(e)}")
@@ -4210,17 +4164,16 @@ def start_attendance(payload: dict):
             "clock_out": None
         }
         
-        resp = requests.post(
+        resp = SESSION.post(
             f"{REST_URL}/attendance_logs",
-            headers=SERVICE_HEADERS,
             json=log_data
         )
         resp.raise_for_status()
         
-        result = resp.json()
+        result = sb_json(resp)
         return result[0] if isinstance(result, list) and result else result
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error starting attendance: {str(e)}")
@@ -4234,12 +4187,11 @@ def stop_attendance(payload: dict):
             raise HTTPException(status_code=400, detail="Employee name is required")
         
         # Find the most recent log entry without a clock_out
-        resp = requests.get(
+        resp = SESSION.get(
             f"{REST_URL}/attendance_logs?employee=eq.{employee}&clock_out=is.null&order=clock_in.desc&limit=1&select=id",
-            headers=SERVICE_HEADERS
         )
         resp.raise_for_status()
-        logs = resp.json()
+        logs = sb_json(resp)
         
         if not logs or len(logs) == 0:
             raise HTTPException(status_code=404, detail="No active attendance session found")
@@ -4251,19 +4203,18 @@ def stop_attendance(payload: dict):
             "clock_out": datetime.now().isoformat()
         }
         
-        update_resp = requests.patch(
+        update_resp = SESSION.patch(
             f"{REST_URL}/attendance_logs?id=eq.{log_id}",
-            headers=SERVICE_HEADERS,
             json=update_data
         )
         update_resp.raise_for_status()
         
-        result = update_resp.json()
+        result = sb_json(update_resp)
         return result[0] if isinstance(result, list) and result else result
     except requests.exceptions.HTTPError as e:
-        if e.response and e.response.status_code == 404:
+        if e.response is not None and e.response.status_code == 404:
             raise HTTPException(status_code=404, detail="No active attendance session found")
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error stopping attendance: {str(e)}")
@@ -4295,24 +4246,22 @@ def update_attendance_log(log_id: str, payload: dict):
         encoded_log_id = urllib.parse.quote(log_id, safe='')
         
         # Update the attendance log
-        headers = {**SERVICE_HEADERS, "Prefer": "return=representation"}
-        resp = requests.patch(
+        resp = SESSION.patch(
             f"{REST_URL}/attendance_logs?id=eq.{encoded_log_id}",
-            headers=headers,
             json=update_data
         )
         resp.raise_for_status()
         
-        result = resp.json()
+        result = sb_json(resp)
         if isinstance(result, list) and result:
             return result[0]
         return result
     except HTTPException:
         raise
     except requests.exceptions.HTTPError as e:
-        if e.response and e.response.status_code == 404:
+        if e.response is not None and e.response.status_code == 404:
             raise HTTPException(status_code=404, detail=f"Attendance log with ID '{log_id}' not found")
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating attendance log: {str(e)}")
@@ -4321,15 +4270,17 @@ def update_attendance_log(log_id: str, payload: dict):
 @app.get("/api/warehouses")
 def api_get_warehouses():
     """Get all warehouses"""
+    body = cached("warehouses", 30, _fetch_warehouses)
+    return Response(content=body, media_type="application/json")
+
+def _fetch_warehouses():
     try:
-        resp = requests.get(f"{REST_URL}/warehouses", headers=SERVICE_HEADERS, params={"select": "*"})
-        resp.raise_for_status()
-        return resp.json() or []
+        return _get_bytes("warehouses", {"select": "*"})
     except requests.exceptions.HTTPError as e:
         # If table doesn't exist, return empty array
-        if e.response and e.response.status_code == 404:
-            return []
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        if e.response is not None and e.response.status_code == 404:
+            return b"[]"
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching warehouses: {str(e)}")
@@ -4341,104 +4292,206 @@ def api_create_warehouse(payload: dict):
         data = payload
         if not data.get("id"):
             data["id"] = str(uuid.uuid4())
-        resp = requests.post(f"{REST_URL}/warehouses", headers=SERVICE_HEADERS, json=data)
+        else:
+            # Warehouse item routes take UUID warehouse ids, so any other id would lock out its items
+            try:
+                data["id"] = str(uuid.UUID(str(data["id"])))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Warehouse id must be a UUID")
+        resp = SESSION.post(f"{REST_URL}/warehouses", json=data)
         resp.raise_for_status()
-        if resp.text:
-            body = resp.json()
+        invalidate_cache("warehouses")
+        if resp.content:
+            body = sb_json(resp)
             return body[0] if isinstance(body, list) and body else body
         return data
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating warehouse: {str(e)}")
 
-@app.get("/api/warehouses/{warehouse_id}/items")
-def api_get_warehouse_items(warehouse_id: str):
-    """Get items for a warehouse"""
+class WarehouseItem(BaseModel):
+    # Columns beyond the keys are passed through as stored in Supabase
+    model_config = ConfigDict(extra="allow")
+
+    id: str
+    warehouse_id: Optional[str] = None
+
+
+# Raw bytes are forwarded (see list_users), so the model only documents the rows
+@app.get("/api/warehouses/{warehouse_id}/items", responses={200: {"model": List[WarehouseItem]}})
+def api_get_warehouse_items(warehouse_id: uuid.UUID, if_none_match: Optional[str] = Header(None)):
+    """Get items for a warehouse (answers 304 when the client's ETag is still current)"""
+    etag, body = cached(f"warehouse_items:{warehouse_id}", 30, lambda: _fetch_warehouse_items(warehouse_id))
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+def _fetch_warehouse_items(warehouse_id: uuid.UUID):
     try:
-        resp = requests.get(
-            f"{REST_URL}/warehouse_items",
-            headers=SERVICE_HEADERS,
-            params={"warehouse_id": f"eq.{warehouse_id}", "select": "*"}
+        resp = SESSION.get(
+            WAREHOUSE_ITEMS_URL,
+            params=(("warehouse_id", f"eq.{warehouse_id}"), ("select", "*"))
         )
+        # If table doesn't exist, return empty array
+        if resp.status_code == 404:
+            return _etag(b"[]"), b"[]"
         resp.raise_for_status()
-        return resp.json() or []
+        return _etag(resp.content), resp.content
     except requests.exceptions.HTTPError as e:
-        # If table doesn't exist, return empty array
-        if e.response and e.response.status_code == 404:
-            return []
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching warehouse items: {str(e)}")
 
-@app.post("/api/warehouses/{warehouse_id}/items")
-def api_create_warehouse_item(warehouse_id: str, payload: dict):
+@app.post("/api/warehouses/{warehouse_id}/items", response_model=WarehouseItem)
+def api_create_warehouse_item(warehouse_id: uuid.UUID, payload: dict):
     """Create a warehouse item"""
     try:
         data = payload
-        data["warehouse_id"] = warehouse_id
+        data["warehouse_id"] = str(warehouse_id)
         if not data.get("id"):
             data["id"] = str(uuid.uuid4())
-        resp = requests.post(f"{REST_URL}/warehouse_items", headers=SERVICE_HEADERS, json=data)
+        else:
+            # Item routes take UUID ids, so any other id could never be updated later
+            try:
+                data["id"] = str(uuid.UUID(str(data["id"])))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Item id must be a UUID")
+        # The payload already carries id + warehouse_id, so skip echoing the row back
+        resp = SESSION.post(
+            WAREHOUSE_ITEMS_URL,
+            json=data,
+            headers=PREFER_MINIMAL
+        )
         resp.raise_for_status()
-        if resp.text:
-            body = resp.json()
-            return body[0] if isinstance(body, list) and body else body
+        invalidate_cache(f"warehouse_items:{warehouse_id}")
         return data
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating warehouse item: {str(e)}")
 
 @app.patch("/api/warehouses/{warehouse_id}/items/{item_id}")
-def api_update_warehouse_item(warehouse_id: str, item_id: str, payload: dict):
-    """Update a warehouse item"""
+def api_update_warehouse_item(
+    warehouse_id: uuid.UUID,
+    item_id: uuid.UUID,
+    payload: dict,
+    return_mode: Optional[str] = Query(None, alias="return"),
+    strip_nulls: bool = False,
+):
+    """Update a warehouse item (pass ?return=full to get the stored row back)"""
     try:
-        data = {k: v for k, v in payload.items() if v is not None}
+        # Explicit nulls clear a field unless the client asks for them to be dropped
+        data = payload.copy()
+        data.pop("id", None)
+        data.pop("warehouse_id", None)
+        if strip_nulls:
+            for k in [k for k, v in data.items() if v is None]:
+                del data[k]
         if not data:
-            return {"message": "No changes provided"}
-        headers = {**SERVICE_HEADERS, "Prefer": "return=representation"}
-        resp = requests.patch(
-            f"{REST_URL}/warehouse_items?id=eq.{item_id}",
-            headers=headers,
-            json=data
+            return Response(status_code=204)
+        full = return_mode == "full"
+        resp = SESSION.patch(
+            WAREHOUSE_ITEMS_URL,
+            params=(("id", f"eq.{item_id}"),),
+            json=data,
+            headers=None if full else PREFER_MINIMAL
         )
         resp.raise_for_status()
-        if resp.text:
-            result = resp.json()
+        invalidate_cache(f"warehouse_items:{warehouse_id}")
+        if full and resp.content:
+            result = sb_json(resp)
             return result[0] if isinstance(result, list) and result else result
-        return {"id": item_id, "message": "Updated successfully"}
+        return {"id": str(item_id), **data}
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating warehouse item: {str(e)}")
 
+@app.patch("/api/warehouses/{warehouse_id}/items")
+def api_bulk_update_warehouse_items(warehouse_id: uuid.UUID, payloads: List[dict]):
+    """Update several warehouse items at once; each entry needs an id plus the fields to change"""
+    try:
+        # A PATCH sets the same values on every matched row, so items with identical
+        # changes share one id=in.(...) request
+        groups = {}
+        item_ids = {}  # dict keeps payload order with O(1) duplicate checks
+        for payload in payloads:
+            try:
+                item_id = str(uuid.UUID(str(payload.get("id"))))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Each item must include a valid id")
+            if item_id in item_ids:
+                raise HTTPException(status_code=400, detail=f"Duplicate item id: {item_id}")
+            item_ids[item_id] = None
+            changes = {k: v for k, v in payload.items() if k not in ("id", "warehouse_id")}
+            if changes:
+                group = groups.setdefault(orjson.dumps(changes, option=orjson.OPT_SORT_KEYS), (changes, []))
+                group[1].append(item_id)
+        
+        # Every id must be an item of this warehouse, so unknown ids get a 404 instead of a silent no-op
+        if item_ids:
+            check_resp = SESSION.get(
+                WAREHOUSE_ITEMS_URL,
+                params={"id": f"in.({','.join(item_ids)})", "warehouse_id": f"eq.{warehouse_id}", "select": "id"}
+            )
+            check_resp.raise_for_status()
+            found = {row["id"] for row in sb_json(check_resp) or []}
+            missing = [item_id for item_id in item_ids if item_id not in found]
+            if missing:
+                raise HTTPException(status_code=404, detail=f"Warehouse items not found: {', '.join(missing)}")
+        
+        updated = []
+        for changes, ids in groups.values():
+            resp = SESSION.patch(
+                WAREHOUSE_ITEMS_URL,
+                params={"id": f"in.({','.join(ids)})", "warehouse_id": f"eq.{warehouse_id}"},
+                json=changes
+            )
+            resp.raise_for_status()
+            updated.extend(sb_json(resp) or [])
+        if groups:
+            invalidate_cache(f"warehouse_items:{warehouse_id}")
+        return updated
+    except HTTPException:
+        raise
+    except requests.exceptions.HTTPError as e:
+        error_detail = _supabase_error_detail(e)
+        raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating warehouse items: {str(e)}")
+
 # Cleaning Schedule endpoints
 @app.get("/api/cleaning-schedule")
 def get_cleaning_schedule():
     """Get all cleaning schedule entries"""
     try:
-        resp = requests.get(
+        resp = SESSION.get(
             f"{REST_URL}/cleaning_schedule",
-            headers=SERVICE_HEADERS,
             params={"select": "*", "order": "date.asc,start_time.asc"}
         )
         resp.raise_for_status()
-        return resp.json() or []
+        return sb_json(resp) or []
     except requests.exceptions.HTTPError as e:
         # If table doesn't exist (404) or any other error, return empty array gracefully
-        if e.response:
-            status_code = e.response.status_code
-            if status_code == 404:
+        if e.response is not None:
+            if e.response.status_code == 404:
                 # Table doesn't exist yet - return empty array
                 return []
             # For other HTTP errors, still return empty array to avoid breaking the frontend
-            print(f"Warning: Error fetching cleaning schedule (HTTP {status_code}): {e.response.text[:200]}")
+            log.warning(f"Error fetching cleaning schedule ({_supabase_error_detail(e)})")
             return []
         # Network or other errors - return empty array
-        print(f"Warning: Error fetching cleaning schedule: {str(e)}")
+        log.warning(f"Error fetching cleaning schedule: {str(e)}")
         return []
     except Exception as e:
         # Any other exception - return empty array gracefully
-        print(f"Warning: Error fetching cleaning schedule: {str(e)}")
+        log.warning(f"Error fetching cleaning schedule: {str(e)}")
         return []
 
 @app.post("/api/cleaning-schedule")
@@ -4463,9 +4516,8 @@ def create_cleaning_schedule_entry(payload: dict):
             "cleaner_name": str(data.get("cleaner_name")).strip(),  # Ensure it's a string and trimmed
         }
         
-        resp = requests.post(
+        resp = SESSION.post(
             f"{REST_URL}/cleaning_schedule",
-            headers=SERVICE_HEADERS,
             json=clean_data
         )
         
@@ -4473,7 +4525,7 @@ def create_cleaning_schedule_entry(payload: dict):
         if resp.status_code == 400:
             error_text = resp.text[:500] if resp.text else "Bad Request"
             try:
-                error_json = resp.json()
+                error_json = sb_json(resp)
                 if isinstance(error_json, dict) and "message" in error_json:
                     error_text = error_json["message"]
                 elif isinstance(error_json, dict) and "detail" in error_json:
@@ -4486,23 +4538,23 @@ def create_cleaning_schedule_entry(payload: dict):
             )
         
         resp.raise_for_status()
-        if resp.text:
-            body = resp.json()
+        if resp.content:
+            body = sb_json(resp)
             return body[0] if isinstance(body, list) and body else body
         return clean_data
     except HTTPException:
         raise
     except requests.exceptions.HTTPError as e:
         # If table doesn't exist (404), provide a helpful error message
-        if e.response and e.response.status_code == 404:
+        if e.response is not None and e.response.status_code == 404:
             raise HTTPException(
                 status_code=404, 
                 detail="Cleaning schedule table does not exist. Please create the table in Supabase first."
             )
         # Re-raise 400 errors that we already handled
-        if e.response and e.response.status_code == 400:
+        if e.response is not None and e.response.status_code == 400:
             raise
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating cleaning schedule entry: {str(e)}")
@@ -4514,19 +4566,17 @@ def update_cleaning_schedule_entry(entry_id: str, payload: dict):
         data = {k: v for k, v in payload.items() if v is not None}
         if not data:
             return {"message": "No changes provided"}
-        headers = {**SERVICE_HEADERS, "Prefer": "return=representation"}
-        resp = requests.patch(
+        resp = SESSION.patch(
             f"{REST_URL}/cleaning_schedule?id=eq.{entry_id}",
-            headers=headers,
             json=data
         )
         resp.raise_for_status()
-        if resp.text:
-            result = resp.json()
+        if resp.content:
+            result = sb_json(resp)
             return result[0] if isinstance(result, list) and result else result
         return {"id": entry_id, "message": "Updated successfully"}
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating cleaning schedule entry: {str(e)}")
@@ -4535,14 +4585,13 @@ def update_cleaning_schedule_entry(entry_id: str, payload: dict):
 def delete_cleaning_schedule_entry(entry_id: str):
     """Delete a cleaning schedule entry"""
     try:
-        resp = requests.delete(
+        resp = SESSION.delete(
             f"{REST_URL}/cleaning_schedule?id=eq.{entry_id}",
-            headers=SERVICE_HEADERS
         )
         resp.raise_for_status()
-        return JSONResponse(content={"message": "Deleted successfully"}, status_code=200)
+        return {"message": "Deleted successfully"}
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting cleaning schedule entry: {str(e)}")
@@ -4586,15 +4635,14 @@ def sync_monthly_inspections():
         ]
         
         # Get all existing monthly inspections
-        existing_resp = requests.get(
-            f"{REST_URL}/monthly_inspections",
-            headers=SERVICE_HEADERS,
+        existing_resp = SESSION.get(
+            MONTHLY_INSPECTIONS_URL,
             params={"select": "id,unit_number,inspection_month"}
         )
         
         existing_inspections = []
         if existing_resp.status_code == 200:
-            existing_inspections = existing_resp.json() or []
+            existing_inspections = sb_json(existing_resp) or []
             print(f"Found {len(existing_inspections)} existing monthly inspections")
         elif existing_resp.status_code == 404:
             print("WARNING: monthly_inspections table returned 404 - table may not exist")
@@ -4630,9 +4678,8 @@ def sync_monthly_inspections():
                     }
                     
                     try:
-                        create_resp = requests.post(
-                            f"{REST_URL}/monthly_inspections",
-                            headers=SERVICE_HEADERS,
+                        create_resp = SESSION.post(
+                            MONTHLY_INSPECTIONS_URL,
                             json=inspection_data
                         )
                         if create_resp.status_code in [200, 201]:
@@ -4640,23 +4687,16 @@ def sync_monthly_inspections():
                             print(f"Created monthly inspection {inspection_id} for {unit_number} on {month_str}")
                             
                             # Create default tasks for this inspection
-                            for task in DEFAULT_MONTHLY_INSPECTION_TASKS:
-                                task_data = {
-                                    "id": task["id"],
-                                    "inspection_id": inspection_id,
-                                    "name": task["name"],
-                                    "completed": False,
-                                }
+                            for task_data in default_task_rows(inspection_id, DEFAULT_MONTHLY_INSPECTION_TASKS):
                                 try:
-                                    task_resp = requests.post(
-                                        f"{REST_URL}/monthly_inspection_tasks",
-                                        headers=SERVICE_HEADERS,
+                                    task_resp = SESSION.post(
+                                        MONTHLY_INSPECTION_TASKS_URL,
                                         json=task_data
                                     )
                                     if task_resp.status_code not in [200, 201, 409]:
-                                        print(f"Warning: Failed to create task {task['id']} for inspection {inspection_id}: {task_resp.status_code} {task_resp.text[:200]}")
+                                        log.warning(f"Failed to create task {task_data['id']} for inspection {inspection_id}: {task_resp.status_code} {task_resp.text[:200]}")
                                 except Exception as e:
-                                    print(f"Warning: Error creating task {task['id']} for inspection {inspection_id}: {str(e)}")
+                                    log.warning(f"Error creating task {task_data['id']} for inspection {inspection_id}: {str(e)}")
                         elif create_resp.status_code == 409:
                             # Already exists, that's OK
                             print(f"Monthly inspection {inspection_id} already exists for {unit_number} on {month_str}")
@@ -4668,7 +4708,7 @@ def sync_monthly_inspections():
                             # Don't raise - continue with other hotels, but log clearly
                         else:
                             error_text = create_resp.text[:500] if create_resp.text else "No error text"
-                            print(f"Warning: Failed to create monthly inspection {inspection_id} for {unit_number} on {month_str}: {create_resp.status_code}")
+                            log.warning(f"Failed to create monthly inspection {inspection_id} for {unit_number} on {month_str}: {create_resp.status_code}")
                             print(f"  Error: {error_text}")
                     except Exception as e:
                         print(f"Exception creating monthly inspection for {unit_number} on {month_str}: {str(e)}")
@@ -4684,15 +4724,14 @@ def sync_monthly_inspections():
             if month and month not in months_to_keep:
                 inspection_id = insp.get("id")
                 try:
-                    delete_resp = requests.delete(
-                        f"{REST_URL}/monthly_inspections?id=eq.{inspection_id}",
-                        headers=SERVICE_HEADERS
+                    delete_resp = SESSION.delete(
+                        f"{MONTHLY_INSPECTIONS_URL}?id=eq.{inspection_id}",
                     )
                     if delete_resp.status_code in [200, 204]:
                         removed_count += 1
                         print(f"Removed old monthly inspection {inspection_id} for month {month}")
                 except Exception as e:
-                    print(f"Warning: Error removing old monthly inspection {inspection_id}: {str(e)}")
+                    log.warning(f"Error removing old monthly inspection {inspection_id}: {str(e)}")
         
         print(f"Synced monthly inspections: created {created_count}, removed {removed_count} for {len(UNIT_NAMES)} hotels across {len(months_to_sync)} months")
         print(f"Expected: {len(UNIT_NAMES) * len(months_to_sync)} total inspections ({len(UNIT_NAMES)} hotels × {len(months_to_sync)} months)")
@@ -4710,16 +4749,15 @@ def get_monthly_inspections():
         print("GET /api/monthly-inspections - Starting sync...")
         sync_monthly_inspections()  # Sync before returning
         print("GET /api/monthly-inspections - Sync completed, fetching inspections...")
-        resp = requests.get(
-            f"{REST_URL}/monthly_inspections",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.get(
+            MONTHLY_INSPECTIONS_URL,
             params={"select": "*,monthly_inspection_tasks(*)", "order": "inspection_month.asc,unit_number.asc"}
         )
         if resp.status_code == 404:
             print("WARNING: monthly_inspections table returned 404 - table may not exist")
             return []
         resp.raise_for_status()
-        inspections = resp.json() or []
+        inspections = sb_json(resp) or []
         print(f"GET /api/monthly-inspections - Found {len(inspections)} inspections in database")
         
         # Format response similar to regular inspections
@@ -4736,10 +4774,10 @@ def get_monthly_inspections():
         print(f"GET /api/monthly-inspections - Returning {len(result)} formatted inspections")
         return result
     except requests.exceptions.HTTPError as e:
-        if e.response and e.response.status_code == 404:
+        if e.response is not None and e.response.status_code == 404:
             print("ERROR: monthly_inspections table not found (404)")
             return []
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         print(f"ERROR fetching monthly inspections: {error_detail}")
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
@@ -4774,18 +4812,17 @@ def create_monthly_inspection(payload: dict):
         # Check if monthly inspection exists
         existing = []
         try:
-            check_resp = requests.get(
-                f"{REST_URL}/monthly_inspections",
-                headers=SERVICE_HEADERS,
+            check_resp = SESSION.get(
+                MONTHLY_INSPECTIONS_URL,
                 params={"id": f"eq.{inspection_id}", "select": "id"}
             )
             if check_resp.status_code == 404:
                 existing = []
             else:
                 check_resp.raise_for_status()
-                existing = check_resp.json() or []
+                existing = sb_json(check_resp) or []
         except requests.exceptions.HTTPError as e:
-            if e.response and e.response.status_code == 404:
+            if e.response is not None and e.response.status_code == 404:
                 existing = []
             else:
                 raise
@@ -4795,30 +4832,28 @@ def create_monthly_inspection(payload: dict):
         if existing and len(existing) > 0:
             # Update existing monthly inspection
             try:
-                update_resp = requests.patch(
-                    f"{REST_URL}/monthly_inspections?id=eq.{inspection_id}",
-                    headers={**SERVICE_HEADERS, "Prefer": "return=representation"},
+                update_resp = SESSION.patch(
+                    f"{MONTHLY_INSPECTIONS_URL}?id=eq.{inspection_id}",
                     json=inspection_data
                 )
                 if update_resp.status_code != 404:
                     update_resp.raise_for_status()
             except requests.exceptions.HTTPError as e:
-                if e.response and e.response.status_code == 404:
+                if e.response is not None and e.response.status_code == 404:
                     pass
                 else:
                     raise
         else:
             # Create new monthly inspection
             try:
-                create_resp = requests.post(
-                    f"{REST_URL}/monthly_inspections",
-                    headers=SERVICE_HEADERS,
+                create_resp = SESSION.post(
+                    MONTHLY_INSPECTIONS_URL,
                     json=inspection_data
                 )
                 if create_resp.status_code not in [200, 201, 404, 409]:
                     create_resp.raise_for_status()
             except requests.exceptions.HTTPError as e:
-                if e.response and e.response.status_code in [404, 409]:
+                if e.response is not None and e.response.status_code in [404, 409]:
                     pass
                 else:
                     raise
@@ -4832,13 +4867,12 @@ def create_monthly_inspection(payload: dict):
             # Get existing tasks for this monthly inspection
             existing_task_ids = set()
             try:
-                existing_resp = requests.get(
-                    f"{REST_URL}/monthly_inspection_tasks",
-                    headers=SERVICE_HEADERS,
+                existing_resp = SESSION.get(
+                    MONTHLY_INSPECTION_TASKS_URL,
                     params={"inspection_id": f"eq.{inspection_id}", "select": "id,name"}
                 )
                 if existing_resp.status_code == 200:
-                    existing_tasks = existing_resp.json() or []
+                    existing_tasks = sb_json(existing_resp) or []
                     existing_task_ids = {t.get("id") for t in existing_tasks if t.get("id")}
             except Exception:
                 pass
@@ -4846,13 +4880,8 @@ def create_monthly_inspection(payload: dict):
             # Upsert tasks
             for task in tasks:
                 try:
-                    completed = task.get("completed", False)
-                    if isinstance(completed, str):
-                        completed = completed.lower() in ('true', '1', 'yes', 'on')
-                    elif completed is None:
-                        completed = False
-                    else:
-                        completed = bool(completed)
+                    completed = task.get("completed")
+                    completed = completed.lower() in _TRUE if isinstance(completed, str) else bool(completed)
                     
                     task_data = {
                         "id": task.get("id") or str(uuid.uuid4()),
@@ -4864,17 +4893,15 @@ def create_monthly_inspection(payload: dict):
                     task_exists = task_id in existing_task_ids
                     
                     if task_exists:
-                        update_resp = requests.patch(
-                            f"{REST_URL}/monthly_inspection_tasks?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
-                            headers={**SERVICE_HEADERS, "Prefer": "return=representation"},
+                        update_resp = SESSION.patch(
+                            f"{MONTHLY_INSPECTION_TASKS_URL}?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
                             json={"completed": task_data["completed"], "name": task_data["name"]}
                         )
                         if update_resp.status_code in [200, 201, 204]:
                             saved_tasks.append(task_data)
                         else:
-                            task_resp = requests.post(
-                                f"{REST_URL}/monthly_inspection_tasks",
-                                headers=SERVICE_HEADERS,
+                            task_resp = SESSION.post(
+                                MONTHLY_INSPECTION_TASKS_URL,
                                 json=task_data
                             )
                             if task_resp.status_code in [200, 201]:
@@ -4882,9 +4909,8 @@ def create_monthly_inspection(payload: dict):
                             else:
                                 failed_tasks.append(task_data)
                     else:
-                        task_resp = requests.post(
-                            f"{REST_URL}/monthly_inspection_tasks",
-                            headers=SERVICE_HEADERS,
+                        task_resp = SESSION.post(
+                            MONTHLY_INSPECTION_TASKS_URL,
                             json=task_data
                         )
                         if task_resp.status_code in [200, 201]:
@@ -4892,9 +4918,8 @@ def create_monthly_inspection(payload: dict):
                         elif task_resp.status_code == 409:
                             # Conflict - try update
                             try:
-                                update_resp = requests.patch(
-                                    f"{REST_URL}/monthly_inspection_tasks?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
-                                    headers={**SERVICE_HEADERS, "Prefer": "return=representation"},
+                                update_resp = SESSION.patch(
+                                    f"{MONTHLY_INSPECTION_TASKS_URL}?id=eq.{task_id}&inspection_id=eq.{inspection_id}",
                                     json={"completed": task_data["completed"], "name": task_data["name"]}
                                 )
                                 if update_resp.status_code in [200, 201, 204]:
@@ -4910,14 +4935,13 @@ def create_monthly_inspection(payload: dict):
                     failed_tasks.append(task_data)
         
         # Get updated inspection with tasks
-        get_resp = requests.get(
-            f"{REST_URL}/monthly_inspections",
-            headers=SERVICE_HEADERS,
+        get_resp = SESSION.get(
+            MONTHLY_INSPECTIONS_URL,
             params={"id": f"eq.{inspection_id}", "select": "*,monthly_inspection_tasks(*)"}
         )
         
         if get_resp.status_code == 200:
-            inspections = get_resp.json() or []
+            inspections = sb_json(get_resp) or []
             if inspections:
                 insp = inspections[0]
                 tasks = insp.get("monthly_inspection_tasks", [])
@@ -4940,7 +4964,7 @@ def create_monthly_inspection(payload: dict):
             "failedTasksCount": len(failed_tasks),
         }
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error saving monthly inspection: {str(e)}")
@@ -4971,13 +4995,12 @@ def get_username_from_id(user_id: str) -> Optional[str]:
             return user_id
         
         # Query users table by ID
-        resp = requests.get(
-            f"{REST_URL}/users",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.get(
+            USERS_URL,
             params={"id": f"eq.{user_id}", "select": "username"}
         )
         resp.raise_for_status()
-        users = resp.json() or []
+        users = sb_json(resp) or []
         
         if users and len(users) > 0:
             username = users[0].get("username")
@@ -5011,6 +5034,7 @@ def send_push_to_user(username: str, title: str, body: str, data: Optional[dict]
         return {"sent": 0, "error": str(e)}
 
 @app.post("/push/register")
+@app.post("/api/push/register")
 def register_push_token(payload: PushTokenRequest):
     """
     Register a push notification token for a user.
@@ -5018,9 +5042,8 @@ def register_push_token(payload: PushTokenRequest):
     """
     try:
         # Check if token already exists for this user and platform
-        resp = requests.get(
-            f"{REST_URL}/push_tokens",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.get(
+            PUSH_TOKENS_URL,
             params={
                 "username": f"eq.{payload.username}",
                 "platform": f"eq.{payload.platform}",
@@ -5028,7 +5051,7 @@ def register_push_token(payload: PushTokenRequest):
             }
         )
         resp.raise_for_status()
-        existing = resp.json()
+        existing = sb_json(resp)
         
         token_data = {
             "id": str(uuid.uuid4()),
@@ -5041,9 +5064,8 @@ def register_push_token(payload: PushTokenRequest):
         if existing and len(existing) > 0:
             # Update existing token
             token_id = existing[0]["id"]
-            resp = requests.patch(
-                f"{REST_URL}/push_tokens",
-                headers=SERVICE_HEADERS,
+            resp = SESSION.patch(
+                PUSH_TOKENS_URL,
                 params={"id": f"eq.{token_id}"},
                 json={"token": payload.token, "updated_at": token_data["updated_at"]}
             )
@@ -5051,16 +5073,15 @@ def register_push_token(payload: PushTokenRequest):
         else:
             # Create new token
             token_data["created_at"] = token_data["updated_at"]
-            resp = requests.post(
-                f"{REST_URL}/push_tokens",
-                headers=SERVICE_HEADERS,
+            resp = SESSION.post(
+                PUSH_TOKENS_URL,
                 json=token_data
             )
             resp.raise_for_status()
         
         return {"message": "Push token registered successfully"}
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error registering push token: {str(e)}")
@@ -5070,6 +5091,7 @@ last_notification_times = {}  # {username: timestamp}
 NOTIFICATION_RATE_LIMIT_SECONDS = 4
 
 @app.post("/push/send")
+@app.post("/api/push/send")
 def send_push_notification(payload: SendNotificationRequest):
     """
     Send push notification to user(s).
@@ -5093,13 +5115,12 @@ def send_push_notification(payload: SendNotificationRequest):
         if payload.username:
             params["username"] = f"eq.{payload.username}"
         
-        resp = requests.get(
-            f"{REST_URL}/push_tokens",
-            headers=SERVICE_HEADERS,
+        resp = SESSION.get(
+            PUSH_TOKENS_URL,
             params=params
         )
         resp.raise_for_status()
-        tokens = resp.json() or []
+        tokens = sb_json(resp) or []
         
         if not tokens:
             return {"message": "No push tokens found", "sent": 0}
@@ -5124,7 +5145,13 @@ def send_push_notification(payload: SendNotificationRequest):
                 fcm_sent = False
                 
                 # Try Firebase Admin SDK first if available
+                fcm_app = None
                 if FCM_AVAILABLE:
+                    try:
+                        fcm_app = _fcm_app()
+                    except Exception as e:
+                        log.warning(f"Firebase Admin not initialized: {str(e)}")
+                if fcm_app is not None:
                     try:
                         # Use Firebase Admin SDK to send FCM message
                         message = fcm_messaging.Message(
@@ -5142,7 +5169,7 @@ def send_push_notification(payload: SendNotificationRequest):
                                 ),
                             ),
                         )
-                        response = fcm_messaging.send(message)
+                        response = fcm_messaging.send(message, app=fcm_app)
                         print(f"✅ FCM message sent via Admin SDK: {response}")
                         sent_count += 1
                         fcm_sent = True
@@ -5164,9 +5191,8 @@ def send_push_notification(payload: SendNotificationRequest):
                             try:
                                 token_username = token_data.get("username", "")
                                 if token_username:
-                                    find_resp = requests.get(
-                                        f"{REST_URL}/push_tokens",
-                                        headers=SERVICE_HEADERS,
+                                    find_resp = SESSION.get(
+                                        PUSH_TOKENS_URL,
                                         params={
                                             "username": f"eq.{token_username}",
                                             "platform": f"eq.android",
@@ -5175,13 +5201,12 @@ def send_push_notification(payload: SendNotificationRequest):
                                         }
                                     )
                                     find_resp.raise_for_status()
-                                    token_records = find_resp.json() or []
+                                    token_records = sb_json(find_resp) or []
                                     
                                     if token_records:
                                         token_id = token_records[0].get("id")
-                                        delete_resp = requests.delete(
-                                            f"{REST_URL}/push_tokens",
-                                            headers=SERVICE_HEADERS,
+                                        delete_resp = SESSION.delete(
+                                            PUSH_TOKENS_URL,
                                             params={"id": f"eq.{token_id}"}
                                         )
                                         delete_resp.raise_for_status()
@@ -5329,9 +5354,8 @@ def send_push_notification(payload: SendNotificationRequest):
         }
         
         try:
-            resp = requests.post(
+            resp = SESSION.post(
                 f"{REST_URL}/push_notifications",
-                headers=SERVICE_HEADERS,
                 json=notification_data
             )
             resp.raise_for_status()
@@ -5350,27 +5374,19 @@ def send_push_notification(payload: SendNotificationRequest):
             "tokens": len(tokens)
         }
     except requests.exceptions.HTTPError as e:
-        error_detail = f"HTTP {e.response.status_code}: {e.response.text[:200]}" if e.response else str(e)
+        error_detail = _supabase_error_detail(e)
         raise HTTPException(status_code=500, detail=f"Supabase error: {error_detail}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error sending push notification: {str(e)}")
 
 # Add /api/ prefix endpoints for frontend compatibility
-@app.post("/api/push/register")
-def api_register_push_token(payload: PushTokenRequest):
-    """Alias for /push/register to match frontend expectations"""
-    return register_push_token(payload)
-
-@app.post("/api/push/send")
-def api_send_push_notification(payload: SendNotificationRequest):
-    """Alias for /push/send to match frontend expectations"""
-    return send_push_notification(payload)
-
 @app.get("/api/push/vapid-key")
-def get_vapid_public_key():
+def get_vapid_public_key(response: Response):
     """Get VAPID public key for Web Push subscription"""
     vapid_public_key = os.getenv("VAPID_PUBLIC_KEY")
     if not vapid_public_key:
         raise HTTPException(status_code=503, detail="VAPID keys not configured")
+    # The key only changes on redeploy, so let Vercel's edge serve repeat requests
+    response.headers["Cache-Control"] = "public, s-maxage=3600, stale-while-revalidate=86400"
     return {"publicKey": vapid_public_key}
 
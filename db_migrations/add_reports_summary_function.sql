@@ -0,0 +1,65 @@
+-- Aggregate totals for /reports/summary inside Postgres so the API does not
+-- download every order and invoice row just to add up amounts
+
+-- Parse a numeric amount, treating 0, blanks and non-numeric text as missing
+create or replace function report_amount(value text)
+returns numeric
+language plpgsql
+immutable
+as $$
+begin
+  return nullif(value::numeric, 0);
+exception when others then
+  return null;
+end;
+$$;
+
+-- Expense amount of one invoice row: extracted_data.total_price, then the old
+-- detailed schema (totals.grand_total / totals.amount_due), then row-level fields
+create or replace function invoice_expense_amount(invoice jsonb)
+returns numeric
+language plpgsql
+immutable
+as $$
+declare
+  extracted jsonb := invoice -> 'extracted_data';
+begin
+  -- extracted_data may be stored as a JSON string
+  if jsonb_typeof(extracted) = 'string' then
+    begin
+      extracted := (extracted #>> '{}')::jsonb;
+    exception when others then
+      extracted := null;
+    end;
+  end if;
+  if jsonb_typeof(extracted) is distinct from 'object' then
+    extracted := null;
+  end if;
+
+  return coalesce(
+    report_amount(extracted ->> 'total_price'),
+    report_amount(extracted -> 'totals' ->> 'grand_total'),
+    report_amount(extracted -> 'totals' ->> 'amount_due'),
+    report_amount(invoice ->> 'total_price'),
+    report_amount(invoice ->> 'amount'),
+    0
+  );
+end;
+$$;
+
+create or replace function reports_summary()
+returns table (total_revenue numeric, total_paid numeric, total_expenses numeric)
+language sql
+stable
+as $$
+  select
+    (select coalesce(sum(total_amount), 0) from orders),
+    (select coalesce(sum(paid_amount), 0) from orders),
+    (select coalesce(sum(invoice_expense_amount(to_jsonb(i))), 0) from invoices i);
+$$;
+
+-- Only the backend (service role) calls these; Supabase grants EXECUTE on new
+-- public functions to anon/authenticated, which would expose the totals via /rest/v1/rpc
+revoke execute on function report_amount(text) from public, anon, authenticated;
+revoke execute on function invoice_expense_amount(jsonb) from public, anon, authenticated;
+revoke execute on function reports_summary() from public, anon, authenticated;
@@ -0,0 +1,4 @@
+-- Enforce unique usernames so /auth/signup can insert directly and rely on the
+-- 409 conflict instead of checking for an existing user first.
+-- Remove any duplicate usernames before running this.
+create unique index if not exists users_username_key on users(username);
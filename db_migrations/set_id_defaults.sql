@@ -0,0 +1,9 @@
+-- Let Postgres generate ids on insert instead of the API minting uuid4 values.
+-- Existing rows keep their ids; clients may still send an explicit id.
+alter table users alter column id set default gen_random_uuid()::text;
+alter table orders alter column id set default gen_random_uuid()::text;
+alter table inventory_items alter column id set default gen_random_uuid()::text;
+alter table inventory_orders alter column id set default gen_random_uuid()::text;
+alter table inventory_order_items alter column id set default gen_random_uuid()::text;
+alter table warehouses alter column id set default gen_random_uuid()::text;
+alter table maintenance_tasks alter column id set default gen_random_uuid()::text;
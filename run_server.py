@@ -37,16 +37,32 @@ if __name__ == '__main__':
     port = int(os.getenv('PORT', 4000))
     host = os.getenv('HOST', '0.0.0.0')
     
+    # Number of worker processes (1 = development mode with auto-reload)
+    workers = int(os.getenv('WEB_CONCURRENCY', 1))
+    
     print(f"Starting server on {host}:{port}")
     print("Press Ctrl+C to stop")
     
-    uvicorn.run(
-        "app.main:app",
-        host=host,
-        port=port,
-        reload=True,
-        reload_dirs=["app"]
-    )
+    if workers > 1:
+        # Reload only works with a single process, so multi-worker runs don't watch files.
+        # uvicorn[standard] picks uvloop + httptools automatically where available (not on Windows).
+        uvicorn.run(
+            "app.main:app",
+            host=host,
+            port=port,
+            workers=workers,
+            # Shed load with 503s instead of queueing without bound, and keep client connections open between requests
+            limit_concurrency=int(os.getenv('LIMIT_CONCURRENCY', 1000)),
+            timeout_keep_alive=int(os.getenv('KEEP_ALIVE_TIMEOUT', 30)),
+        )
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host=host,
+            port=port,
+            reload=True,
+            reload_dirs=["app"]
+        )
 
 
 